@@ -0,0 +1,367 @@
+"""
+Benchmarks of the hot paths of ``color``.
+
+    python benchmarks/run.py                  compare with baseline.json
+    python benchmarks/run.py --save           record a new baseline.json
+    python benchmarks/run.py -k parse         only run cases matching "parse"
+    python benchmarks/run.py --threshold 1    allow 100% slowdowns
+
+Every case times a loop over a fixed, seeded set of inputs and reports the
+best time per item. Each timing is divided by the time of a pure Python
+calibration loop measured right before it, and the median of these ratios
+is compared, so a baseline recorded on one machine stays meaningful on another
+and clock changes during a run cancel out. The runner exits with status 1
+when a case is slower than its baseline by more than ``--threshold``.
+``--save`` together with ``-k`` only updates the cases that ran.
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from color import (  # noqa: E402
+    RGB,
+    RGBA,
+    Color,
+    ColorArray,
+    composite_buffer,
+    decode_buffer,
+    encode_buffer,
+    lookup_name,
+    nearest_names,
+    parse_color,
+    parse_many,
+    quantize,
+    rgb_to_hsl,
+    rgb_to_oklab,
+)
+from color.vars import NAMES_COLORS  # noqa: E402
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.5
+
+# items per timed loop
+SIZE = 1000
+
+# name -> (items per call, function)
+CASES: dict[str, tuple[int, Callable[[], object]]] = {}
+
+_rng = random.Random(20)
+INTS = [_rng.getrandbits(24) for _ in range(SIZE)]
+PACKED = [_rng.getrandbits(32) for _ in range(SIZE)]
+TUPLES = [(x >> 16, (x >> 8) & 0xFF, x & 0xFF) for x in INTS]
+TUPLES4 = [(x >> 24, (x >> 16) & 0xFF, (x >> 8) & 0xFF, x & 0xFF) for x in PACKED]
+RGBS = [RGB(x) for x in INTS]
+RGBAS = [RGBA(x) for x in PACKED]
+NAMES = [_rng.choice(list(NAMES_COLORS)) for _ in range(SIZE)]
+SPELLINGS = [name.upper() for name in NAMES]
+STRINGS = [
+    _rng.choice(
+        (
+            f"#{x:06x}",
+            f"rgb({x >> 16}, {(x >> 8) & 0xFF}, {x & 0xFF})",
+            f"rgba({x >> 16}, {(x >> 8) & 0xFF}, {x & 0xFF}, 0.5)",
+            f"hsl({x % 360}, 50%, 50%)",
+            _rng.choice(list(NAMES_COLORS)),
+        )
+    )
+    for x in INTS
+]
+RAW = bytes(_rng.getrandbits(8) for _ in range(4 * SIZE * 10))
+ARRAY = ColorArray(PACKED)
+
+
+def case(name: str, size: int = SIZE) -> Callable:
+    def decorator(func: Callable[[], object]) -> Callable[[], object]:
+        CASES[name] = (size, func)
+        return func
+
+    return decorator
+
+
+def calibrate() -> None:
+    # plain interpreter work: loops, attribute-free arithmetic and dict hits
+    table = {x: x for x in range(256)}
+    total = 0
+    for x in INTS:
+        total += table[x & 0xFF] + (x >> 8)
+
+
+# construction
+@case("construct.rgb_int")
+def _() -> None:
+    for x in INTS:
+        RGB(x)
+
+
+@case("construct.rgb_args")
+def _() -> None:
+    for r, g, b in TUPLES:
+        RGB(r, g, b)
+
+
+@case("construct.rgb_tuple")
+def _() -> None:
+    for x in TUPLES:
+        RGB(x)
+
+
+@case("construct.rgb_iterable")
+def _() -> None:
+    for x in TUPLES:
+        RGB(list(x))
+
+
+@case("construct.rgba_int")
+def _() -> None:
+    for x in PACKED:
+        RGBA(x)
+
+
+@case("construct.rgba_args")
+def _() -> None:
+    for r, g, b, a in TUPLES4:
+        RGBA(r, g, b, a)
+
+
+@case("construct.rgba_from_rgb")
+def _() -> None:
+    for x in RGBS:
+        RGBA(x, a=0x80)
+
+
+# channel access
+@case("access.attribute")
+def _() -> None:
+    for x in RGBAS:
+        x.r, x.g, x.b, x.a
+
+
+@case("access.index")
+def _() -> None:
+    for x in RGBAS:
+        x[0], x[1], x[2], x[3]
+
+
+@case("access.key")
+def _() -> None:
+    for x in RGBAS:
+        x["r"], x["a"]
+
+
+@case("access.unpack")
+def _() -> None:
+    for x in RGBAS:
+        r, g, b, a = x
+
+
+# operators
+@case("operator.eq")
+def _() -> None:
+    for x, y in zip(RGBAS, reversed(RGBAS)):
+        x == y
+
+
+@case("operator.lt_int")
+def _() -> None:
+    for x, y in zip(RGBAS, PACKED):
+        x < y
+
+
+@case("operator.bitwise")
+def _() -> None:
+    for x in RGBAS:
+        (x & 0xFF) | (x >> 8) ^ (x << 1)
+
+
+# Color classmethods
+@case("color.from_rgb")
+def _() -> None:
+    for x in INTS:
+        Color.from_rgb(x)
+
+
+@case("color.from_rgba")
+def _() -> None:
+    for x in PACKED:
+        Color.from_rgba(x)
+
+
+@case("color.from_rgb565")
+def _() -> None:
+    for x in INTS:
+        Color.from_rgb565(x & 0xFFFF)
+
+
+@case("color.from_str")
+def _() -> None:
+    for x in STRINGS:
+        Color.from_str(x)
+
+
+@case("color.from_name")
+def _() -> None:
+    for x in NAMES:
+        Color.from_name(x)
+
+
+# names and parsing
+@case("names.lookup")
+def _() -> None:
+    for x in NAMES:
+        lookup_name(x)
+
+
+@case("names.lookup_spelling")
+def _() -> None:
+    for x in SPELLINGS:
+        lookup_name(x)
+
+
+@case("names.nearest")
+def _() -> None:
+    nearest_names(PACKED)
+
+
+@case("parse.cached")
+def _() -> None:
+    for x in STRINGS:
+        parse_color(x)
+
+
+@case("parse.uncached")
+def _() -> None:
+    parse = parse_color.__wrapped__
+    for x in STRINGS:
+        parse(x)
+
+
+@case("parse.many")
+def _() -> None:
+    parse_many(STRINGS)
+
+
+# bulk paths
+@case("bulk.decode_rgba8888", 10 * SIZE)
+def _() -> None:
+    decode_buffer(RAW)
+
+
+@case("bulk.decode_rgb565", 20 * SIZE)
+def _() -> None:
+    decode_buffer(RAW, "rgb565")
+
+
+@case("bulk.encode_rgb565", SIZE)
+def _() -> None:
+    encode_buffer(ARRAY.data, "rgb565", dither=True, width=100)
+
+
+@case("bulk.composite_multiply", 10 * SIZE)
+def _() -> None:
+    composite_buffer(RAW, RAW[::-1], "multiply")
+
+
+@case("bulk.quantize_median_cut", 10 * SIZE)
+def _() -> None:
+    quantize(RAW, 16, method="median_cut")
+
+
+@case("bulk.channel_view")
+def _() -> None:
+    ARRAY.r, ARRAY.g, ARRAY.b, ARRAY.a
+
+
+@case("bulk.rgb_to_hsl")
+def _() -> None:
+    rgb_to_hsl(TUPLES)
+
+
+@case("bulk.rgb_to_oklab")
+def _() -> None:
+    rgb_to_oklab(TUPLES)
+
+
+def measure(func: Callable[[], object], size: int, repeat: int) -> tuple[float, float]:
+    """
+    Return the best time per item of ``func`` in seconds, and the median of
+    its ratios to the calibration loop timed in alternation with it
+    """
+    timer, reference = timeit.Timer(func), timeit.Timer(calibrate)
+    number, _ = timer.autorange()
+    reference_number, _ = reference.autorange()
+
+    times, ratios = [], []
+    for _ in range(repeat):
+        # the calibration is short: take its best over a few runs
+        calibration = min(reference.repeat(5, reference_number)) / reference_number
+        elapsed = min(timer.repeat(3, number)) / number / size
+        times.append(elapsed)
+        ratios.append(elapsed / (calibration / SIZE))
+    return min(times), statistics.median(ratios)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-k", "--filter", default="", help="case name substring")
+    parser.add_argument("--save", action="store_true", help="write baseline.json")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())["cases"]
+
+    results, regressions = {}, []
+    print(f"{'case':<28}{'ns/item':>10}{'relative':>10}{'baseline':>10}{'change':>9}")
+    for name, (size, func) in CASES.items():
+        if args.filter not in name:
+            continue
+
+        elapsed, relative = measure(func, size, args.repeat)
+        results[name] = relative
+        line = f"{name:<28}{elapsed * 1e9:>10.1f}{relative:>10.2f}"
+        if name in baseline and not args.save:
+            change = relative / baseline[name] - 1
+            line += f"{baseline[name]:>10.2f}{change:>+9.0%}"
+            if change > args.threshold:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.save:
+        # a filtered run keeps the baseline of the cases it skipped
+        cases = baseline if args.filter else {}
+        cases.update((name, round(x, 4)) for name, x in results.items())
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "cases": {name: cases[name] for name in CASES if name in cases},
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"\nbaseline written to {args.baseline}")
+    elif regressions:
+        print(
+            f"\n{len(regressions)} case(s) slower than the baseline by more than "
+            f"{args.threshold:.0%}: {', '.join(regressions)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
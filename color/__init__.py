@@ -1,3 +1,47 @@
+from types import ModuleType as _ModuleType
+from typing import Any as _Any
+
+from .array import *
+from .buffer import *
 from .color import *
+from .composite import *
+from .convert import *
+from .difference import *
+from .frame import *
+from .gradient import *
+from .kernel import *
+from .names import lookup_name, name_of, nearest_name, nearest_names
+from .palette import *
+from .parallel import *
+from .parse import *
+from .pipeline import *
+from .quantize import *
+from .serialize import *
+from .tables import *
 from .types import *
-from .vars import *
+
+__all__ = [
+    name
+    for name, value in globals().items()
+    if not name.startswith("_") and not isinstance(value, _ModuleType)
+]
+
+from . import names as _names, vars as _vars
+
+# tables and regexes built on first access rather than at import time
+_LAZY = {name: _vars for name in _vars.__all__}
+_LAZY.update((name, _names) for name in _names._INDEXES)
+__all__ += _LAZY
+
+
+def __getattr__(name: str) -> _Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = globals()[name] = getattr(module, name)
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,129 @@
+"""
+Hex and CSS strings of packed 0xRR_GG_BB_AA values.
+
+Channels are turned into text through tables built once, so formatting a
+color only looks strings up and concatenates them. Decimal alphas and HSL
+coordinates use the fewest digits that :func:`color.parse.parse_color` reads
+back into the same color.
+"""
+
+from typing import Callable, Literal, Optional
+
+from .convert import _rgb_to_hsl
+
+CSS_FORMAT_TYPE = Literal["hex", "short", "rgb", "rgba", "hsl"]
+
+CSS_FORMATS = ("hex", "short", "rgb", "rgba", "hsl")
+
+# byte -> two lowercase hex digits
+HEX = tuple(f"{x:02x}" for x in range(0x100))
+# byte -> one hex digit, for the bytes written with two equal digits
+SHORT_HEX = {x * 0x11: f"{x:x}" for x in range(0x10)}
+# byte -> decimal
+DECIMAL = tuple(str(x) for x in range(0x100))
+
+
+def _alpha(value: int) -> str:
+    """Return the shortest 0~1 decimal that rounds back to ``value`` / 255"""
+    for digits in range(1, 4):
+        text = f"{value / 0xFF:.{digits}f}".rstrip("0").rstrip(".")
+        if round(float(text) * 0xFF) == value:
+            return text or "0"
+    return f"{value / 0xFF:.4f}"
+
+
+# alpha byte -> decimal between 0 and 1
+ALPHA = tuple(_alpha(x) for x in range(0x100))
+
+
+def _number(value: float) -> str:
+    text = f"{value:.1f}"
+    return text[:-2] if text.endswith(".0") else text
+
+
+def format_hex(value: int, alpha: Optional[bool] = None, short: bool = False) -> str:
+    """
+    Return ``#rrggbb`` or ``#rrggbbaa``, with the alpha digits when ``alpha``
+    is true, or when it is ``None`` and the color is not opaque. ``short``
+    writes ``#rgb`` / ``#rgba`` when every channel has two equal digits.
+    """
+    r, g, b, a = value >> 24, (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF
+    if alpha is None:
+        alpha = a != 0xFF
+
+    if short:
+        s = SHORT_HEX
+        if r in s and g in s and b in s and (not alpha or a in s):
+            return "#" + s[r] + s[g] + s[b] + (s[a] if alpha else "")
+    return "#" + HEX[r] + HEX[g] + HEX[b] + (HEX[a] if alpha else "")
+
+
+def format_hsl(h: float, s: float, l: float, a: int = 0xFF) -> str:
+    """Return ``hsl()``, or ``hsla()`` when ``a`` is not opaque"""
+    text = f"{_number(h)}, {_number(s * 100)}%, {_number(l * 100)}%"
+    if a == 0xFF:
+        return "hsl(" + text + ")"
+    return "hsla(" + text + ", " + ALPHA[a] + ")"
+
+
+def format_css(value: int, fmt: CSS_FORMAT_TYPE = "hex") -> str:
+    """
+    Return a CSS string of a packed value in ``fmt``:
+
+    - ``hex``   : ``#rrggbb``, or ``#rrggbbaa`` when not opaque
+    - ``short`` : ``hex`` written as ``#rgb`` / ``#rgba`` when possible
+    - ``rgb``   : ``rgb(r, g, b)``, or ``rgba(r, g, b, a)`` when not opaque
+    - ``rgba``  : ``rgba(r, g, b, a)``
+    - ``hsl``   : ``hsl(h, s%, l%)``, or ``hsla(h, s%, l%, a)`` when not opaque
+    """
+    return formatter(fmt)(value)
+
+
+def _rgb(value: int) -> str:
+    a = value & 0xFF
+    text = (
+        DECIMAL[value >> 24]
+        + ", "
+        + DECIMAL[(value >> 16) & 0xFF]
+        + ", "
+        + DECIMAL[(value >> 8) & 0xFF]
+    )
+    if a == 0xFF:
+        return "rgb(" + text + ")"
+    return "rgba(" + text + ", " + ALPHA[a] + ")"
+
+
+def _rgba(value: int) -> str:
+    return (
+        "rgba("
+        + DECIMAL[value >> 24]
+        + ", "
+        + DECIMAL[(value >> 16) & 0xFF]
+        + ", "
+        + DECIMAL[(value >> 8) & 0xFF]
+        + ", "
+        + ALPHA[value & 0xFF]
+        + ")"
+    )
+
+
+def _hsl(value: int) -> str:
+    h, s, l = _rgb_to_hsl(value >> 24, (value >> 16) & 0xFF, (value >> 8) & 0xFF)
+    return format_hsl(h, s, l, value & 0xFF)
+
+
+_FORMATTERS: dict[str, Callable[[int], str]] = {
+    "hex": format_hex,
+    "short": lambda value: format_hex(value, None, True),
+    "rgb": _rgb,
+    "rgba": _rgba,
+    "hsl": _hsl,
+}
+
+
+def formatter(fmt: str) -> Callable[[int], str]:
+    """Return the packed value -> string function of ``fmt``"""
+    try:
+        return _FORMATTERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown CSS format: {fmt!r}") from None
@@ -1,3 +1,42 @@
+import sys
+from array import array
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Any, Optional
+
+# typecode of an unsigned 32-bit array item ("I" is 32-bit on every common ABI)
+UINT32_TYPECODE = "I" if array("I").itemsize == 4 else "L"
+
+
+class _LazyModule:
+    """Stand-in for a module, imported on first attribute access"""
+
+    __slots__ = ("_name", "_module")
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._module = None
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r}>"
+
+    def __getattr__(self, name: str) -> Any:
+        if self._module is None:
+            self._module = import_module(self._name)
+        return getattr(self._module, name)
+
+
+# NumPy (optional dependency), or ``None`` when it is not installed; importing
+# it takes longer than importing this whole package, so wait until it is used
+np: Any = _LazyModule("numpy") if find_spec("numpy") is not None else None
+
+
+def is_ndarray(value: Any) -> bool:
+    """Return whether ``value`` is a NumPy array, without importing NumPy"""
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
 def get_bytes(value: int, step=0, *, unit=8):
     return (value >> (unit * step)) & ((1 << unit) - 1)
 
@@ -9,8 +48,127 @@ def get_bits(value: int, start=0, *, size=-1):
     return value & ((1 << size) - 1)
 
 
+def get_channels(value: Any) -> tuple[int, int, int]:
+    """
+    Return (r, g, b) of a packed 0xRR_GG_BB_AA int or of any (r, g, b[, a])
+    iterable, such as :class:`RGB` / :class:`RGBA`
+    """
+    if isinstance(value, int):
+        return get_bytes(value, 3), get_bytes(value, 2), get_bytes(value, 1)
+    r, g, b, *_ = value
+    return r, g, b
+
+
 class YUVStandard:
-    ...
+    """
+    Luma weights, chroma scales and 8-bit range of a Y'UV / Y'CbCr standard
+
+    Y = WR * R + WG * G + WB * B, U = UMAX * (B - Y) / (1 - WB),
+    V = VMAX * (R - Y) / (1 - WR)
+
+    ``matrix`` / ``inverse`` convert normalized (0~1) R'G'B' to Y'UV and back.
+    ``fixed_matrix`` / ``fixed_inverse`` are the 8-bit variants, scaled by
+    ``1 << FIXED_SHIFT``, mapping 0~255 R'G'B' to full range (0~255) or limited
+    range (Y 16~235, U/V 16~240) bytes around ``offsets``.
+    """
+
+    FIXED_SHIFT = 16
+
+    def __init__(
+        self,
+        wr: float,
+        wb: float,
+        *,
+        umax: float = 0.5,
+        vmax: float = 0.5,
+        full_range: bool = True,
+        name: str = "",
+    ) -> None:
+        self.wr = wr
+        self.wg = wg = 1 - wr - wb
+        self.wb = wb
+        self.umax = umax
+        self.vmax = vmax
+        self.full_range = full_range
+        self.name = name
+
+        self.matrix = (
+            (wr, wg, wb),
+            (-umax * wr / (1 - wb), -umax * wg / (1 - wb), umax),
+            (vmax, -vmax * wg / (1 - wr), -vmax * wb / (1 - wr)),
+        )
+        self.inverse = (
+            (1.0, 0.0, (1 - wr) / vmax),
+            (1.0, -wb * (1 - wb) / (umax * wg), -wr * (1 - wr) / (vmax * wg)),
+            (1.0, (1 - wb) / umax, 0.0),
+        )
+
+        # 8-bit scales: Y' 0~1 -> y_scale, U/V -UMAX~UMAX -> -c_scale/2~c_scale/2
+        y_offset, y_scale, c_scale = (0, 255, 255) if full_range else (16, 219, 224)
+        self.offsets = (y_offset, 128, 128)
+        scales = (y_scale / 255, c_scale / 255 / (2 * umax), c_scale / 255 / (2 * vmax))
+
+        one = 1 << self.FIXED_SHIFT
+        self.fixed_matrix = tuple(
+            tuple(round(x * scale * one) for x in row)
+            for row, scale in zip(self.matrix, scales)
+        )
+        self.fixed_inverse = tuple(
+            tuple(round(x / scale * one) for x, scale in zip(row, scales))
+            for row in self.inverse
+        )
+        self._decode_tables: Optional[tuple[tuple[int, ...], ...]] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} {self.name or '?'} wr={self.wr:g} "
+            f"wg={self.wg:g} wb={self.wb:g} full_range={self.full_range}>"
+        )
+
+    def encode(self, r: int, g: int, b: int) -> tuple[int, int, int]:
+        """Convert 8-bit R'G'B' to 8-bit Y'UV with fixed point math"""
+        shift = self.FIXED_SHIFT
+        half = 1 << (shift - 1)
+        return tuple(
+            max(0, min(255, ((m0 * r + m1 * g + m2 * b + half) >> shift) + offset))
+            for (m0, m1, m2), offset in zip(self.fixed_matrix, self.offsets)
+        )
+
+    def decode(self, y: int, u: int, v: int) -> tuple[int, int, int]:
+        """Convert 8-bit Y'UV to 8-bit R'G'B' with fixed point math"""
+        ys, rv, gu, gv, bu = self.decode_tables()
+        y = ys[y]
+        return (
+            max(0, min(255, (y + rv[v]) >> self.FIXED_SHIFT)),
+            max(0, min(255, (y + gu[u] + gv[v]) >> self.FIXED_SHIFT)),
+            max(0, min(255, (y + bu[u]) >> self.FIXED_SHIFT)),
+        )
+
+    def decode_tables(self) -> tuple[tuple[int, ...], ...]:
+        """
+        Return the 256 entries fixed point tables (Y, V->R, U->G, V->G, U->B)
+        of ``fixed_inverse``, built on first use; R' = (Y[y] + VR[v]) >> shift
+        """
+        if self._decode_tables is None:
+            (y0, _, rv), (_, gu, gv), (_, bu, _) = self.fixed_inverse
+            y_offset, u_offset, v_offset = self.offsets
+            half = 1 << (self.FIXED_SHIFT - 1)
+            self._decode_tables = (
+                tuple(y0 * (x - y_offset) + half for x in range(256)),
+                tuple(rv * (x - v_offset) for x in range(256)),
+                tuple(gu * (x - u_offset) for x in range(256)),
+                tuple(gv * (x - v_offset) for x in range(256)),
+                tuple(bu * (x - u_offset) for x in range(256)),
+            )
+        return self._decode_tables
+
+
+# analog Y'UV (PAL / NTSC)
+YUV_BT470 = YUVStandard(0.299, 0.114, umax=0.436, vmax=0.615, name="BT.470")
+# digital Y'CbCr
+YUV_BT601 = YUVStandard(0.299, 0.114, full_range=False, name="BT.601")
+YUV_BT709 = YUVStandard(0.2126, 0.0722, full_range=False, name="BT.709")
+YUV_BT2020 = YUVStandard(0.2627, 0.0593, full_range=False, name="BT.2020")
 
 
 class _Missing:
@@ -0,0 +1,304 @@
+import sys
+from array import array
+from typing import Any, Iterable, Iterator, Optional, Union, overload
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
+
+from ._utils import UINT32_TYPECODE
+from .buffer import BYTEORDER_TYPE, FORMAT_TYPE, decode_buffer, encode_buffer
+from .types import RGB, RGBA
+
+__all__ = ("ColorArray",)
+
+# byte offset of each channel inside a native 32-bit word (0xRR_GG_BB_AA)
+if sys.byteorder == "little":
+    _OFFSETS = {"r": 3, "g": 2, "b": 1, "a": 0}
+else:
+    _OFFSETS = {"r": 0, "g": 1, "b": 2, "a": 3}
+
+_MASK = 0xFFFFFFFF
+
+
+def _pack(value: Any) -> int:
+    """Return the packed 0xRR_GG_BB_AA integer of a color-like value"""
+    if isinstance(value, int):
+        if value < 0 or value > _MASK:
+            raise ValueError("Value must be between 0 and 0xFFFFFFFF")
+        return value
+    if isinstance(value, RGB):
+        return (value.to_int() << 8) | 0xFF
+    if isinstance(value, RGBA):
+        return value.to_int()
+    return RGBA(value).to_int()
+
+
+class ColorArray:
+    """
+    A packed array of RGBA colors, one unsigned 32-bit word (0xRR_GG_BB_AA)
+    per color.
+
+    Items are returned as :class:`RGBA` instances, while the channel views,
+    comparisons and bitwise operators work on the whole array at once.
+    """
+
+    __slots__ = ("_data",)
+
+    # fmt: off
+    @overload
+    def __init__(self) -> None: ... # noqa
+    @overload
+    def __init__(self, __values: Iterable[Union[int, RGB, RGBA]]) -> None: ... # noqa
+    # fmt: on
+
+    def __init__(self, values: Iterable[Any] = ()) -> None:
+        if isinstance(values, ColorArray):
+            self._data = array(UINT32_TYPECODE, values._data)
+        elif isinstance(values, array) and values.typecode == UINT32_TYPECODE:
+            self._data = array(UINT32_TYPECODE, values)
+        else:
+            self._data = array(UINT32_TYPECODE, map(_pack, values))
+
+    @classmethod
+    def from_array(cls, data: array) -> Self:
+        """Wrap an existing packed ``array`` without copying it"""
+        if not isinstance(data, array) or data.typecode != UINT32_TYPECODE:
+            raise ValueError(f"Expected an array of typecode {UINT32_TYPECODE!r}")
+
+        self = cls.__new__(cls)
+        self._data = data
+        return self
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self:
+        """Create an array from native-endian packed 32-bit words"""
+        self = cls.__new__(cls)
+        self._data = array(UINT32_TYPECODE)
+        self._data.frombytes(data)
+        return self
+
+    @classmethod
+    def from_buffer(
+        cls,
+        buf: Any,
+        fmt: FORMAT_TYPE = "rgba8888",
+        *,
+        byteorder: BYTEORDER_TYPE = "little",
+    ) -> Self:
+        """Decode a raw pixel buffer, see :mod:`color.buffer`"""
+        return cls.from_array(decode_buffer(buf, fmt, byteorder=byteorder))
+
+    def to_buffer(
+        self,
+        fmt: FORMAT_TYPE = "rgba8888",
+        *,
+        byteorder: BYTEORDER_TYPE = "little",
+        dither: bool = False,
+        width: Optional[int] = None,
+    ) -> bytes:
+        """Encode the colors into a raw pixel buffer, see :mod:`color.buffer`"""
+        return encode_buffer(
+            self._data, fmt, byteorder=byteorder, dither=dither, width=width
+        )
+
+    @property
+    def data(self) -> array:
+        """Return the underlying packed ``array`` (not a copy)"""
+        return self._data
+
+    def tobytes(self) -> bytes:
+        """Return the native-endian packed 32-bit words"""
+        return self._data.tobytes()
+
+    def to_int(self) -> array:
+        """Return a copy of the packed integer values"""
+        return array(UINT32_TYPECODE, self._data)
+
+    def append(self, value: Union[int, RGB, RGBA]) -> None:
+        self._data.append(_pack(value))
+
+    def extend(self, values: Iterable[Union[int, RGB, RGBA]]) -> None:
+        if isinstance(values, ColorArray):
+            self._data.extend(values._data)
+        else:
+            self._data.extend(map(_pack, values))
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} len={len(self)}>"
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[RGBA]:
+        return map(RGBA, self._data)
+
+    def __contains__(self, item: Any) -> bool:
+        try:
+            return _pack(item) in self._data
+        except (TypeError, ValueError):
+            return False
+
+    # fmt: off
+    @overload
+    def __getitem__(self, i: int) -> RGBA: ... # noqa
+    @overload
+    def __getitem__(self, i: slice) -> Self: ... # noqa
+    # fmt: on
+
+    def __getitem__(self, i: Any):
+        if isinstance(i, slice):
+            return self.from_array(self._data[i])
+        return RGBA(self._data[i])
+
+    def __setitem__(self, i: Any, value: Any) -> None:
+        if isinstance(i, slice):
+            if isinstance(value, ColorArray):
+                self._data[i] = value._data
+            else:
+                self._data[i] = array(UINT32_TYPECODE, map(_pack, value))
+        else:
+            self._data[i] = _pack(value)
+
+    def __delitem__(self, i: Any) -> None:
+        del self._data[i]
+
+    # channel views
+    def _get_channel(self, name: str) -> array:
+        with memoryview(self._data) as view, view.cast("B") as raw:
+            return array("B", raw[_OFFSETS[name] :: 4].tobytes())
+
+    def _set_channel(self, name: str, value: Union[int, Iterable[int]]) -> None:
+        if isinstance(value, int):
+            value = bytes((value,)) * len(self)
+        elif not isinstance(value, (bytes, bytearray, array)):
+            value = bytes(value)
+        if len(value) != len(self):
+            raise ValueError(f"Channel must have {len(self)} items")
+
+        with memoryview(self._data) as view, view.cast("B") as raw:
+            raw[_OFFSETS[name] :: 4] = value
+
+    @property
+    def r(self) -> array:
+        """Return the red values as an ``array('B')``"""
+        return self._get_channel("r")
+
+    @r.setter
+    def r(self, value: Union[int, Iterable[int]]) -> None:
+        self._set_channel("r", value)
+
+    @property
+    def g(self) -> array:
+        """Return the green values as an ``array('B')``"""
+        return self._get_channel("g")
+
+    @g.setter
+    def g(self, value: Union[int, Iterable[int]]) -> None:
+        self._set_channel("g", value)
+
+    @property
+    def b(self) -> array:
+        """Return the blue values as an ``array('B')``"""
+        return self._get_channel("b")
+
+    @b.setter
+    def b(self, value: Union[int, Iterable[int]]) -> None:
+        self._set_channel("b", value)
+
+    @property
+    def a(self) -> array:
+        """Return the alpha values as an ``array('B')``"""
+        return self._get_channel("a")
+
+    @a.setter
+    def a(self, value: Union[int, Iterable[int]]) -> None:
+        self._set_channel("a", value)
+
+    def __parse_values(self, value: Any) -> Iterable[int]:
+        """Return an iterable of packed values to pair with every item"""
+        if isinstance(value, ColorArray):
+            values = value._data
+        elif isinstance(value, array):
+            values = value
+        elif isinstance(value, list):
+            values = list(map(_pack, value))
+        else:
+            return (_pack(value),) * len(self)
+
+        if len(values) != len(self):
+            raise ValueError(f"Operand must have {len(self)} items")
+        return values
+
+    def __compare(self, value: Any, op) -> Union[list[bool], Any]:
+        try:
+            values = self.__parse_values(value)
+        except (TypeError, ValueError):
+            return NotImplemented
+        return list(map(op, self._data, values))
+
+    def __bitwise(self, value: Any, op) -> Self:
+        values = self.__parse_values(value)
+        return self.from_array(
+            array(
+                UINT32_TYPECODE,
+                (op(x, y) & _MASK for x, y in zip(self._data, values)),
+            )
+        )
+
+    # ==
+    def __eq__(self, __value: Any) -> list[bool]:
+        return self.__compare(__value, int.__eq__)
+
+    # !=
+    def __ne__(self, __value: Any) -> list[bool]:
+        return self.__compare(__value, int.__ne__)
+
+    # <
+    def __lt__(self, __value: Any) -> list[bool]:
+        return self.__compare(__value, int.__lt__)
+
+    # >
+    def __gt__(self, __value: Any) -> list[bool]:
+        return self.__compare(__value, int.__gt__)
+
+    # <=
+    def __le__(self, __value: Any) -> list[bool]:
+        return self.__compare(__value, int.__le__)
+
+    # >=
+    def __ge__(self, __value: Any) -> list[bool]:
+        return self.__compare(__value, int.__ge__)
+
+    __hash__ = None
+
+    # +
+    def __pos__(self) -> array:
+        return self.to_int()
+
+    # ~
+    def __invert__(self) -> Self:
+        return self.from_array(
+            array(UINT32_TYPECODE, (~x & _MASK for x in self._data))
+        )
+
+    # <<
+    def __lshift__(self, __value: Any) -> Self:
+        return self.__bitwise(__value, int.__lshift__)
+
+    # >>
+    def __rshift__(self, __value: Any) -> Self:
+        return self.__bitwise(__value, int.__rshift__)
+
+    # &
+    def __and__(self, __value: Any) -> Self:
+        return self.__bitwise(__value, int.__and__)
+
+    # |
+    def __or__(self, __value: Any) -> Self:
+        return self.__bitwise(__value, int.__or__)
+
+    # ^
+    def __xor__(self, __value: Any) -> Self:
+        return self.__bitwise(__value, int.__xor__)
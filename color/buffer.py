@@ -0,0 +1,267 @@
+"""
+Decoding of raw pixel buffers (``bytes``, ``bytearray``, ``memoryview`` or any
+other object supporting the buffer protocol) into packed 0xRR_GG_BB_AA values.
+
+Supported layouts:
+
+- ``rgb888``   : 3 bytes per pixel, R G B
+- ``bgr888``   : 3 bytes per pixel, B G R
+- ``rgba8888`` : 4 bytes per pixel, R G B A
+- ``rgb565``   : 16-bit words, RRRRRGGG GGGBBBBB
+- ``rgb555``   : 16-bit words, xRRRRRGG GGGBBBBB
+
+``byteorder`` only applies to the 16-bit layouts; the byte layouts are read in
+memory order. The 16-bit layouts are decoded and encoded through lookup tables
+built on first use.
+"""
+
+import struct
+import sys
+from array import array
+from itertools import cycle
+from typing import Any, Iterable, Iterator, Literal, Optional
+
+from ._utils import UINT32_TYPECODE, get_bits, get_bytes
+
+__all__ = (
+    "BUFFER_FORMATS",
+    "iter_buffer",
+    "decode_buffer",
+    "encode_buffer",
+)
+
+FORMAT_TYPE = Literal["rgb888", "bgr888", "rgba8888", "rgb565", "rgb555"]
+BYTEORDER_TYPE = Literal["little", "big"]
+
+# bytes per pixel
+BUFFER_FORMATS: dict[str, int] = {
+    "rgb888": 3,
+    "bgr888": 3,
+    "rgba8888": 4,
+    "rgb565": 2,
+    "rgb555": 2,
+}
+
+
+# (shift, size) of the red, green and blue bits in a 16-bit word
+_WORD_LAYOUTS: dict[str, tuple[tuple[int, int], ...]] = {
+    "rgb565": ((11, 5), (5, 6), (0, 5)),
+    "rgb555": ((10, 5), (5, 5), (0, 5)),
+}
+
+# 4x4 ordered dithering (Bayer) thresholds, indexed by (y % 4) * 4 + x % 4
+_BAYER_4X4 = (0, 8, 2, 10, 12, 4, 14, 6, 3, 11, 1, 9, 15, 7, 13, 5)
+
+_DECODE_LUTS: dict[str, array] = {}
+_ENCODE_LUTS: dict[tuple[str, bool], list[tuple[array, array, array]]] = {}
+
+
+def _expand(value: int, size: int) -> int:
+    """Scale a ``size`` bits channel to 8 bits"""
+    max_value = (1 << size) - 1
+    return (value * 0xFF + max_value // 2) // max_value
+
+
+def _decode_word(value: int, fmt: str) -> int:
+    result = 0
+    for shift, size in _WORD_LAYOUTS[fmt]:
+        result = (result << 8) | _expand(get_bits(value, shift, size=size), size)
+    return (result << 8) | 0xFF
+
+
+def _decode_lut(fmt: str) -> array:
+    """Return the 65536 entries word -> 0xRR_GG_BB_AA table, built on first use"""
+    lut = _DECODE_LUTS.get(fmt)
+    if lut is None:
+        lut = _DECODE_LUTS[fmt] = array(
+            UINT32_TYPECODE, (_decode_word(value, fmt) for value in range(0x10000))
+        )
+    return lut
+
+
+def _encode_lut(fmt: str, dither: bool) -> list[tuple[array, array, array]]:
+    """
+    Return the byte -> shifted channel bits tables of ``fmt``, one (r, g, b)
+    triple per ordered dithering cell (or a single triple without dithering)
+    """
+    luts = _ENCODE_LUTS.get((fmt, dither))
+    if luts is None:
+        offsets = [(2 * x + 1) * 0xFF // 32 for x in _BAYER_4X4] if dither else [127]
+        luts = _ENCODE_LUTS[(fmt, dither)] = [
+            tuple(
+                array(
+                    "H",
+                    (
+                        ((value * ((1 << size) - 1) + offset) // 0xFF) << shift
+                        for value in range(0x100)
+                    ),
+                )
+                for shift, size in _WORD_LAYOUTS[fmt]
+            )
+            for offset in offsets
+        ]
+    return luts
+
+
+def _encode_word(
+    value: int, fmt: str, *, dither: bool = False, x: int = 0, y: int = 0
+) -> int:
+    """Pack a 0xRR_GG_BB_AA value into a ``fmt`` 16-bit word"""
+    luts = _encode_lut(fmt, dither)
+    r, g, b = luts[(y % 4) * 4 + x % 4] if dither else luts[0]
+    return r[get_bytes(value, 3)] | g[get_bytes(value, 2)] | b[get_bytes(value, 1)]
+
+
+def _view(buf: Any, fmt: str) -> memoryview:
+    """Return a flat byte view of ``buf`` without copying it"""
+    if fmt not in BUFFER_FORMATS:
+        raise ValueError(f"Unknown buffer format: {fmt!r}")
+
+    view = memoryview(buf)
+    if view.ndim != 1 or view.format != "B":
+        view = view.cast("B")
+    if len(view) % BUFFER_FORMATS[fmt]:
+        raise ValueError(
+            f"Buffer size must be a multiple of {BUFFER_FORMATS[fmt]} for {fmt!r}"
+        )
+    return view
+
+
+def _check_byteorder(byteorder: str) -> str:
+    if byteorder not in ("little", "big"):
+        raise ValueError("byteorder must be either 'little' or 'big'")
+    return "<" if byteorder == "little" else ">"
+
+
+def iter_buffer(
+    buf: Any, fmt: FORMAT_TYPE = "rgba8888", *, byteorder: BYTEORDER_TYPE = "little"
+) -> Iterator[int]:
+    """Yield the packed 0xRR_GG_BB_AA value of every pixel of ``buf``"""
+    order = _check_byteorder(byteorder)
+    view = _view(buf, fmt)
+
+    if fmt == "rgba8888":
+        return (value for value, in struct.iter_unpack(">I", view))
+    if fmt == "rgb888":
+        return (
+            (r << 24) | (g << 16) | (b << 8) | 0xFF
+            for r, g, b in struct.iter_unpack("3B", view)
+        )
+    if fmt == "bgr888":
+        return (
+            (r << 24) | (g << 16) | (b << 8) | 0xFF
+            for b, g, r in struct.iter_unpack("3B", view)
+        )
+
+    lut = _decode_lut(fmt)
+    return (lut[value] for value, in struct.iter_unpack(f"{order}H", view))
+
+
+def _words(view: memoryview, byteorder: str) -> Any:
+    """Return the 16-bit words of ``view``, copying only to swap bytes"""
+    if byteorder == sys.byteorder:
+        return view.cast("H")
+
+    words = array("H")
+    words.frombytes(view)
+    words.byteswap()
+    return words
+
+
+def decode_buffer(
+    buf: Any, fmt: FORMAT_TYPE = "rgba8888", *, byteorder: BYTEORDER_TYPE = "little"
+) -> array:
+    """Return the packed 0xRR_GG_BB_AA values of ``buf`` as an ``array``"""
+    _check_byteorder(byteorder)
+    view = _view(buf, fmt)
+    size = BUFFER_FORMATS[fmt]
+
+    if fmt in _WORD_LAYOUTS:
+        words = _words(view, byteorder)
+        try:
+            return array(UINT32_TYPECODE, map(_decode_lut(fmt).__getitem__, words))
+        finally:
+            if isinstance(words, memoryview):
+                words.release()
+
+    count = len(view) // size
+    result = array(UINT32_TYPECODE, bytes(count * 4))
+    with memoryview(result) as out, out.cast("B") as raw:
+        if fmt == "rgba8888":
+            raw[:] = view
+        else:
+            r, b = (0, 2) if fmt == "rgb888" else (2, 0)
+            raw[0::4] = view[r::3]
+            raw[1::4] = view[1::3]
+            raw[2::4] = view[b::3]
+            raw[3::4] = b"\xff" * count
+
+    # bytes are laid out as R G B A, i.e. big-endian words
+    if sys.byteorder == "little":
+        result.byteswap()
+    return result
+
+
+def _channels(values: array) -> tuple[bytes, bytes, bytes, bytes]:
+    """Split packed 0xRR_GG_BB_AA values into r, g, b and a bytes"""
+    if sys.byteorder == "little":
+        values = array(UINT32_TYPECODE, values)
+        values.byteswap()
+    raw = values.tobytes()
+    return raw[0::4], raw[1::4], raw[2::4], raw[3::4]
+
+
+def encode_buffer(
+    values: Iterable[int],
+    fmt: FORMAT_TYPE = "rgba8888",
+    *,
+    byteorder: BYTEORDER_TYPE = "little",
+    dither: bool = False,
+    width: Optional[int] = None,
+) -> bytes:
+    """
+    Encode packed 0xRR_GG_BB_AA values into a raw ``fmt`` buffer
+
+    ``dither`` applies 4x4 ordered dithering to the 16-bit layouts, using
+    ``width`` (defaults to a single row) to locate every pixel.
+    """
+    _check_byteorder(byteorder)
+    if fmt not in BUFFER_FORMATS:
+        raise ValueError(f"Unknown buffer format: {fmt!r}")
+    if not isinstance(values, array) or values.typecode != UINT32_TYPECODE:
+        values = array(UINT32_TYPECODE, values)
+
+    if fmt == "rgba8888":
+        if sys.byteorder == "little":
+            values = array(UINT32_TYPECODE, values)
+            values.byteswap()
+        return values.tobytes()
+
+    r, g, b, _ = _channels(values)
+    if fmt in ("rgb888", "bgr888"):
+        result = bytearray(len(values) * 3)
+        if fmt == "bgr888":
+            r, b = b, r
+        result[0::3], result[1::3], result[2::3] = r, g, b
+        return bytes(result)
+
+    luts = _encode_lut(fmt, dither)
+    if not dither:
+        ((rt, gt, bt),) = luts
+        words = array("H", [rt[x] | gt[y] | bt[z] for x, y, z in zip(r, g, b)])
+    else:
+        width = width or len(values) or 1
+        words = array("H")
+        for start in range(0, len(values), width):
+            row = (start // width % 4) * 4
+            end = start + width
+            words.extend(
+                rt[x] | gt[y] | bt[z]
+                for (rt, gt, bt), x, y, z in zip(
+                    cycle(luts[row : row + 4]), r[start:end], g[start:end], b[start:end]
+                )
+            )
+
+    if byteorder != sys.byteorder:
+        words.byteswap()
+    return words.tobytes()
@@ -1,47 +1,83 @@
-from typing_extensions import Self
+import sys
+from typing import Any, Iterator, Optional
 
-from ._utils import YUVStandard, get_bits, get_bytes
-from .types import RGBA
-from .vars import NAMES_COLORS
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
 
-__all__ = ("Color",)
+from ._utils import MISSING, YUV_BT470, YUVStandard, get_bytes
+from .buffer import (
+    BYTEORDER_TYPE,
+    FORMAT_TYPE,
+    _decode_lut,
+    _encode_word,
+    iter_buffer,
+)
+from .composite import MODE_TYPE, blend, over, premultiply, unpremultiply
+from .convert import (
+    _rgb_to_lab,
+    _rgb_to_oklab,
+    _rgb_to_oklch,
+    _rgb_to_xyz,
+    _rgb_to_yuv,
+    _yuv_to_rgb,
+)
+from .difference import METHOD_TYPE, delta_e
+from .gradient import SPACE_TYPE, mix
+from .names import lookup_name, name_of, nearest_name
+from .parse import parse_color
+from .types import OKLCH, RGBA, XYZ, YUV, Lab, OKLab
 
-YUV_BT470 = YUVStandard()
-# WR=0.299, WG=0.587
+__all__ = ("Color",)
 
 
 class Color(RGBA):
+    __slots__ = ()
+
+    @property
+    def name(self) -> Optional[str]:
+        """Return the canonical name of the color, or ``None`` if it has none"""
+        return name_of(self.to_int())
+
     @classmethod
     def from_str(cls, s: str) -> Self:
-        ...
+        """Parse a CSS color string, see :func:`color.parse.parse_color`"""
+        return cls(parse_color(s))
 
     @classmethod
-    def from_name(cls, name: str) -> Self:
-        return cls.from_rgb(NAMES_COLORS.get(name, 0))
+    def from_name(cls, name: str, default: Any = MISSING) -> Self:
+        """
+        Return the named color, ignoring case and whitespace
+
+        Unknown names raise ``ValueError`` unless a ``default`` is given.
+        """
+        value = lookup_name(name, None)
+        if value is None:
+            if default is not MISSING:
+                return default
+            raise ValueError(f"Unknown color name: {name!r}")
+        return cls.from_rgb(value)
 
     @classmethod
     def from_rgb(cls, value: int) -> Self:
-        return cls(get_bytes(value, 2), get_bytes(value, 1), get_bytes(value))
+        return cls(get_bytes(value, 2), get_bytes(value, 1), get_bytes(value), 0xFF)
 
     @classmethod
     def from_rgb24(cls, value: int) -> Self:
-        return cls(get_bytes(value), get_bytes(value, 1), get_bytes(value, 2))
+        return cls(get_bytes(value), get_bytes(value, 1), get_bytes(value, 2), 0xFF)
 
     @classmethod
     def from_rgb565(cls, value: int) -> Self:
-        return cls.from_rgb(
-            get_bits(value, 11, size=5),  # r
-            get_bits(value, 5, size=6),  # g
-            get_bits(value, 0, size=5),  # b
-        )
+        if value < 0 or value > 0xFFFF:
+            raise ValueError("Value must be between 0 and 0xFFFF")
+        return cls(_decode_lut("rgb565")[value])
 
     @classmethod
     def from_rgb555(cls, value: int) -> Self:
-        return cls.from_rgb(
-            get_bytes(value, 2, unit=5),  # r
-            get_bytes(value, 1, unit=5),  # g
-            get_bytes(value, 0, unit=5),  # b
-        )
+        if value < 0 or value > 0xFFFF:
+            raise ValueError("Value must be between 0 and 0xFFFF")
+        return cls(_decode_lut("rgb555")[value])
 
     @classmethod
     def from_rgba(cls, value: int) -> Self:
@@ -53,9 +89,83 @@ class Color(RGBA):
         )
 
     @classmethod
-    def from_yuv(cls, y: int, u: int, v: int) -> Self:
+    def from_yuv(
+        cls, y: float, u: float, v: float, *, standard: YUVStandard = YUV_BT470
+    ) -> Self:
         """
         [YUV Wiki](https://en.wikipedia.org/wiki/Y%E2%80%B2UV)
         """
-        # TODO
-        return cls.from_rgb()
+        return cls(*_yuv_to_rgb(y, u, v, standard), 0xFF)
+
+    def to_yuv(self, *, standard: YUVStandard = YUV_BT470) -> YUV:
+        """Return the normalized Y'UV value, see :class:`YUVStandard`"""
+        return YUV(_rgb_to_yuv(self.r, self.g, self.b, standard))
+
+    def to_xyz(self) -> XYZ:
+        """Return the CIE XYZ (D65) value"""
+        return XYZ(_rgb_to_xyz(self.r, self.g, self.b))
+
+    def to_lab(self) -> Lab:
+        """Return the CIE L*a*b* (D65) value"""
+        return Lab(_rgb_to_lab(self.r, self.g, self.b))
+
+    def to_oklab(self) -> OKLab:
+        """Return the Oklab value"""
+        return OKLab(_rgb_to_oklab(self.r, self.g, self.b))
+
+    def to_oklch(self) -> OKLCH:
+        """Return the OkLCh value"""
+        return OKLCH(_rgb_to_oklch(self.r, self.g, self.b))
+
+    @classmethod
+    def iter_from_buffer(
+        cls,
+        buf: Any,
+        fmt: FORMAT_TYPE = "rgba8888",
+        *,
+        byteorder: BYTEORDER_TYPE = "little",
+    ) -> Iterator[Self]:
+        """Yield a color for every pixel of a raw buffer, see :mod:`color.buffer`"""
+        return map(cls, iter_buffer(buf, fmt, byteorder=byteorder))
+
+    def to_rgb565(self, *, dither: bool = False, x: int = 0, y: int = 0) -> int:
+        """
+        Return the RGB565 word, with ``dither`` applying 4x4 ordered dithering
+        for a pixel at (``x``, ``y``)
+        """
+        return _encode_word(self.to_int(), "rgb565", dither=dither, x=x, y=y)
+
+    def to_rgb555(self, *, dither: bool = False, x: int = 0, y: int = 0) -> int:
+        """
+        Return the RGB555 word, with ``dither`` applying 4x4 ordered dithering
+        for a pixel at (``x``, ``y``)
+        """
+        return _encode_word(self.to_int(), "rgb555", dither=dither, x=x, y=y)
+
+    def nearest_name(self, *, space: str = "rgb") -> str:
+        """Return the name of the closest named color, see :mod:`color.names`"""
+        return nearest_name(self, space=space)
+
+    def delta_e(self, other: Any, *, method: METHOD_TYPE = "ciede2000") -> float:
+        """Return the difference to ``other``, see :mod:`color.difference`"""
+        return delta_e(self, other, method=method)
+
+    def premultiply(self) -> Self:
+        """Return the color with its channels multiplied by its alpha"""
+        return self.__class__.from_rgba(premultiply(self))
+
+    def unpremultiply(self) -> Self:
+        """Return the straight alpha color of a premultiplied color"""
+        return self.__class__.from_rgba(unpremultiply(self))
+
+    def over(self, backdrop: Any) -> Self:
+        """Return the color composited over ``backdrop``"""
+        return self.__class__.from_rgba(over(self, backdrop))
+
+    def blend(self, backdrop: Any, mode: MODE_TYPE = "normal") -> Self:
+        """Return the color blended with ``mode`` over ``backdrop``"""
+        return self.__class__.from_rgba(blend(self, backdrop, mode))
+
+    def mix(self, other: Any, t: float = 0.5, *, space: SPACE_TYPE = "rgb") -> Self:
+        """Return the color ``t`` of the way to ``other``, see :func:`mix`"""
+        return self.__class__.from_rgba(mix(self, other, t, space=space))
@@ -0,0 +1,256 @@
+"""
+Alpha compositing and blend modes.
+
+Colors use straight (non-premultiplied) alpha unless stated otherwise. All
+math is done on 8-bit integers through 65536 entry lookup tables built on
+first use, so no float division happens per pixel:
+
+- ``x * y / 255`` is ``_lut("mul")[x << 8 | y]``, rounded
+- ``y * 255 / x`` is ``_lut("div")[x << 8 | y]``, rounded and clamped
+
+Scalar functions take packed 0xRR_GG_BB_AA ints or :class:`RGB` /
+:class:`RGBA` values. Buffer functions take packed ``array``s /
+:class:`ColorArray`s (returning an ``array``) or raw ``rgba8888`` buffers
+(returning ``bytes``), and work on whole channel planes at once, with NumPy
+when it is installed.
+
+Blend modes follow the W3C compositing spec: the blended color replaces the
+source where the backdrop is opaque, then the result is composited ``over``
+the backdrop.
+"""
+
+from array import array
+from typing import Any, Callable, Literal, Union
+
+from ._utils import UINT32_TYPECODE, np
+from .array import ColorArray, _pack
+from .buffer import _channels, _view, decode_buffer
+from .types import RGB, RGBA
+
+__all__ = (
+    "BLEND_MODES",
+    "premultiply",
+    "unpremultiply",
+    "over",
+    "blend",
+    "premultiply_buffer",
+    "unpremultiply_buffer",
+    "composite_buffer",
+)
+
+MODE_TYPE = Literal["normal", "multiply", "screen", "overlay"]
+COLOR_TYPE = Union[int, RGB, RGBA]
+
+_LUTS: dict[str, bytes] = {}
+_NP_LUTS: dict[str, Any] = {}
+
+# 255 - x
+_INVERT = bytes(range(0xFF, -1, -1))
+
+
+def _mul(x: int, y: int) -> int:
+    """Return ``x * y / 255`` rounded, for 8-bit ``x`` and ``y``"""
+    v = x * y + 128
+    return (v + (v >> 8)) >> 8
+
+
+def _multiply(backdrop: int, source: int) -> int:
+    return _mul(backdrop, source)
+
+
+def _screen(backdrop: int, source: int) -> int:
+    return backdrop + source - _mul(backdrop, source)
+
+
+def _overlay(backdrop: int, source: int) -> int:
+    # hard light with the layers swapped
+    if backdrop < 128:
+        return _multiply(source, 2 * backdrop)
+    return _screen(source, 2 * backdrop - 0xFF)
+
+
+# mode -> blend function (backdrop, source) -> blended channel
+BLEND_MODES: dict[str, Callable[[int, int], int]] = {
+    "normal": lambda backdrop, source: source,
+    "multiply": _multiply,
+    "screen": _screen,
+    "overlay": _overlay,
+}
+
+
+def _lut(name: str) -> bytes:
+    """Return the (x << 8 | y) -> byte table ``name``, built on first use"""
+    lut = _LUTS.get(name)
+    if lut is None:
+        if name == "mul":
+            func = _mul
+        elif name == "div":
+            # y * 255 / x, 0 for x == 0
+            func = lambda x, y: min(0xFF, (y * 0xFF + x // 2) // x) if x else 0
+        else:
+            func = BLEND_MODES[name]
+        lut = _LUTS[name] = bytes(
+            func(x, y) for x in range(0x100) for y in range(0x100)
+        )
+    return lut
+
+
+def _check_mode(mode: str) -> None:
+    if mode not in BLEND_MODES:
+        raise ValueError(f"Unknown blend mode: {mode!r}")
+
+
+def _split(value: COLOR_TYPE) -> tuple[int, int, int, int]:
+    value = _pack(value)
+    return value >> 24, (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF
+
+
+def premultiply(value: COLOR_TYPE) -> int:
+    """Return the packed color with its channels multiplied by its alpha"""
+    *colors, a = _split(value)
+    mul, result = _lut("mul"), 0
+    for c in colors:
+        result = (result << 8) | mul[c << 8 | a]
+    return (result << 8) | a
+
+
+def unpremultiply(value: COLOR_TYPE) -> int:
+    """Return the packed color of a premultiplied color, see :func:`premultiply`"""
+    *colors, a = _split(value)
+    div, result = _lut("div"), 0
+    for c in colors:
+        result = (result << 8) | div[a << 8 | c]
+    return (result << 8) | a
+
+
+def blend(
+    source: COLOR_TYPE, backdrop: COLOR_TYPE, mode: MODE_TYPE = "normal"
+) -> int:
+    """Return ``source`` blended with ``mode`` and composited over ``backdrop``"""
+    _check_mode(mode)
+    mul, div, lut = _lut("mul"), _lut("div"), _lut(mode)
+    *src, sa = _split(source)
+    *dst, da = _split(backdrop)
+
+    alpha = sa + mul[da << 8 | 0xFF - sa]
+    # share of the source in the result
+    weight = div[alpha << 8 | sa]
+    result = 0
+    for s, d in zip(src, dst):
+        if mode != "normal":
+            s = mul[0xFF - da << 8 | s] + mul[da << 8 | lut[d << 8 | s]]
+        result = (result << 8) | (mul[s << 8 | weight] + mul[d << 8 | 0xFF - weight])
+    return (result << 8) | alpha
+
+
+def over(source: COLOR_TYPE, backdrop: COLOR_TYPE) -> int:
+    """Return ``source`` composited over ``backdrop`` (Porter-Duff source-over)"""
+    return blend(source, backdrop, "normal")
+
+
+# plane kernels, bytes in pure Python or uint8 arrays with NumPy
+def _py_lut(name: str, x: Any, y: Any) -> bytes:
+    lut = _lut(name)
+    return bytes([lut[a << 8 | b] for a, b in zip(x, y)])
+
+
+def _py_invert(x: bytes) -> bytes:
+    return x.translate(_INVERT)
+
+
+def _py_add(x: Any, y: Any) -> bytes:
+    return bytes([a + b for a, b in zip(x, y)])
+
+
+def _np_lut(name: str, x: Any, y: Any) -> Any:
+    lut = _NP_LUTS.get(name)
+    if lut is None:
+        lut = _NP_LUTS[name] = np.frombuffer(_lut(name), dtype=np.uint8)
+    return lut[(x.astype(np.uint16) << 8) | y]
+
+
+def _planes(buf: Any) -> tuple[list[Any], bool]:
+    """Return the r, g, b and a planes of ``buf``, and if it is packed"""
+    if isinstance(buf, ColorArray):
+        buf = buf.data
+    if isinstance(buf, array) and buf.typecode == UINT32_TYPECODE:
+        planes, packed = list(_channels(buf)), True
+    elif isinstance(buf, (bytes, bytearray, memoryview)):
+        view = _view(buf, "rgba8888")
+        planes, packed = [view[i::4].tobytes() for i in range(4)], False
+    else:
+        planes = list(_channels(array(UINT32_TYPECODE, map(_pack, buf))))
+        packed = True
+
+    if np is not None:
+        planes = [np.frombuffer(plane, dtype=np.uint8) for plane in planes]
+    return planes, packed
+
+
+def _join(planes: list[Any], packed: bool) -> Union[array, bytes]:
+    result = bytearray(4 * len(planes[0]))
+    for i, plane in enumerate(planes):
+        result[i::4] = bytes(plane)
+    return decode_buffer(result) if packed else bytes(result)
+
+
+def premultiply_buffer(buf: Any) -> Union[array, bytes]:
+    """Premultiply every pixel of ``buf``, see :func:`premultiply`"""
+    (*colors, alpha), packed = _planes(buf)
+    lut = _py_lut if np is None else _np_lut
+    return _join([lut("mul", c, alpha) for c in colors] + [alpha], packed)
+
+
+def unpremultiply_buffer(buf: Any) -> Union[array, bytes]:
+    """Unpremultiply every pixel of ``buf``, see :func:`unpremultiply`"""
+    (*colors, alpha), packed = _planes(buf)
+    lut = _py_lut if np is None else _np_lut
+    return _join([lut("div", alpha, c) for c in colors] + [alpha], packed)
+
+
+def composite_buffer(
+    source: Any, backdrop: Any, mode: MODE_TYPE = "normal"
+) -> Union[array, bytes]:
+    """
+    Blend every pixel of ``source`` with ``mode`` and composite it over the
+    matching pixel of ``backdrop``, see :func:`blend`
+
+    The result has the type of ``backdrop``.
+    """
+    _check_mode(mode)
+    (*src, sa), _ = _planes(source)
+    (*dst, da), packed = _planes(backdrop)
+    if len(sa) != len(da):
+        raise ValueError("source and backdrop must have the same number of pixels")
+
+    if np is None:
+        lut, add = _py_lut, _py_add
+        inverse_sa, inverse_da = _py_invert(sa), _py_invert(da)
+        opaque = lambda plane: plane.count(0xFF) == len(plane)
+    else:
+        lut, add = _np_lut, np.add
+        inverse_sa, inverse_da = 0xFF - sa, 0xFF - da
+        opaque = lambda plane: bool((plane == 0xFF).all())
+
+    if mode == "normal" and opaque(sa):
+        return _join(src + [sa], packed)
+
+    if mode != "normal":
+        src = [
+            add(lut("mul", inverse_da, s), lut("mul", da, lut(mode, d, s)))
+            for s, d in zip(src, dst)
+        ]
+
+    if opaque(da):
+        # opaque backdrop: the share of the source is its alpha
+        alpha, weight, inverse_weight = da, sa, inverse_sa
+    else:
+        alpha = add(sa, lut("mul", da, inverse_sa))
+        weight = lut("div", alpha, sa)
+        inverse_weight = _py_invert(weight) if np is None else 0xFF - weight
+
+    colors = [
+        add(lut("mul", s, weight), lut("mul", d, inverse_weight))
+        for s, d in zip(src, dst)
+    ]
+    return _join(colors + [alpha], packed)
@@ -0,0 +1,579 @@
+"""
+Batch conversion between RGB and the HSL, HSV, Y'UV, CIE XYZ / L*a*b* and
+Oklab / OkLCh color spaces.
+
+Every function takes a NumPy array of shape (N, 3) or (N, 4) when NumPy is
+installed, or any sequence of 3/4-item sequences otherwise. A fourth (alpha)
+column is passed through untouched. The pure Python path performs the same
+floating point operations in the same order, so both paths return identical
+values; only the perceptual spaces may differ in the last bits where NumPy's
+power and trigonometric functions round differently from ``math``. sRGB
+channels are linearized through a precomputed 256 entries table.
+
+RGB channels are integers in 0~255, hue is in degrees (0~360), saturation,
+lightness, value and luma are in 0~1 and U/V are in -UMAX~UMAX / -VMAX~VMAX
+of the chosen :class:`YUVStandard`. ``rgb_to_ycbcr`` / ``ycbcr_to_rgb`` work
+on 8-bit Y'CbCr using the integer matrices (and range) of the standard.
+"""
+
+from math import atan2, copysign, cos, pi, sin, sqrt
+from typing import Any, Callable
+
+from ._utils import (
+    YUV_BT470,
+    YUV_BT601,
+    YUV_BT709,
+    YUV_BT2020,
+    YUVStandard,
+    is_ndarray,
+    np,
+)
+
+__all__ = (
+    "YUVStandard",
+    "YUV_BT470",
+    "YUV_BT601",
+    "YUV_BT709",
+    "YUV_BT2020",
+    "rgb_to_hsl",
+    "hsl_to_rgb",
+    "rgb_to_hsv",
+    "hsv_to_rgb",
+    "rgb_to_yuv",
+    "yuv_to_rgb",
+    "rgb_to_ycbcr",
+    "ycbcr_to_rgb",
+    "rgb_to_xyz",
+    "xyz_to_rgb",
+    "rgb_to_lab",
+    "lab_to_rgb",
+    "rgb_to_oklab",
+    "oklab_to_rgb",
+    "rgb_to_oklch",
+    "oklch_to_rgb",
+)
+
+# index of (C, X, 0) assigned to (r, g, b) for each 60° hue sector
+_SECTORS = ((0, 1, 2), (1, 0, 2), (2, 0, 1), (2, 1, 0), (1, 2, 0), (0, 2, 1))
+
+
+def _clamp_byte(value: float) -> int:
+    return max(0, min(255, round(value * 255)))
+
+
+def _hue(r: float, g: float, b: float, hi: float, d: float) -> float:
+    if hi == r:
+        h = ((g - b) / d) % 6
+    elif hi == g:
+        h = (b - r) / d + 2
+    else:
+        h = (r - g) / d + 4
+    return h * 60
+
+
+def _from_hue(h: float, c: float, m: float) -> tuple[int, int, int]:
+    hp = (h % 360) / 60
+    x = c * (1 - abs(hp % 2 - 1))
+    values = (c, x, 0.0)
+    i, j, k = _SECTORS[min(int(hp), 5)]
+    return (
+        _clamp_byte(values[i] + m),
+        _clamp_byte(values[j] + m),
+        _clamp_byte(values[k] + m),
+    )
+
+
+def _rgb_to_hsl(r: int, g: int, b: int) -> tuple[float, float, float]:
+    r, g, b = r / 255, g / 255, b / 255
+    hi, lo = max(r, g, b), min(r, g, b)
+    d = hi - lo
+    l = (hi + lo) / 2
+    if d == 0:
+        return 0.0, 0.0, l
+    return _hue(r, g, b, hi, d), d / (1 - abs(2 * l - 1)), l
+
+
+def _hsl_to_rgb(h: float, s: float, l: float) -> tuple[int, int, int]:
+    c = (1 - abs(2 * l - 1)) * s
+    return _from_hue(h, c, l - c / 2)
+
+
+def _rgb_to_hsv(r: int, g: int, b: int) -> tuple[float, float, float]:
+    r, g, b = r / 255, g / 255, b / 255
+    hi, lo = max(r, g, b), min(r, g, b)
+    d = hi - lo
+    if d == 0:
+        return 0.0, 0.0, hi
+    return _hue(r, g, b, hi, d), d / hi, hi
+
+
+def _hsv_to_rgb(h: float, s: float, v: float) -> tuple[int, int, int]:
+    c = v * s
+    return _from_hue(h, c, v - c)
+
+
+def _rgb_to_yuv(
+    r: int, g: int, b: int, standard: YUVStandard
+) -> tuple[float, float, float]:
+    r, g, b = r / 255, g / 255, b / 255
+    return tuple(m0 * r + m1 * g + m2 * b for m0, m1, m2 in standard.matrix)
+
+
+def _yuv_to_rgb(
+    y: float, u: float, v: float, standard: YUVStandard
+) -> tuple[int, int, int]:
+    return tuple(
+        _clamp_byte(m0 * y + m1 * u + m2 * v) for m0, m1, m2 in standard.inverse
+    )
+
+
+def _rgb_to_ycbcr(
+    r: int, g: int, b: int, standard: YUVStandard
+) -> tuple[int, int, int]:
+    return standard.encode(r, g, b)
+
+
+def _ycbcr_to_rgb(
+    y: int, u: int, v: int, standard: YUVStandard
+) -> tuple[int, int, int]:
+    return standard.decode(y, u, v)
+
+
+# sRGB byte -> linear light, looked up instead of a pow() per channel
+_LINEAR = tuple(
+    x / 255 / 12.92 if x / 255 <= 0.04045 else ((x / 255 + 0.055) / 1.055) ** 2.4
+    for x in range(256)
+)
+
+# linear sRGB <-> CIE XYZ (D65)
+_RGB_TO_XYZ = (
+    (0.4124564, 0.3575761, 0.1804375),
+    (0.2126729, 0.7151522, 0.0721750),
+    (0.0193339, 0.1191920, 0.9503041),
+)
+_XYZ_TO_RGB = (
+    (3.2404542, -1.5371385, -0.4985314),
+    (-0.9692660, 1.8760108, 0.0415560),
+    (0.0556434, -0.2040259, 1.0572252),
+)
+_WHITE_D65 = (0.95047, 1.0, 1.08883)
+_LAB_EPSILON = (6 / 29) ** 3
+_LAB_KAPPA = 3 * (6 / 29) ** 2
+
+# linear sRGB <-> LMS <-> Oklab, https://bottosson.github.io/posts/oklab/
+_RGB_TO_LMS = (
+    (0.4122214708, 0.5363325363, 0.0514459929),
+    (0.2119034982, 0.6806995451, 0.1073969566),
+    (0.0883024619, 0.2817188376, 0.6299787005),
+)
+_LMS_TO_OKLAB = (
+    (0.2104542553, 0.7936177850, -0.0040720468),
+    (1.9779984951, -2.4285922050, 0.4505937099),
+    (0.0259040371, 0.7827717662, -0.8086757660),
+)
+_OKLAB_TO_LMS = (
+    (1.0, 0.3963377774, 0.2158037573),
+    (1.0, -0.1055613458, -0.0638541728),
+    (1.0, -0.0894841775, -1.2914855480),
+)
+_LMS_TO_RGB = (
+    (4.0767416621, -3.3077115913, 0.2309699292),
+    (-1.2684380046, 2.6097574011, -0.3413193965),
+    (-0.0041960863, -0.7034186147, 1.7076147010),
+)
+
+
+def _dot(matrix: tuple, a: float, b: float, c: float) -> tuple[float, float, float]:
+    return tuple(m0 * a + m1 * b + m2 * c for m0, m1, m2 in matrix)
+
+
+def _encode_gamma(value: float) -> int:
+    if value <= 0.0031308:
+        return _clamp_byte(value * 12.92)
+    return _clamp_byte(1.055 * value ** (1 / 2.4) - 0.055)
+
+
+def _cbrt(value: float) -> float:
+    return copysign(abs(value) ** (1 / 3), value)
+
+
+def _lab_f(value: float) -> float:
+    if value > _LAB_EPSILON:
+        return value ** (1 / 3)
+    return value / _LAB_KAPPA + 4 / 29
+
+
+def _lab_f_inverse(value: float) -> float:
+    if value > 6 / 29:
+        return value**3
+    return _LAB_KAPPA * (value - 4 / 29)
+
+
+def _rgb_to_xyz(r: int, g: int, b: int) -> tuple[float, float, float]:
+    return _dot(_RGB_TO_XYZ, _LINEAR[r], _LINEAR[g], _LINEAR[b])
+
+
+def _xyz_to_rgb(x: float, y: float, z: float) -> tuple[int, int, int]:
+    return tuple(map(_encode_gamma, _dot(_XYZ_TO_RGB, x, y, z)))
+
+
+def _rgb_to_lab(r: int, g: int, b: int) -> tuple[float, float, float]:
+    x, y, z = _rgb_to_xyz(r, g, b)
+    fx, fy, fz = (
+        _lab_f(x / _WHITE_D65[0]),
+        _lab_f(y / _WHITE_D65[1]),
+        _lab_f(z / _WHITE_D65[2]),
+    )
+    return 116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)
+
+
+def _lab_to_rgb(l: float, a: float, b: float) -> tuple[int, int, int]:
+    fy = (l + 16) / 116
+    return _xyz_to_rgb(
+        _lab_f_inverse(fy + a / 500) * _WHITE_D65[0],
+        _lab_f_inverse(fy) * _WHITE_D65[1],
+        _lab_f_inverse(fy - b / 200) * _WHITE_D65[2],
+    )
+
+
+def _rgb_to_oklab(r: int, g: int, b: int) -> tuple[float, float, float]:
+    lms = _dot(_RGB_TO_LMS, _LINEAR[r], _LINEAR[g], _LINEAR[b])
+    return _dot(_LMS_TO_OKLAB, *map(_cbrt, lms))
+
+
+def _oklab_to_rgb(l: float, a: float, b: float) -> tuple[int, int, int]:
+    lms = [x**3 for x in _dot(_OKLAB_TO_LMS, l, a, b)]
+    return tuple(map(_encode_gamma, _dot(_LMS_TO_RGB, *lms)))
+
+
+def _rgb_to_oklch(r: int, g: int, b: int) -> tuple[float, float, float]:
+    l, a, b = _rgb_to_oklab(r, g, b)
+    return l, sqrt(a * a + b * b), (atan2(b, a) * (180 / pi)) % 360
+
+
+def _oklch_to_rgb(l: float, c: float, h: float) -> tuple[int, int, int]:
+    h = h * (pi / 180)
+    return _oklab_to_rgb(l, c * cos(h), c * sin(h))
+
+
+# numpy kernels, mirroring the scalar operations above
+def _np_split(values: Any, scale: float = 1) -> tuple[Any, Any, Any]:
+    data = values[:, :3].astype(np.float64)
+    if scale != 1:
+        data /= scale
+    return data[:, 0], data[:, 1], data[:, 2]
+
+
+def _np_clamp_byte(value: Any) -> Any:
+    return np.clip(np.rint(value * 255), 0, 255).astype(np.uint8)
+
+
+def _np_hue(r: Any, g: Any, b: Any, hi: Any, d: Any) -> Any:
+    h = np.where(
+        hi == r,
+        ((g - b) / d) % 6,
+        np.where(hi == g, (b - r) / d + 2, (r - g) / d + 4),
+    )
+    return h * 60
+
+
+def _np_from_hue(h: Any, c: Any, m: Any) -> Any:
+    hp = (h % 360) / 60
+    x = c * (1 - np.abs(hp % 2 - 1))
+    values = np.stack((c, x, np.zeros_like(c)), axis=1)
+    index = np.array(_SECTORS)[np.minimum(hp.astype(np.intp), 5)]
+    return _np_clamp_byte(np.take_along_axis(values, index, axis=1) + m[:, None])
+
+
+def _np_rgb_to_hsl(values: Any) -> Any:
+    r, g, b = _np_split(values, 255)
+    hi, lo = np.maximum(np.maximum(r, g), b), np.minimum(np.minimum(r, g), b)
+    d = hi - lo
+    l = (hi + lo) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = np.where(d == 0, 0.0, _np_hue(r, g, b, hi, d))
+        s = np.where(d == 0, 0.0, d / (1 - np.abs(2 * l - 1)))
+    return np.stack((h, s, l), axis=1)
+
+
+def _np_hsl_to_rgb(values: Any) -> Any:
+    h, s, l = _np_split(values)
+    c = (1 - np.abs(2 * l - 1)) * s
+    return _np_from_hue(h, c, l - c / 2)
+
+
+def _np_rgb_to_hsv(values: Any) -> Any:
+    r, g, b = _np_split(values, 255)
+    hi, lo = np.maximum(np.maximum(r, g), b), np.minimum(np.minimum(r, g), b)
+    d = hi - lo
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = np.where(d == 0, 0.0, _np_hue(r, g, b, hi, d))
+        s = np.where(d == 0, 0.0, d / hi)
+    return np.stack((h, s, hi), axis=1)
+
+
+def _np_hsv_to_rgb(values: Any) -> Any:
+    h, s, v = _np_split(values)
+    c = v * s
+    return _np_from_hue(h, c, v - c)
+
+
+def _np_rgb_to_yuv(values: Any, standard: YUVStandard) -> Any:
+    r, g, b = _np_split(values, 255)
+    return np.stack(
+        [m0 * r + m1 * g + m2 * b for m0, m1, m2 in standard.matrix], axis=1
+    )
+
+
+def _np_yuv_to_rgb(values: Any, standard: YUVStandard) -> Any:
+    y, u, v = _np_split(values)
+    return np.stack(
+        [
+            _np_clamp_byte(m0 * y + m1 * u + m2 * v)
+            for m0, m1, m2 in standard.inverse
+        ],
+        axis=1,
+    )
+
+
+def _np_rgb_to_ycbcr(values: Any, standard: YUVStandard) -> Any:
+    data = values[:, :3].astype(np.int64)
+    r, g, b = data[:, 0], data[:, 1], data[:, 2]
+    shift = standard.FIXED_SHIFT
+    half = 1 << (shift - 1)
+    return np.stack(
+        [
+            np.clip(((m0 * r + m1 * g + m2 * b + half) >> shift) + offset, 0, 255)
+            for (m0, m1, m2), offset in zip(standard.fixed_matrix, standard.offsets)
+        ],
+        axis=1,
+    ).astype(np.uint8)
+
+
+def _np_ycbcr_to_rgb(values: Any, standard: YUVStandard) -> Any:
+    data = values[:, :3].astype(np.intp)
+    ys, rv, gu, gv, bu = map(np.array, standard.decode_tables())
+    y, u, v = ys[data[:, 0]], data[:, 1], data[:, 2]
+    shift = standard.FIXED_SHIFT
+    return np.stack(
+        [
+            np.clip((y + rv[v]) >> shift, 0, 255),
+            np.clip((y + gu[u] + gv[v]) >> shift, 0, 255),
+            np.clip((y + bu[u]) >> shift, 0, 255),
+        ],
+        axis=1,
+    ).astype(np.uint8)
+
+
+def _np_linear(values: Any) -> tuple[Any, Any, Any]:
+    data = np.array(_LINEAR)[values[:, :3].astype(np.intp)]
+    return data[:, 0], data[:, 1], data[:, 2]
+
+
+def _np_dot(matrix: tuple, a: Any, b: Any, c: Any) -> list[Any]:
+    return [m0 * a + m1 * b + m2 * c for m0, m1, m2 in matrix]
+
+
+def _np_encode_gamma(value: Any) -> Any:
+    with np.errstate(invalid="ignore"):
+        return _np_clamp_byte(
+            np.where(
+                value <= 0.0031308,
+                value * 12.92,
+                1.055 * value ** (1 / 2.4) - 0.055,
+            )
+        )
+
+
+def _np_cbrt(value: Any) -> Any:
+    return np.copysign(np.abs(value) ** (1 / 3), value)
+
+
+def _np_lab_f(value: Any) -> Any:
+    with np.errstate(invalid="ignore"):
+        return np.where(
+            value > _LAB_EPSILON, value ** (1 / 3), value / _LAB_KAPPA + 4 / 29
+        )
+
+
+def _np_lab_f_inverse(value: Any) -> Any:
+    return np.where(value > 6 / 29, value**3, _LAB_KAPPA * (value - 4 / 29))
+
+
+def _np_xyz(values: Any) -> list[Any]:
+    return _np_dot(_RGB_TO_XYZ, *_np_linear(values))
+
+
+def _np_from_xyz(x: Any, y: Any, z: Any) -> Any:
+    return np.stack(
+        [_np_encode_gamma(c) for c in _np_dot(_XYZ_TO_RGB, x, y, z)], axis=1
+    )
+
+
+def _np_rgb_to_xyz(values: Any) -> Any:
+    return np.stack(_np_xyz(values), axis=1)
+
+
+def _np_xyz_to_rgb(values: Any) -> Any:
+    return _np_from_xyz(*_np_split(values))
+
+
+def _np_rgb_to_lab(values: Any) -> Any:
+    x, y, z = _np_xyz(values)
+    fx, fy, fz = (
+        _np_lab_f(x / _WHITE_D65[0]),
+        _np_lab_f(y / _WHITE_D65[1]),
+        _np_lab_f(z / _WHITE_D65[2]),
+    )
+    return np.stack((116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)), axis=1)
+
+
+def _np_lab_to_rgb(values: Any) -> Any:
+    l, a, b = _np_split(values)
+    fy = (l + 16) / 116
+    return _np_from_xyz(
+        _np_lab_f_inverse(fy + a / 500) * _WHITE_D65[0],
+        _np_lab_f_inverse(fy) * _WHITE_D65[1],
+        _np_lab_f_inverse(fy - b / 200) * _WHITE_D65[2],
+    )
+
+
+def _np_oklab(values: Any) -> list[Any]:
+    lms = _np_dot(_RGB_TO_LMS, *_np_linear(values))
+    return _np_dot(_LMS_TO_OKLAB, *map(_np_cbrt, lms))
+
+
+def _np_from_oklab(l: Any, a: Any, b: Any) -> Any:
+    lms = [x**3 for x in _np_dot(_OKLAB_TO_LMS, l, a, b)]
+    return np.stack([_np_encode_gamma(c) for c in _np_dot(_LMS_TO_RGB, *lms)], axis=1)
+
+
+def _np_rgb_to_oklab(values: Any) -> Any:
+    return np.stack(_np_oklab(values), axis=1)
+
+
+def _np_oklab_to_rgb(values: Any) -> Any:
+    return _np_from_oklab(*_np_split(values))
+
+
+def _np_rgb_to_oklch(values: Any) -> Any:
+    l, a, b = _np_oklab(values)
+    return np.stack(
+        (l, np.sqrt(a * a + b * b), (np.arctan2(b, a) * (180 / pi)) % 360), axis=1
+    )
+
+
+def _np_oklch_to_rgb(values: Any) -> Any:
+    l, c, h = _np_split(values)
+    h = h * (pi / 180)
+    return _np_from_oklab(l, c * np.cos(h), c * np.sin(h))
+
+
+def _convert(
+    values: Any,
+    scalar: Callable[..., tuple],
+    vector: Callable[..., Any],
+    *args: Any,
+) -> Any:
+    if is_ndarray(values):
+        if values.ndim != 2 or values.shape[1] not in (3, 4):
+            raise ValueError("Array must have shape (N, 3) or (N, 4)")
+        result = vector(values, *args)
+        if values.shape[1] == 3:
+            return result
+        # keep the dtype of the converted channels, as the Python path does
+        return np.column_stack((result, values[:, 3:].astype(result.dtype)))
+
+    result = []
+    for item in values:
+        if len(item) not in (3, 4):
+            raise ValueError("Items must have 3 or 4 values")
+        c0, c1, c2, *alpha = item
+        result.append(scalar(c0, c1, c2, *args) + tuple(alpha))
+    return result
+
+
+def rgb_to_hsl(values: Any) -> Any:
+    """Convert ``(r, g, b[, a])`` rows to ``(h, s, l[, a])``"""
+    return _convert(values, _rgb_to_hsl, _np_rgb_to_hsl)
+
+
+def hsl_to_rgb(values: Any) -> Any:
+    """Convert ``(h, s, l[, a])`` rows to ``(r, g, b[, a])``"""
+    return _convert(values, _hsl_to_rgb, _np_hsl_to_rgb)
+
+
+def rgb_to_hsv(values: Any) -> Any:
+    """Convert ``(r, g, b[, a])`` rows to ``(h, s, v[, a])``"""
+    return _convert(values, _rgb_to_hsv, _np_rgb_to_hsv)
+
+
+def hsv_to_rgb(values: Any) -> Any:
+    """Convert ``(h, s, v[, a])`` rows to ``(r, g, b[, a])``"""
+    return _convert(values, _hsv_to_rgb, _np_hsv_to_rgb)
+
+
+def rgb_to_yuv(values: Any, standard: YUVStandard = YUV_BT470) -> Any:
+    """Convert ``(r, g, b[, a])`` rows to ``(y, u, v[, a])``"""
+    return _convert(values, _rgb_to_yuv, _np_rgb_to_yuv, standard)
+
+
+def yuv_to_rgb(values: Any, standard: YUVStandard = YUV_BT470) -> Any:
+    """Convert ``(y, u, v[, a])`` rows to ``(r, g, b[, a])``"""
+    return _convert(values, _yuv_to_rgb, _np_yuv_to_rgb, standard)
+
+
+def rgb_to_ycbcr(values: Any, standard: YUVStandard = YUV_BT601) -> Any:
+    """
+    Convert ``(r, g, b[, a])`` rows to 8-bit ``(y, cb, cr[, a])`` with the
+    fixed point matrices of ``standard``
+    """
+    return _convert(values, _rgb_to_ycbcr, _np_rgb_to_ycbcr, standard)
+
+
+def ycbcr_to_rgb(values: Any, standard: YUVStandard = YUV_BT601) -> Any:
+    """
+    Convert 8-bit ``(y, cb, cr[, a])`` rows to ``(r, g, b[, a])`` with the
+    fixed point matrices of ``standard``
+    """
+    return _convert(values, _ycbcr_to_rgb, _np_ycbcr_to_rgb, standard)
+
+
+def rgb_to_xyz(values: Any) -> Any:
+    """Convert ``(r, g, b[, a])`` rows to CIE ``(x, y, z[, a])`` (D65)"""
+    return _convert(values, _rgb_to_xyz, _np_rgb_to_xyz)
+
+
+def xyz_to_rgb(values: Any) -> Any:
+    """Convert CIE ``(x, y, z[, a])`` rows (D65) to ``(r, g, b[, a])``"""
+    return _convert(values, _xyz_to_rgb, _np_xyz_to_rgb)
+
+
+def rgb_to_lab(values: Any) -> Any:
+    """Convert ``(r, g, b[, a])`` rows to CIE ``(L*, a*, b*[, a])`` (D65)"""
+    return _convert(values, _rgb_to_lab, _np_rgb_to_lab)
+
+
+def lab_to_rgb(values: Any) -> Any:
+    """Convert CIE ``(L*, a*, b*[, a])`` rows (D65) to ``(r, g, b[, a])``"""
+    return _convert(values, _lab_to_rgb, _np_lab_to_rgb)
+
+
+def rgb_to_oklab(values: Any) -> Any:
+    """Convert ``(r, g, b[, a])`` rows to Oklab ``(L, a, b[, a])``"""
+    return _convert(values, _rgb_to_oklab, _np_rgb_to_oklab)
+
+
+def oklab_to_rgb(values: Any) -> Any:
+    """Convert Oklab ``(L, a, b[, a])`` rows to ``(r, g, b[, a])``"""
+    return _convert(values, _oklab_to_rgb, _np_oklab_to_rgb)
+
+
+def rgb_to_oklch(values: Any) -> Any:
+    """Convert ``(r, g, b[, a])`` rows to OkLCh ``(L, C, h[, a])``"""
+    return _convert(values, _rgb_to_oklch, _np_rgb_to_oklch)
+
+
+def oklch_to_rgb(values: Any) -> Any:
+    """Convert OkLCh ``(L, C, h[, a])`` rows to ``(r, g, b[, a])``"""
+    return _convert(values, _oklch_to_rgb, _np_oklch_to_rgb)
@@ -0,0 +1,232 @@
+"""
+Color difference (ΔE) metrics over CIE L*a*b*.
+
+- ``cie76``     : euclidean distance
+- ``cie94``     : CIE94, graphic arts weights
+- ``ciede2000`` : CIEDE2000
+
+:func:`delta_e_matrix` computes every pairwise distance between two
+collections, vectorized with NumPy when it is installed and split into chunks
+of rows to bound the memory used.
+"""
+
+from math import atan2, cos, exp, pi, radians, sin, sqrt
+from typing import Any, Callable, Iterable, Literal
+
+from ._utils import get_channels, np
+from .convert import _rgb_to_lab
+
+__all__ = (
+    "DELTA_E_METHODS",
+    "delta_e",
+    "delta_e_lab",
+    "delta_e_matrix",
+)
+
+METHOD_TYPE = Literal["cie76", "cie94", "ciede2000"]
+LAB_TYPE = tuple[float, float, float]
+
+_POW25_7 = 25**7
+
+
+def _cie76(lab1: LAB_TYPE, lab2: LAB_TYPE) -> float:
+    l1, a1, b1 = lab1
+    l2, a2, b2 = lab2
+    return sqrt((l1 - l2) ** 2 + (a1 - a2) ** 2 + (b1 - b2) ** 2)
+
+
+def _cie94(lab1: LAB_TYPE, lab2: LAB_TYPE) -> float:
+    l1, a1, b1 = lab1
+    l2, a2, b2 = lab2
+    c1, c2 = sqrt(a1 * a1 + b1 * b1), sqrt(a2 * a2 + b2 * b2)
+    dl, dc = l1 - l2, c1 - c2
+    dh2 = max(0.0, (a1 - a2) ** 2 + (b1 - b2) ** 2 - dc * dc)
+    sc, sh = 1 + 0.045 * c1, 1 + 0.015 * c1
+    return sqrt(dl * dl + (dc / sc) ** 2 + dh2 / (sh * sh))
+
+
+def _ciede2000(lab1: LAB_TYPE, lab2: LAB_TYPE) -> float:
+    l1, a1, b1 = lab1
+    l2, a2, b2 = lab2
+
+    c_mean = (sqrt(a1 * a1 + b1 * b1) + sqrt(a2 * a2 + b2 * b2)) / 2
+    g = 0.5 * (1 - sqrt(c_mean**7 / (c_mean**7 + _POW25_7)))
+    a1, a2 = a1 * (1 + g), a2 * (1 + g)
+    c1, c2 = sqrt(a1 * a1 + b1 * b1), sqrt(a2 * a2 + b2 * b2)
+    h1 = atan2(b1, a1) % (2 * pi) if c1 else 0.0
+    h2 = atan2(b2, a2) % (2 * pi) if c2 else 0.0
+
+    dl, dc = l2 - l1, c2 - c1
+    dh = h2 - h1
+    if c1 * c2 == 0:
+        dh = 0.0
+    elif dh > pi:
+        dh -= 2 * pi
+    elif dh < -pi:
+        dh += 2 * pi
+    dh = 2 * sqrt(c1 * c2) * sin(dh / 2)
+
+    l_mean, c_mean = (l1 + l2) / 2, (c1 + c2) / 2
+    h_mean = h1 + h2
+    if c1 * c2 != 0:
+        if abs(h1 - h2) > pi:
+            h_mean += 2 * pi if h_mean < 2 * pi else -2 * pi
+        h_mean /= 2
+
+    t = (
+        1
+        - 0.17 * cos(h_mean - radians(30))
+        + 0.24 * cos(2 * h_mean)
+        + 0.32 * cos(3 * h_mean + radians(6))
+        - 0.20 * cos(4 * h_mean - radians(63))
+    )
+    sl = 1 + 0.015 * (l_mean - 50) ** 2 / sqrt(20 + (l_mean - 50) ** 2)
+    sc = 1 + 0.045 * c_mean
+    sh = 1 + 0.015 * c_mean * t
+    rt = (
+        -2
+        * sqrt(c_mean**7 / (c_mean**7 + _POW25_7))
+        * sin(radians(60) * exp(-(((h_mean - radians(275)) / radians(25)) ** 2)))
+    )
+    return sqrt(
+        (dl / sl) ** 2 + (dc / sc) ** 2 + (dh / sh) ** 2 + rt * (dc / sc) * (dh / sh)
+    )
+
+
+DELTA_E_METHODS: dict[str, Callable[[LAB_TYPE, LAB_TYPE], float]] = {
+    "cie76": _cie76,
+    "cie94": _cie94,
+    "ciede2000": _ciede2000,
+}
+
+
+def _method(method: str) -> Callable[[LAB_TYPE, LAB_TYPE], float]:
+    try:
+        return DELTA_E_METHODS[method]
+    except KeyError:
+        raise ValueError(f"Unknown delta E method: {method!r}") from None
+
+
+def delta_e_lab(
+    lab1: LAB_TYPE, lab2: LAB_TYPE, *, method: METHOD_TYPE = "ciede2000"
+) -> float:
+    """Return the difference between two CIE L*a*b* values"""
+    return _method(method)(lab1, lab2)
+
+
+def delta_e(color1: Any, color2: Any, *, method: METHOD_TYPE = "ciede2000") -> float:
+    """
+    Return the difference between two colors, packed 0xRR_GG_BB_AA ints or
+    (r, g, b[, a]) iterables such as :class:`RGB` / :class:`RGBA`
+    """
+    return _method(method)(
+        _rgb_to_lab(*get_channels(color1)), _rgb_to_lab(*get_channels(color2))
+    )
+
+
+# numpy kernels, broadcasting (N, 1) against (1, M) columns
+def _np_cie76(l1: Any, a1: Any, b1: Any, l2: Any, a2: Any, b2: Any) -> Any:
+    return np.sqrt((l1 - l2) ** 2 + (a1 - a2) ** 2 + (b1 - b2) ** 2)
+
+
+def _np_cie94(l1: Any, a1: Any, b1: Any, l2: Any, a2: Any, b2: Any) -> Any:
+    c1, c2 = np.sqrt(a1 * a1 + b1 * b1), np.sqrt(a2 * a2 + b2 * b2)
+    dl, dc = l1 - l2, c1 - c2
+    dh2 = np.maximum(0.0, (a1 - a2) ** 2 + (b1 - b2) ** 2 - dc * dc)
+    sc, sh = 1 + 0.045 * c1, 1 + 0.015 * c1
+    return np.sqrt(dl * dl + (dc / sc) ** 2 + dh2 / (sh * sh))
+
+
+def _np_ciede2000(l1: Any, a1: Any, b1: Any, l2: Any, a2: Any, b2: Any) -> Any:
+    c_mean = (np.sqrt(a1 * a1 + b1 * b1) + np.sqrt(a2 * a2 + b2 * b2)) / 2
+    g = 0.5 * (1 - np.sqrt(c_mean**7 / (c_mean**7 + _POW25_7)))
+    a1, a2 = a1 * (1 + g), a2 * (1 + g)
+    b1, b2 = np.broadcast_arrays(b1, b2)
+    c1, c2 = np.sqrt(a1 * a1 + b1 * b1), np.sqrt(a2 * a2 + b2 * b2)
+    h1 = np.where(c1 != 0, np.arctan2(b1, a1) % (2 * pi), 0.0)
+    h2 = np.where(c2 != 0, np.arctan2(b2, a2) % (2 * pi), 0.0)
+
+    dl, dc = l2 - l1, c2 - c1
+    dh = h2 - h1
+    dh = np.where(dh > pi, dh - 2 * pi, np.where(dh < -pi, dh + 2 * pi, dh))
+    dh = np.where(c1 * c2 == 0, 0.0, dh)
+    dh = 2 * np.sqrt(c1 * c2) * np.sin(dh / 2)
+
+    l_mean, c_mean = (l1 + l2) / 2, (c1 + c2) / 2
+    h_sum = h1 + h2
+    h_mean = np.where(
+        np.abs(h1 - h2) > pi,
+        (h_sum + np.where(h_sum < 2 * pi, 2 * pi, -2 * pi)) / 2,
+        h_sum / 2,
+    )
+    h_mean = np.where(c1 * c2 == 0, h_sum, h_mean)
+
+    t = (
+        1
+        - 0.17 * np.cos(h_mean - radians(30))
+        + 0.24 * np.cos(2 * h_mean)
+        + 0.32 * np.cos(3 * h_mean + radians(6))
+        - 0.20 * np.cos(4 * h_mean - radians(63))
+    )
+    sl = 1 + 0.015 * (l_mean - 50) ** 2 / np.sqrt(20 + (l_mean - 50) ** 2)
+    sc = 1 + 0.045 * c_mean
+    sh = 1 + 0.015 * c_mean * t
+    rt = (
+        -2
+        * np.sqrt(c_mean**7 / (c_mean**7 + _POW25_7))
+        * np.sin(radians(60) * np.exp(-(((h_mean - radians(275)) / radians(25)) ** 2)))
+    )
+    return np.sqrt(
+        (dl / sl) ** 2 + (dc / sc) ** 2 + (dh / sh) ** 2 + rt * (dc / sc) * (dh / sh)
+    )
+
+
+_NP_DELTA_E_METHODS = {
+    "cie76": _np_cie76,
+    "cie94": _np_cie94,
+    "ciede2000": _np_ciede2000,
+}
+
+
+def _labs(colors: Iterable[Any]) -> list[LAB_TYPE]:
+    memo: dict[tuple[int, int, int], LAB_TYPE] = {}
+    result = []
+    for color in colors:
+        channels = get_channels(color)
+        lab = memo.get(channels)
+        if lab is None:
+            lab = memo[channels] = _rgb_to_lab(*channels)
+        result.append(lab)
+    return result
+
+
+def delta_e_matrix(
+    colors1: Iterable[Any],
+    colors2: Iterable[Any],
+    *,
+    method: METHOD_TYPE = "ciede2000",
+    chunk_size: int = 1024,
+) -> Any:
+    """
+    Return the (len(colors1), len(colors2)) matrix of pairwise differences
+
+    Colors are packed 0xRR_GG_BB_AA ints or (r, g, b[, a]) iterables. The
+    result is a NumPy array when NumPy is installed, nested lists otherwise;
+    at most ``chunk_size`` rows are computed at once.
+    """
+    scalar = _method(method)
+    labs1, labs2 = _labs(colors1), _labs(colors2)
+
+    if np is None:
+        return [[scalar(lab1, lab2) for lab2 in labs2] for lab1 in labs1]
+
+    vector = _NP_DELTA_E_METHODS[method]
+    array2 = np.array(labs2, dtype=np.float64).reshape(-1, 3)
+    l2, a2, b2 = (array2[None, :, i] for i in range(3))
+    result = np.empty((len(labs1), len(labs2)), dtype=np.float64)
+
+    for start in range(0, len(labs1), chunk_size):
+        chunk = np.array(labs1[start : start + chunk_size], dtype=np.float64)
+        l1, a1, b1 = (chunk[:, i, None] for i in range(3))
+        result[start : start + chunk_size] = vector(l1, a1, b1, l2, a2, b2)
+    return result
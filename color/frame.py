@@ -0,0 +1,195 @@
+"""
+Decoding of raw 8-bit Y'CbCr frames into RGB888 / RGBA8888 buffers.
+
+Supported layouts:
+
+- ``i420`` : Y plane, then U and V planes subsampled 2x2 (YUV 4:2:0 planar)
+- ``nv12`` : Y plane, then one interleaved UV plane subsampled 2x2
+- ``yuyv`` : packed Y0 U Y1 V for every two pixels (YUV 4:2:2, YUY2)
+
+Chroma is upsampled by repeating samples. Frames are converted one row at a
+time with the fixed point tables of :class:`YUVStandard`, so only the output
+buffer grows with the frame size.
+"""
+
+from typing import Any, Iterator, Literal, Optional
+
+from ._utils import YUV_BT601, YUVStandard
+
+__all__ = (
+    "FRAME_FORMATS",
+    "frame_size",
+    "iter_frame_rows",
+    "decode_frame",
+)
+
+FRAME_FORMAT_TYPE = Literal["i420", "nv12", "yuyv"]
+OUTPUT_FORMAT_TYPE = Literal["rgb888", "rgba8888"]
+
+FRAME_FORMATS = ("i420", "nv12", "yuyv")
+
+# bytes per output pixel
+_OUTPUT_SIZES = {"rgb888": 3, "rgba8888": 4}
+
+# (value >> FIXED_SHIFT) + _CLIP_OFFSET -> 0~255
+_CLIP_OFFSET = 512
+_CLIP = bytes(max(0, min(255, x - _CLIP_OFFSET)) for x in range(3 * _CLIP_OFFSET))
+
+
+def frame_size(width: int, height: int, fmt: FRAME_FORMAT_TYPE) -> int:
+    """Return the number of bytes of a ``fmt`` frame"""
+    chroma_width, chroma_height = (width + 1) // 2, (height + 1) // 2
+    if fmt in ("i420", "nv12"):
+        return width * height + 2 * chroma_width * chroma_height
+    if fmt == "yuyv":
+        return 4 * chroma_width * height
+    raise ValueError(f"Unknown frame format: {fmt!r}")
+
+
+def _upsample(samples: Any, width: int) -> bytes:
+    """Repeat every chroma sample twice, cropped to ``width``"""
+    result = bytearray(2 * len(samples))
+    result[0::2] = samples
+    result[1::2] = samples
+    return bytes(result[:width])
+
+
+class _RowDecoder:
+    def __init__(
+        self,
+        buf: Any,
+        width: int,
+        height: int,
+        fmt: FRAME_FORMAT_TYPE,
+        output: OUTPUT_FORMAT_TYPE,
+        standard: YUVStandard,
+    ) -> None:
+        if width <= 0 or height <= 0:
+            raise ValueError("Frame size must be positive")
+        if output not in _OUTPUT_SIZES:
+            raise ValueError(f"Unknown output format: {output!r}")
+
+        view = memoryview(buf)
+        if view.ndim != 1 or view.format != "B":
+            view = view.cast("B")
+        if len(view) < frame_size(width, height, fmt):
+            raise ValueError(
+                f"Buffer too small for a {width}x{height} {fmt!r} frame "
+                f"({len(view)} < {frame_size(width, height, fmt)} bytes)"
+            )
+
+        self.view = view
+        self.width = width
+        self.height = height
+        self.fmt = fmt
+        self.output = output
+        self.row_size = width * _OUTPUT_SIZES[output]
+
+        shift = standard.FIXED_SHIFT
+        ys, self.rv, self.gu, self.gv, self.bu = standard.decode_tables()
+        # fold the clip table offset into the luma table
+        self.ys = tuple(y + (_CLIP_OFFSET << shift) for y in ys)
+        self.shift = shift
+
+    def _planes(self, row: int) -> tuple[Any, Any, Any]:
+        """Return the Y, U and V samples of ``row``, one per pixel"""
+        view, width = self.view, self.width
+        chroma_width, chroma_row = (width + 1) // 2, row // 2
+
+        if self.fmt == "yuyv":
+            start = row * 4 * chroma_width
+            packed = view[start : start + 4 * chroma_width]
+            return (
+                packed[0::2][:width],
+                _upsample(packed[1::4], width),
+                _upsample(packed[3::4], width),
+            )
+
+        luma = view[row * width : (row + 1) * width]
+        start = width * self.height
+        if self.fmt == "i420":
+            plane = chroma_width * ((self.height + 1) // 2)
+            start += chroma_row * chroma_width
+            u = view[start : start + chroma_width]
+            v = view[start + plane : start + plane + chroma_width]
+        else:
+            start += chroma_row * 2 * chroma_width
+            uv = view[start : start + 2 * chroma_width]
+            u, v = uv[0::2], uv[1::2]
+        return luma, _upsample(u, width), _upsample(v, width)
+
+    def decode(self, row: int, out: Any) -> None:
+        """Write the RGB(A) pixels of ``row`` into ``out``"""
+        y, u, v = self._planes(row)
+        ys, rv, gu, gv, bu = self.ys, self.rv, self.gu, self.gv, self.bu
+        shift, clip = self.shift, _CLIP
+
+        luma = [ys[x] for x in y]
+        step = _OUTPUT_SIZES[self.output]
+        out[0::step] = bytes([clip[(a + rv[b]) >> shift] for a, b in zip(luma, v)])
+        out[1::step] = bytes(
+            [clip[(a + gu[b] + gv[c]) >> shift] for a, b, c in zip(luma, u, v)]
+        )
+        out[2::step] = bytes([clip[(a + bu[b]) >> shift] for a, b in zip(luma, u)])
+        if step == 4:
+            out[3::4] = b"\xff" * self.width
+
+
+def iter_frame_rows(
+    buf: Any,
+    width: int,
+    height: int,
+    fmt: FRAME_FORMAT_TYPE = "i420",
+    *,
+    output: OUTPUT_FORMAT_TYPE = "rgb888",
+    standard: YUVStandard = YUV_BT601,
+) -> Iterator[bytes]:
+    """Yield the ``output`` pixels of every row of a ``fmt`` frame"""
+    decoder = _RowDecoder(buf, width, height, fmt, output, standard)
+    row = bytearray(decoder.row_size)
+    for y in range(height):
+        decoder.decode(y, row)
+        yield bytes(row)
+
+
+def decode_frame(
+    buf: Any,
+    width: int,
+    height: int,
+    fmt: FRAME_FORMAT_TYPE = "i420",
+    *,
+    output: OUTPUT_FORMAT_TYPE = "rgb888",
+    standard: YUVStandard = YUV_BT601,
+    workers: Optional[int] = None,
+) -> bytearray:
+    """
+    Decode a ``fmt`` frame into an ``output`` buffer
+
+    ``workers`` splits the rows into bands decoded by a thread pool.
+    """
+    decoder = _RowDecoder(buf, width, height, fmt, output, standard)
+    row_size = decoder.row_size
+    result = bytearray(row_size * height)
+
+    def decode_rows(rows: range) -> None:
+        with memoryview(result) as out:
+            for y in rows:
+                decoder.decode(y, out[y * row_size : (y + 1) * row_size])
+
+    if not workers or workers <= 1 or height < 2:
+        decode_rows(range(height))
+        return result
+
+    # thread pools take a while to import, only pay for it when used
+    from concurrent.futures import ThreadPoolExecutor
+
+    band = -(-height // workers)
+    with ThreadPoolExecutor(workers) as executor:
+        # consume the results to re-raise errors from the workers
+        list(
+            executor.map(
+                decode_rows,
+                (range(y, min(y + band, height)) for y in range(0, height, band)),
+            )
+        )
+    return result
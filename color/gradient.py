@@ -0,0 +1,227 @@
+"""
+Color interpolation and gradient ramps.
+
+Colors are interpolated in one of :data:`GRADIENT_SPACES`; hues take the
+shortest way around the color wheel, and the hue of a gray follows the other
+color. Alpha is always interpolated linearly.
+
+:func:`gradient` samples a list of stops into a ramp of packed
+0xRR_GG_BB_AA values, cached by stop configuration, and :func:`map_gradient`
+maps scalar values onto a ramp by index instead of interpolating per value.
+"""
+
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Literal, NamedTuple, Optional, Union
+
+from ._utils import UINT32_TYPECODE, is_ndarray, np
+from .array import _pack
+from .convert import (
+    _hsl_to_rgb,
+    _hsv_to_rgb,
+    _lab_to_rgb,
+    _oklab_to_rgb,
+    _oklch_to_rgb,
+    _rgb_to_hsl,
+    _rgb_to_hsv,
+    _rgb_to_lab,
+    _rgb_to_oklab,
+    _rgb_to_oklch,
+)
+from .parse import parse_color
+from .types import RGB, RGBA
+
+__all__ = (
+    "GRADIENT_SPACES",
+    "mix",
+    "gradient",
+    "map_gradient",
+)
+
+SPACE_TYPE = Literal["rgb", "hsl", "hsv", "lab", "oklab", "oklch"]
+COLOR_TYPE = Union[int, str, RGB, RGBA]
+STOP_TYPE = Union[COLOR_TYPE, tuple[float, COLOR_TYPE]]
+
+COORDS_TYPE = tuple[float, float, float]
+
+
+class _Space(NamedTuple):
+    from_rgb: Callable[[int, int, int], COORDS_TYPE]
+    to_rgb: Callable[[float, float, float], tuple[int, int, int]]
+    # index of the hue (degrees) and of the chroma / saturation coordinates
+    hue: Optional[int] = None
+    chroma: int = 0
+
+
+# chroma under which a hue is meaningless
+_ACHROMATIC = 1e-4
+
+GRADIENT_SPACES: dict[str, _Space] = {
+    "rgb": _Space(
+        lambda r, g, b: (r, g, b),
+        lambda r, g, b: (round(r), round(g), round(b)),
+    ),
+    "hsl": _Space(_rgb_to_hsl, _hsl_to_rgb, 0, 1),
+    "hsv": _Space(_rgb_to_hsv, _hsv_to_rgb, 0, 1),
+    "lab": _Space(_rgb_to_lab, _lab_to_rgb),
+    "oklab": _Space(_rgb_to_oklab, _oklab_to_rgb),
+    "oklch": _Space(_rgb_to_oklch, _oklch_to_rgb, 2, 1),
+}
+
+
+def _space(space: str) -> _Space:
+    try:
+        return GRADIENT_SPACES[space]
+    except KeyError:
+        raise ValueError(f"Unknown gradient space: {space!r}") from None
+
+
+def _value(color: COLOR_TYPE) -> int:
+    return parse_color(color) if isinstance(color, str) else _pack(color)
+
+
+def _coords(value: int, space: _Space) -> tuple[COORDS_TYPE, int]:
+    """Return the coordinates of a packed value in ``space`` and its alpha"""
+    rgb = (value >> 24, (value >> 16) & 0xFF, (value >> 8) & 0xFF)
+    return space.from_rgb(*rgb), value & 0xFF
+
+
+def _interpolate(
+    start: tuple[COORDS_TYPE, int],
+    end: tuple[COORDS_TYPE, int],
+    t: float,
+    space: _Space,
+) -> int:
+    (c1, a1), (c2, a2) = start, end
+    coords = [x + (y - x) * t for x, y in zip(c1, c2)]
+
+    if space.hue is not None:
+        h1, h2 = c1[space.hue], c2[space.hue]
+        gray1, gray2 = c1[space.chroma] < _ACHROMATIC, c2[space.chroma] < _ACHROMATIC
+        if gray1 and not gray2:
+            h1 = h2
+        elif gray2 and not gray1:
+            h2 = h1
+        coords[space.hue] = (h1 + ((h2 - h1 + 180) % 360 - 180) * t) % 360
+
+    r, g, b = space.to_rgb(*coords)
+    return (r << 24) | (g << 16) | (b << 8) | round(a1 + (a2 - a1) * t)
+
+
+def mix(
+    color1: COLOR_TYPE, color2: COLOR_TYPE, t: float = 0.5, *, space: SPACE_TYPE = "rgb"
+) -> int:
+    """
+    Return the packed color ``t`` (0 ~ 1) of the way from ``color1`` to
+    ``color2``
+
+    Colors are packed 0xRR_GG_BB_AA ints, :class:`RGB` / :class:`RGBA` values
+    or CSS color strings.
+    """
+    if not 0 <= t <= 1:
+        raise ValueError("t must be between 0 and 1")
+
+    info = _space(space)
+    return _interpolate(
+        _coords(_value(color1), info), _coords(_value(color2), info), t, info
+    )
+
+
+def _stops(stops: Iterable[STOP_TYPE]) -> tuple[tuple[float, int], ...]:
+    """Return the (position, packed value) of every stop"""
+    stops = list(stops)
+    if not stops:
+        raise ValueError("A gradient needs at least one stop")
+
+    result = []
+    for i, stop in enumerate(stops):
+        if isinstance(stop, tuple) and len(stop) == 2:
+            position, color = stop
+        else:
+            position, color = (i / (len(stops) - 1) if len(stops) > 1 else 0), stop
+        result.append((float(position), _value(color)))
+
+    positions = [position for position, _ in result]
+    if positions != sorted(positions) or not 0 <= positions[0] <= positions[-1] <= 1:
+        raise ValueError("Stop positions must be sorted between 0 and 1")
+    return tuple(result)
+
+
+@lru_cache(maxsize=128)
+def _ramp(stops: tuple[tuple[float, int], ...], n: int, space: str) -> array:
+    info = _space(space)
+    positions = [position for position, _ in stops]
+    coords = [_coords(value, info) for _, value in stops]
+
+    ramp = array(UINT32_TYPECODE)
+    for i in range(n):
+        t = i / (n - 1) if n > 1 else 0.0
+        end = bisect_right(positions, t)
+        if end == 0:
+            ramp.append(stops[0][1])
+        elif end == len(stops):
+            ramp.append(stops[-1][1])
+        else:
+            start = end - 1
+            local = (t - positions[start]) / (positions[end] - positions[start])
+            ramp.append(_interpolate(coords[start], coords[end], local, info))
+    return ramp
+
+
+def gradient(
+    stops: Iterable[STOP_TYPE], n: int = 256, *, space: SPACE_TYPE = "rgb"
+) -> array:
+    """
+    Return ``n`` packed 0xRR_GG_BB_AA colors sampled evenly along a gradient
+
+    ``stops`` are colors (see :func:`mix`) spread evenly, or ``(position,
+    color)`` pairs with sorted positions between 0 and 1. Ramps are cached by
+    stop configuration, every call returns a copy.
+    """
+    if n < 1:
+        raise ValueError("n must be positive")
+    return array(UINT32_TYPECODE, _ramp(_stops(stops), n, space))
+
+
+def map_gradient(
+    values: Any,
+    stops: Iterable[STOP_TYPE],
+    *,
+    n: int = 256,
+    space: SPACE_TYPE = "rgb",
+    low: float = 0.0,
+    high: float = 1.0,
+) -> Any:
+    """
+    Map scalar ``values`` between ``low`` and ``high`` onto a ``n`` colors
+    ramp of :func:`gradient`, clamping values outside the range (infinities
+    included); NaN values raise ``ValueError``
+
+    Return an ``array`` of packed colors, or a ``uint32`` ndarray when
+    ``values`` is a NumPy array.
+    """
+    if n < 1:
+        raise ValueError("n must be positive")
+    if high <= low:
+        raise ValueError("high must be greater than low")
+
+    ramp = _ramp(_stops(stops), n, space)
+    scale = n / (high - low)
+
+    last = n - 1
+    if is_ndarray(values):
+        # clamp before the cast, out of range floats have no intp value
+        positions = (values - low) * scale
+        if np.isnan(positions).any():
+            raise ValueError("Values must not be NaN")
+        indexes = np.clip(positions, 0, last).astype(np.intp)
+        return np.frombuffer(ramp, dtype=np.uint32)[indexes]
+
+    result = array(UINT32_TYPECODE)
+    for value in values:
+        position = (value - low) * scale
+        if position != position:
+            raise ValueError("Values must not be NaN")
+        result.append(ramp[int(max(0, min(last, position)))])
+    return result
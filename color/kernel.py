@@ -0,0 +1,375 @@
+"""
+Fused conversion kernels generated for one source format and target space.
+
+:func:`compile_kernel` writes the Python source of a function that reads the
+pixels of a raw buffer, converts them to a color space, applies linear
+adjustments and writes the result, all in a single loop with the conversion
+formulas and constants inlined, both ways. No :class:`RGB` / :class:`HSV`
+objects, tuples or intermediate arrays are created and no conversion helper is
+called per pixel. Kernels are compiled once per signature and cached.
+
+The inlined formulas perform the same operations in the same order as the
+scalar functions of :mod:`color.convert`, so kernels return identical values.
+"""
+
+import sys
+from array import array
+from functools import lru_cache
+from math import atan2, copysign, cos, isfinite, pi, sin, sqrt
+from typing import Any, Callable, Literal, Mapping, Optional, Union
+
+from .buffer import (
+    _WORD_LAYOUTS,
+    BUFFER_FORMATS,
+    BYTEORDER_TYPE,
+    FORMAT_TYPE,
+    _check_byteorder,
+    _decode_lut,
+    _encode_lut,
+    _view,
+    _words,
+)
+from .convert import (
+    _LAB_EPSILON,
+    _LAB_KAPPA,
+    _LINEAR,
+    _LMS_TO_OKLAB,
+    _LMS_TO_RGB,
+    _OKLAB_TO_LMS,
+    _RGB_TO_LMS,
+    _RGB_TO_XYZ,
+    _SECTORS,
+    _WHITE_D65,
+    _XYZ_TO_RGB,
+)
+
+__all__ = (
+    "KERNEL_SPACES",
+    "compile_kernel",
+)
+
+KERNEL_SPACE_TYPE = Literal["rgb", "hsl", "hsv", "xyz", "lab", "oklab", "oklch"]
+# channel -> (scale, offset)
+ADJUST_TYPE = Mapping[str, tuple[float, float]]
+
+# space -> names of its coordinates (alpha is always "alpha")
+KERNEL_SPACES: dict[str, tuple[str, str, str]] = {
+    "rgb": ("r", "g", "b"),
+    "hsl": ("h", "s", "l"),
+    "hsv": ("h", "s", "v"),
+    "xyz": ("x", "y", "z"),
+    "lab": ("l", "a", "b"),
+    "oklab": ("l", "a", "b"),
+    "oklch": ("l", "c", "h"),
+}
+
+# (r, g, b) bytes -> (c0, c1, c2) statements, mirroring color.convert
+_HUE = """\
+if d == 0:
+    c0 = c1 = 0.0
+else:
+    if hi == x:
+        c0 = ((y - z) / d) % 6 * 60
+    elif hi == y:
+        c0 = ((z - x) / d + 2) * 60
+    else:
+        c0 = ((x - y) / d + 4) * 60
+"""
+_MINMAX = """\
+x = r / 255
+y = g / 255
+z = b / 255
+hi = x if x > y else y
+hi = hi if hi > z else z
+lo = x if x < y else y
+lo = lo if lo < z else z
+d = hi - lo
+"""
+
+
+def _dot(matrix: tuple, a: str, b: str, c: str, names: tuple[str, ...]) -> str:
+    return "".join(
+        f"{name} = {m0!r} * {a} + {m1!r} * {b} + {m2!r} * {c}\n"
+        for name, (m0, m1, m2) in zip(names, matrix)
+    )
+
+
+def _linear() -> str:
+    return "lr = LINEAR[r]\nlg = LINEAR[g]\nlb = LINEAR[b]\n"
+
+
+def _from_rgb(space: str) -> str:
+    if space == "rgb":
+        return "c0 = r\nc1 = g\nc2 = b\n"
+    if space == "hsv":
+        return _MINMAX + _HUE + "    c1 = d / hi\nc2 = hi\n"
+    if space == "hsl":
+        return (
+            _MINMAX
+            + "c2 = (hi + lo) / 2\n"
+            + _HUE
+            + "    c1 = d / (1 - abs(2 * c2 - 1))\n"
+        )
+
+    xyz = _linear() + _dot(_RGB_TO_XYZ, "lr", "lg", "lb", ("c0", "c1", "c2"))
+    if space == "xyz":
+        return xyz
+    if space == "lab":
+        lines = [xyz]
+        for i, (name, white) in enumerate(zip(("fx", "fy", "fz"), _WHITE_D65)):
+            lines.append(
+                f"t = c{i} / {white!r}\n"
+                f"{name} = t ** {1 / 3!r} if t > {_LAB_EPSILON!r} "
+                f"else t / {_LAB_KAPPA!r} + {4 / 29!r}\n"
+            )
+        lines.append(
+            "c0 = 116 * fy - 16\nc1 = 500 * (fx - fy)\nc2 = 200 * (fy - fz)\n"
+        )
+        return "".join(lines)
+
+    lines = [_linear(), _dot(_RGB_TO_LMS, "lr", "lg", "lb", ("l", "m", "s"))]
+    lines += [f"{x} = copysign(abs({x}) ** {1 / 3!r}, {x})\n" for x in "lms"]
+    lines.append(_dot(_LMS_TO_OKLAB, "l", "m", "s", ("c0", "c1", "c2")))
+    if space == "oklch":
+        lines.append(
+            "c1, c2 = sqrt(c1 * c1 + c2 * c2), "
+            f"(atan2(c2, c1) * {180 / pi!r}) % 360\n"
+        )
+    return "".join(lines)
+
+
+def _byte(name: str, value: str) -> str:
+    """Return statements setting ``name`` to the clamped byte of ``value``"""
+    return (
+        f"{name} = round(({value}) * 255)\n"
+        f"{name} = 0 if {name} < 0 else 0xFF if {name} > 0xFF else {name}\n"
+    )
+
+
+def _encode_gamma(names: tuple[str, str, str]) -> str:
+    return "".join(
+        _byte(
+            x,
+            f"{t} * 12.92 if {t} <= 0.0031308 else 1.055 * {t} ** {1 / 2.4!r} - 0.055",
+        )
+        for x, t in zip("rgb", names)
+    )
+
+
+def _to_rgb(space: str) -> str:
+    """Return the statements turning c0, c1 and c2 back into r, g and b bytes"""
+    if space in ("hsl", "hsv"):
+        if space == "hsl":
+            lines = ["ch = (1 - abs(2 * c2 - 1)) * c1\n", "m = c2 - ch / 2\n"]
+        else:
+            lines = ["ch = c2 * c1\n", "m = c2 - ch\n"]
+        lines.append(
+            "hp = (c0 % 360) / 60\n"
+            "xh = ch * (1 - abs(hp % 2 - 1))\n"
+            "k = int(hp)\n"
+        )
+        values = ("ch", "xh", "0.0")
+        for sector, indexes in enumerate(_SECTORS):
+            if sector == 5:
+                lines.append("else:\n")
+            else:
+                lines.append(f"{'elif' if sector else 'if'} k == {sector}:\n")
+            lines += [f"    u{x} = {values[i]}\n" for x, i in zip("rgb", indexes)]
+        lines.append("".join(_byte(x, f"u{x} + m") for x in "rgb"))
+        return "".join(lines)
+
+    if space == "xyz":
+        lines = [_dot(_XYZ_TO_RGB, "c0", "c1", "c2", ("lr", "lg", "lb"))]
+        lines.append(_encode_gamma(("lr", "lg", "lb")))
+        return "".join(lines)
+    if space == "lab":
+        lines = ["fy = (c0 + 16) / 116\n"]
+        for name, value, white in zip(
+            ("tx", "ty", "tz"), ("fy + c1 / 500", "fy", "fy - c2 / 200"), _WHITE_D65
+        ):
+            lines.append(
+                f"t = {value}\n"
+                f"{name} = (t**3 if t > {6 / 29!r} "
+                f"else {_LAB_KAPPA!r} * (t - {4 / 29!r})) * {white!r}\n"
+            )
+        lines.append(_dot(_XYZ_TO_RGB, "tx", "ty", "tz", ("lr", "lg", "lb")))
+        lines.append(_encode_gamma(("lr", "lg", "lb")))
+        return "".join(lines)
+
+    lines = []
+    if space == "oklch":
+        lines.append(f"t = c2 * {pi / 180!r}\nc2 = c1 * sin(t)\nc1 = c1 * cos(t)\n")
+    lines.append(_dot(_OKLAB_TO_LMS, "c0", "c1", "c2", ("l", "m", "s")))
+    lines += [f"{x} = {x}**3\n" for x in "lms"]
+    lines.append(_dot(_LMS_TO_RGB, "l", "m", "s", ("lr", "lg", "lb")))
+    lines.append(_encode_gamma(("lr", "lg", "lb")))
+    return "".join(lines)
+
+
+def _read(src_fmt: str) -> tuple[str, str]:
+    """Return the setup and the loop header reading ``r``, ``g``, ``b``, ``a``"""
+    if src_fmt in _WORD_LAYOUTS:
+        return (
+            "words = _words(view, byteorder)\n",
+            "for v in words:\n"
+            "    v = lut[v]\n"
+            "    r = v >> 24\n"
+            "    g = (v >> 16) & 0xFF\n"
+            "    b = (v >> 8) & 0xFF\n"
+            "    a = 0xFF\n",
+        )
+    if src_fmt == "rgba8888":
+        planes = "view[0::4], view[1::4], view[2::4], view[3::4]"
+        return "", f"for r, g, b, a in zip({planes}):\n"
+
+    r, b = ("0", "2") if src_fmt == "rgb888" else ("2", "0")
+    planes = f"view[{r}::3], view[1::3], view[{b}::3]"
+    return "", f"for r, g, b in zip({planes}):\n    a = 0xFF\n"
+
+
+def _write(dst_fmt: Optional[str]) -> tuple[str, str, str]:
+    """Return the setup, the loop body and the end of the output"""
+    if dst_fmt is None:
+        return (
+            "out = array('d', bytes(32 * count))\n",
+            "out[i] = c0\nout[i + 1] = c1\nout[i + 2] = c2\nout[i + 3] = a\ni += 4\n",
+            "return out\n",
+        )
+    if dst_fmt in _WORD_LAYOUTS:
+        return (
+            "out = array('H', bytes(2 * count))\n",
+            "out[i] = rt[r] | gt[g] | bt[b]\ni += 1\n",
+            "if swap:\n    out.byteswap()\nreturn out.tobytes()\n",
+        )
+
+    size = BUFFER_FORMATS[dst_fmt]
+    r, b = ("b", "r") if dst_fmt == "bgr888" else ("r", "b")
+    body = f"out[i] = {r}\nout[i + 1] = g\nout[i + 2] = {b}\n"
+    if size == 4:
+        body += "out[i + 3] = a\n"
+    return (
+        f"out = bytearray({size} * count)\n",
+        body + f"i += {size}\n",
+        "return out\n",
+    )
+
+
+def _indent(code: str, level: int = 1) -> str:
+    return "".join("    " * level + line + "\n" for line in code.splitlines())
+
+
+def _source(
+    src_fmt: str,
+    space: str,
+    dst_fmt: Optional[str],
+    adjust: tuple[tuple[str, float, float], ...],
+) -> str:
+    setup, header = _read(src_fmt)
+    out_setup, out_body, out_end = _write(dst_fmt)
+
+    # a plain format conversion needs no color space at all
+    convert = dst_fmt is None or space != "rgb" or adjust
+    body = _from_rgb(space) if convert else ""
+    names = KERNEL_SPACES[space] + ("alpha",)
+    for channel, scale, offset in adjust:
+        target = "a" if channel == "alpha" else f"c{names.index(channel)}"
+        value = f"{target} * {scale!r} + {offset!r}"
+        if channel == "h":
+            value = f"({value}) % 360"
+        body += f"{target} = {value}\n"
+
+    if dst_fmt is not None and body:
+        # back to 8-bit r, g, b and a
+        if space == "rgb":
+            body += "".join(
+                f"{x} = round(c{i})\n"
+                f"{x} = 0 if {x} < 0 else 0xFF if {x} > 0xFF else {x}\n"
+                for i, x in enumerate("rgb")
+            )
+        else:
+            body += _to_rgb(space)
+        if any(channel == "alpha" for channel, _, _ in adjust):
+            body += "a = round(a)\na = 0 if a < 0 else 0xFF if a > 0xFF else a\n"
+
+    return (
+        "def kernel(buf):\n"
+        + _indent(f"view = _view(buf, {src_fmt!r})\n")
+        + _indent(f"count = len(view) // {BUFFER_FORMATS[src_fmt]}\n")
+        + _indent(setup + out_setup + "i = 0\n" + header)
+        + _indent(body + out_body, 2)
+        + _indent(out_end)
+    )
+
+
+@lru_cache(maxsize=64)
+def _compile(
+    src_fmt: str,
+    space: str,
+    dst_fmt: Optional[str],
+    byteorder: str,
+    adjust: tuple[tuple[str, float, float], ...],
+) -> Callable[[Any], Union[array, bytearray, bytes]]:
+    namespace = {
+        "array": array,
+        "atan2": atan2,
+        "copysign": copysign,
+        "cos": cos,
+        "sin": sin,
+        "sqrt": sqrt,
+        "LINEAR": _LINEAR,
+        "_view": _view,
+        "_words": _words,
+        "byteorder": byteorder,
+        # byte swap of 16-bit output words
+        "swap": byteorder != sys.byteorder,
+    }
+    if src_fmt in _WORD_LAYOUTS:
+        namespace["lut"] = _decode_lut(src_fmt)
+    if dst_fmt in _WORD_LAYOUTS:
+        ((namespace["rt"], namespace["gt"], namespace["bt"]),) = _encode_lut(
+            dst_fmt, False
+        )
+
+    source = _source(src_fmt, space, dst_fmt, adjust)
+    exec(compile(source, f"<kernel {src_fmt}-{space}-{dst_fmt}>", "exec"), namespace)
+    kernel = namespace["kernel"]
+    kernel.source = source
+    return kernel
+
+
+def compile_kernel(
+    src_fmt: FORMAT_TYPE,
+    space: KERNEL_SPACE_TYPE = "rgb",
+    *,
+    dst_fmt: Optional[FORMAT_TYPE] = None,
+    byteorder: BYTEORDER_TYPE = "little",
+    adjust: Optional[ADJUST_TYPE] = None,
+) -> Callable[[Any], Union[array, bytearray, bytes]]:
+    """
+    Return a function converting a raw ``src_fmt`` buffer to ``space``
+
+    ``adjust`` maps channels of the space (named in :data:`KERNEL_SPACES`, or
+    ``alpha``) to ``(scale, offset)`` pairs applied as ``value * scale +
+    offset``; hues wrap around 360. Without ``dst_fmt`` the function returns
+    an ``array("d")`` of ``c0, c1, c2, alpha`` for every pixel, otherwise it
+    converts the adjusted pixels back to RGB and returns a ``dst_fmt`` buffer.
+    ``byteorder`` applies to the 16-bit layouts on both sides.
+    """
+    _check_byteorder(byteorder)
+    for fmt in (src_fmt, dst_fmt):
+        if fmt is not None and fmt not in BUFFER_FORMATS:
+            raise ValueError(f"Unknown buffer format: {fmt!r}")
+    if space not in KERNEL_SPACES:
+        raise ValueError(f"Unknown color space: {space!r}")
+
+    names = KERNEL_SPACES[space] + ("alpha",)
+    adjustments = []
+    for channel, (scale, offset) in sorted((adjust or {}).items()):
+        if channel not in names:
+            raise ValueError(f"Unknown {space!r} channel: {channel!r}")
+        scale, offset = float(scale), float(offset)
+        if not (isfinite(scale) and isfinite(offset)):
+            raise ValueError(f"Adjustments of {channel!r} must be finite")
+        adjustments.append((channel, scale, offset))
+
+    return _compile(src_fmt, space, dst_fmt, byteorder, tuple(adjustments))
@@ -0,0 +1,217 @@
+"""
+Named color lookups over :data:`color.vars.NAMES_COLORS`.
+
+Name <-> value lookups go through frozen indexes built on first access; aliased
+colors (gray / grey, aqua / cyan, ...) map back to the first name listed.
+Nearest name searches go through a k-d tree built once per color space on
+first use, so every lookup only visits a handful of the named colors.
+"""
+
+from functools import lru_cache
+from math import sqrt
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Optional
+
+from . import vars as _vars
+from ._utils import MISSING, get_channels
+from .convert import _rgb_to_lab, _rgb_to_oklab
+from .types import RGB
+
+__all__ = (
+    "NAME_TO_VALUE",
+    "VALUE_TO_NAME",
+    "VALUE_TO_NAMES",
+    "lookup_name",
+    "name_of",
+    "nearest_name",
+    "nearest_names",
+)
+
+# name -> 0xRR_GG_BB
+NAME_TO_VALUE: MappingProxyType[str, int]
+# 0xRR_GG_BB -> every name of the color, canonical name first
+VALUE_TO_NAMES: MappingProxyType[int, tuple[str, ...]]
+# 0xRR_GG_BB -> canonical name
+VALUE_TO_NAME: MappingProxyType[int, str]
+
+# the indexes above, built together on first access (see __getattr__)
+_INDEXES = ("NAME_TO_VALUE", "VALUE_TO_NAMES", "VALUE_TO_NAME")
+
+# raw spelling -> value of names found after normalizing, bounded
+_SPELLINGS: dict[str, int] = {}
+_SPELLINGS_SIZE = 1024
+
+POINT_TYPE = tuple[float, ...]
+
+# color spaces searched by the k-d trees: (r, g, b) -> point
+_SPACES: dict[str, Callable[[int, int, int], POINT_TYPE]] = {
+    "rgb": lambda r, g, b: (r, g, b),
+    # "redmean"-like channel weights, a cheap approximation of perceived distance
+    "weighted": lambda r, g, b: (r * sqrt(2), g * sqrt(4), b * sqrt(3)),
+    # perceptual spaces, where euclidean distance is ΔE76 / ΔEok
+    "lab": _rgb_to_lab,
+    "oklab": _rgb_to_oklab,
+}
+
+# node: (point, name, axis, left, right)
+_KDNode = tuple[POINT_TYPE, str, int, Optional["_KDNode"], Optional["_KDNode"]]
+_TREES: dict[str, _KDNode] = {}
+
+# per batch memo size, cleared when full to keep memory bounded
+_MEMO_SIZE = 65536
+
+
+@lru_cache(maxsize=None)
+def _indexes() -> tuple[
+    MappingProxyType[str, int],
+    MappingProxyType[int, tuple[str, ...]],
+    MappingProxyType[int, str],
+]:
+    names: dict[int, list[str]] = {}
+    for name, value in _vars.NAMES_COLORS.items():
+        names.setdefault(value, []).append(name)
+
+    return (
+        MappingProxyType(dict(_vars.NAMES_COLORS)),
+        MappingProxyType({value: tuple(x) for value, x in names.items()}),
+        MappingProxyType({value: x[0] for value, x in names.items()}),
+    )
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _INDEXES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals().update(zip(_INDEXES, _indexes()))
+    return globals()[name]
+
+
+def lookup_name(name: str, default: Any = MISSING) -> int:
+    """
+    Return the 0xRR_GG_BB value of a color name, ignoring case and whitespace
+
+    Unknown names raise ``ValueError`` unless a ``default`` is given.
+    """
+    name_to_value = _indexes()[0]
+    value = name_to_value.get(name)
+    if value is None:
+        value = _SPELLINGS.get(name)
+    if value is None:
+        value = name_to_value.get("".join(name.split()).lower())
+        if value is None:
+            if default is not MISSING:
+                return default
+            raise ValueError(f"Unknown color name: {name!r}")
+
+        if len(_SPELLINGS) >= _SPELLINGS_SIZE:
+            _SPELLINGS.clear()
+        _SPELLINGS[name] = value
+    return value
+
+
+def name_of(value: Any) -> Optional[str]:
+    """
+    Return the canonical name of an opaque color, or ``None``
+
+    ``value`` is a packed 0xRR_GG_BB_AA int, an :class:`RGB` / :class:`RGBA`
+    or an (r, g, b[, a]) tuple.
+    """
+    value_to_name = _indexes()[2]
+    if isinstance(value, int):
+        if value & 0xFF != 0xFF:
+            return None
+        return value_to_name.get(value >> 8)
+    if isinstance(value, RGB):
+        return value_to_name.get(value.to_int())
+    if len(value) == 4 and value[3] != 0xFF:
+        return None
+
+    r, g, b = get_channels(value)
+    return value_to_name.get((r << 16) | (g << 8) | b)
+
+
+def _build(points: list[tuple[POINT_TYPE, str]], depth: int = 0) -> _KDNode:
+    if not points:
+        return None
+
+    axis = depth % len(points[0][0])
+    points.sort(key=lambda item: item[0][axis])
+    median = len(points) // 2
+    point, name = points[median]
+    return (
+        point,
+        name,
+        axis,
+        _build(points[:median], depth + 1),
+        _build(points[median + 1 :], depth + 1),
+    )
+
+
+def _tree(space: str) -> _KDNode:
+    tree = _TREES.get(space)
+    if tree is None:
+        if space not in _SPACES:
+            raise ValueError(f"Unknown color space: {space!r}")
+
+        convert = _SPACES[space]
+        tree = _TREES[space] = _build(
+            [
+                (convert(*get_channels(value << 8)), name)
+                for value, name in _indexes()[2].items()
+            ]
+        )
+    return tree
+
+
+def _search(node: _KDNode, target: POINT_TYPE) -> tuple[float, str]:
+    best_distance, best_name = float("inf"), ""
+    # (node, lower bound of the distance to anything under it)
+    stack: list[tuple[_KDNode, float]] = [(node, 0.0)]
+
+    while stack:
+        node, bound = stack.pop()
+        if node is None or bound >= best_distance:
+            continue
+
+        point, name, axis, left, right = node
+        distance = sum((a - b) ** 2 for a, b in zip(point, target))
+        if distance < best_distance:
+            best_distance, best_name = distance, name
+
+        diff = target[axis] - point[axis]
+        near, far = (left, right) if diff < 0 else (right, left)
+        # visit the near side first, the far side only if it can be closer
+        stack.append((far, diff * diff))
+        stack.append((near, 0.0))
+
+    return best_distance, best_name
+
+
+def nearest_name(value: Any, *, space: str = "rgb") -> str:
+    """
+    Return the name of the closest named color
+
+    ``value`` is a packed 0xRR_GG_BB_AA int, an :class:`RGB` / :class:`RGBA`
+    or an (r, g, b[, a]) tuple; ``space`` is ``"rgb"``, ``"weighted"``,
+    ``"lab"`` or ``"oklab"``.
+    """
+    tree = _tree(space)
+    return _search(tree, _SPACES[space](*get_channels(value)))[1]
+
+
+def nearest_names(values: Iterable[Any], *, space: str = "rgb") -> list[str]:
+    """Return the closest named color of every value, see :func:`nearest_name`"""
+    tree = _tree(space)
+    convert = _SPACES[space]
+    memo: dict[tuple[int, int, int], str] = {}
+
+    result = []
+    for value in values:
+        channels = get_channels(value)
+        name = memo.get(channels)
+        if name is None:
+            if len(memo) >= _MEMO_SIZE:
+                memo.clear()
+            name = memo[channels] = _search(tree, convert(*channels))[1]
+        result.append(name)
+    return result
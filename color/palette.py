@@ -0,0 +1,239 @@
+"""
+Mapping of pixels onto a fixed palette.
+
+:class:`PaletteMapper` splits the RGB cube into ``2 ** bits`` cells per axis
+and keeps, for every cell, the few palette entries that can be the closest
+to a color inside it. Each pixel then only compares itself against the
+candidates of its cell instead of the whole palette. Cells are filled on
+first use, or all at once by :meth:`PaletteMapper.precompute`.
+"""
+
+from array import array
+from typing import Any, Iterable, Mapping, Optional, Union
+
+from ._utils import UINT32_TYPECODE, np
+from .array import _pack
+from .buffer import BYTEORDER_TYPE, FORMAT_TYPE
+from .quantize import _index_array, _pixels
+from .types import RGB, RGBA
+
+__all__ = ("PaletteMapper",)
+
+# Floyd–Steinberg error weights (/ 16) for (dx, dy)
+_DIFFUSION = ((1, 0, 7), (-1, 1, 3), (0, 1, 5), (1, 1, 1))
+
+
+class PaletteMapper:
+    """
+    Nearest palette entry lookups through a precomputed RGB cube
+
+    ``palette`` is an iterable of packed 0xRR_GG_BB_AA ints, :class:`RGB` or
+    :class:`RGBA` values, or a mapping of 0xRR_GG_BB values such as
+    :data:`color.vars.NAMES_COLORS`. ``bits`` (1 ~ 8) sets the number of cells
+    per axis: more cells hold fewer candidates each but take longer to fill.
+    Distances are measured on R, G and B.
+    """
+
+    __slots__ = ("palette", "bits", "_channels", "_cells")
+
+    def __init__(
+        self,
+        palette: Union[Iterable[Union[int, RGB, RGBA]], Mapping[Any, int]],
+        *,
+        bits: int = 5,
+    ) -> None:
+        if not 1 <= bits <= 8:
+            raise ValueError("bits must be between 1 and 8")
+
+        if isinstance(palette, Mapping):
+            values = [(value << 8) | 0xFF for value in palette.values()]
+        else:
+            values = [_pack(value) for value in palette]
+        if not 1 <= len(values) <= 0x10000:
+            raise ValueError("Palette must have between 1 and 65536 colors")
+
+        self.palette = array(UINT32_TYPECODE, values)
+        self.bits = bits
+        self._channels = [(x >> 24, (x >> 16) & 0xFF, (x >> 8) & 0xFF) for x in values]
+        self._cells: list[Optional[tuple[int, ...]]] = [None] * (1 << 3 * bits)
+
+    def __repr__(self) -> str:
+        name = self.__class__.__name__
+        return f"<{name} colors={len(self.palette)} bits={self.bits}>"
+
+    def __len__(self) -> int:
+        return len(self.palette)
+
+    def _bounds(self, cell: int) -> tuple[tuple[int, int], ...]:
+        bits, size = self.bits, 256 >> self.bits
+        mask = (1 << bits) - 1
+        lows = (((cell >> shift) & mask) * size for shift in (2 * bits, bits, 0))
+        return tuple((low, low + size - 1) for low in lows)
+
+    def _candidates(self, cell: int) -> tuple[int, ...]:
+        """Return the entries that can be the closest to a color inside ``cell``"""
+        candidates = self._cells[cell]
+        if candidates is not None:
+            return candidates
+
+        bounds = self._bounds(cell)
+        nearest, farthest = [], []
+        for channels in self._channels:
+            near = far = 0
+            for x, (low, high) in zip(channels, bounds):
+                if x < low:
+                    near += (low - x) ** 2
+                elif x > high:
+                    near += (x - high) ** 2
+                far += max(x - low, high - x) ** 2
+            nearest.append(near)
+            farthest.append(far)
+
+        # the closest entry of any color in the cell is at most min(farthest)
+        # away; skip duplicated entries, the first one wins
+        limit, seen = min(farthest), set()
+        candidates = []
+        for i, near in enumerate(nearest):
+            if near <= limit and self._channels[i] not in seen:
+                seen.add(self._channels[i])
+                candidates.append(i)
+
+        candidates = self._cells[cell] = tuple(candidates)
+        return candidates
+
+    def precompute(self) -> None:
+        """Fill every cell of the cube"""
+        if np is None:
+            for cell in range(len(self._cells)):
+                self._candidates(cell)
+            return
+
+        bits, size = self.bits, 256 >> self.bits
+        coords = np.arange(1 << bits) * size
+        # (cells, 3) lower and upper bounds
+        low = np.stack(
+            np.meshgrid(coords, coords, coords, indexing="ij"), axis=-1
+        ).reshape(-1, 3)
+        high = low + size - 1
+        entries = np.array(self._channels, dtype=np.int64)
+        _, first = np.unique(entries, axis=0, return_index=True)
+        unique = np.zeros(len(entries), dtype=bool)
+        unique[first] = True
+
+        # bound the (chunk, palette, 3) int64 intermediates to ~8 MB each
+        chunk = max(1, (8 << 20) // (3 * 8 * len(entries)))
+        for start in range(0, len(low), chunk):
+            lo = low[start : start + chunk, None, :]
+            hi = high[start : start + chunk, None, :]
+            x = entries[None, :, :]
+            near = ((np.maximum(lo - x, 0) + np.maximum(x - hi, 0)) ** 2).sum(axis=2)
+            far = (np.maximum(x - lo, hi - x) ** 2).sum(axis=2)
+            mask = (near <= far.min(axis=1)[:, None]) & unique
+            for cell, row in enumerate(mask, start):
+                self._cells[cell] = tuple(np.flatnonzero(row).tolist())
+
+    def _nearest(self, r: int, g: int, b: int) -> int:
+        bits, shift = self.bits, 8 - self.bits
+        cell = ((((r >> shift) << bits) | (g >> shift)) << bits) | (b >> shift)
+        candidates = self._cells[cell]
+        if candidates is None:
+            candidates = self._candidates(cell)
+        if len(candidates) == 1:
+            return candidates[0]
+
+        channels = self._channels
+        return min(
+            candidates,
+            key=lambda i: (channels[i][0] - r) ** 2
+            + (channels[i][1] - g) ** 2
+            + (channels[i][2] - b) ** 2,
+        )
+
+    def index(self, value: Union[int, RGB, RGBA]) -> int:
+        """Return the index of the palette entry closest to ``value``"""
+        value = _pack(value)
+        return self._nearest(value >> 24, (value >> 16) & 0xFF, (value >> 8) & 0xFF)
+
+    def nearest(self, value: Union[int, RGB, RGBA]) -> int:
+        """Return the packed palette entry closest to ``value``"""
+        return self.palette[self.index(value)]
+
+    def map(
+        self,
+        pixels: Any,
+        *,
+        fmt: FORMAT_TYPE = "rgba8888",
+        byteorder: BYTEORDER_TYPE = "little",
+        dither: bool = False,
+        width: Optional[int] = None,
+    ) -> array:
+        """
+        Return the palette index of every pixel
+
+        ``pixels`` is an ``array`` of packed values, a :class:`ColorArray`, a
+        raw ``fmt`` buffer or an iterable of ints / :class:`RGB` /
+        :class:`RGBA`. ``dither`` applies Floyd–Steinberg error diffusion
+        over rows of ``width`` pixels (defaults to a single row).
+        """
+        values = _pixels(pixels, fmt, byteorder)
+        if dither:
+            return self._dither(values, width or len(values) or 1)
+
+        nearest = self._nearest
+        lookup = {
+            value: nearest(value >> 24, (value >> 16) & 0xFF, (value >> 8) & 0xFF)
+            for value in set(values)
+        }
+        return _index_array(len(self.palette), map(lookup.__getitem__, values))
+
+    def remap(
+        self,
+        pixels: Any,
+        *,
+        fmt: FORMAT_TYPE = "rgba8888",
+        byteorder: BYTEORDER_TYPE = "little",
+        dither: bool = False,
+        width: Optional[int] = None,
+    ) -> array:
+        """Return the packed palette entry of every pixel, see :meth:`map`"""
+        indexes = self.map(
+            pixels, fmt=fmt, byteorder=byteorder, dither=dither, width=width
+        )
+        return array(UINT32_TYPECODE, map(self.palette.__getitem__, indexes))
+
+    def _dither(self, values: array, width: int) -> array:
+        if width <= 0:
+            raise ValueError("width must be positive")
+        if len(values) % width:
+            raise ValueError("Number of pixels must be a multiple of width")
+
+        nearest, channels = self._nearest, self._channels
+        result = _index_array(len(self.palette), ())
+        # accumulated error (* 16) of the current and the next row, with one
+        # pixel of padding on both sides
+        errors = [[0] * (width + 2) for _ in range(3)]
+        below = [[0] * (width + 2) for _ in range(3)]
+
+        for start in range(0, len(values), width):
+            row = []
+            for x, value in enumerate(values[start : start + width], 1):
+                target = [
+                    max(0, min(0xFF, ((value >> shift) & 0xFF) + (error[x] + 8 >> 4)))
+                    for shift, error in zip((24, 16, 8), errors)
+                ]
+                index = nearest(*target)
+                row.append(index)
+
+                for wanted, entry, error, next_error in zip(
+                    target, channels[index], errors, below
+                ):
+                    diff = wanted - entry
+                    if diff:
+                        for dx, dy, weight in _DIFFUSION:
+                            (next_error if dy else error)[x + dx] += diff * weight
+
+            result.extend(row)
+            errors, below = below, errors
+            for error in below:
+                error[:] = [0] * (width + 2)
+        return result
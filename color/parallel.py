@@ -0,0 +1,198 @@
+"""
+Conversion of very large raw pixel buffers on a process pool.
+
+The source buffer is copied once into a shared memory block and every worker
+converts its own shard straight into a second shared block, so no pixel data
+is pickled between processes. Raw buffers (see :data:`BUFFER_FORMATS`) are
+sharded by pixels, Y'CbCr frames (see :data:`FRAME_FORMATS`) by bands of
+rows.
+"""
+
+import os
+from typing import Any, Optional, Union
+
+from ._utils import YUV_BT601, YUVStandard
+from .buffer import (
+    BUFFER_FORMATS,
+    BYTEORDER_TYPE,
+    FORMAT_TYPE,
+    _check_byteorder,
+    _view,
+    decode_buffer,
+    encode_buffer,
+)
+from .frame import FRAME_FORMAT_TYPE, FRAME_FORMATS, _RowDecoder, frame_size
+
+__all__ = ("convert_parallel",)
+
+SOURCE_TYPE = Union[FORMAT_TYPE, FRAME_FORMAT_TYPE]
+
+# (start, stop) pixels of a raw buffer, or rows of a frame
+_SHARD_TYPE = tuple[int, int]
+
+
+def _convert_pixels(
+    src: memoryview,
+    dst: memoryview,
+    src_fmt: str,
+    dst_fmt: str,
+    byteorder: str,
+    shard: _SHARD_TYPE,
+) -> None:
+    start, stop = shard
+    src_size, dst_size = BUFFER_FORMATS[src_fmt], BUFFER_FORMATS[dst_fmt]
+    values = decode_buffer(
+        src[start * src_size : stop * src_size], src_fmt, byteorder=byteorder
+    )
+    dst[start * dst_size : stop * dst_size] = encode_buffer(
+        values, dst_fmt, byteorder=byteorder
+    )
+
+
+def _convert_rows(
+    src: memoryview,
+    dst: memoryview,
+    decoder: _RowDecoder,
+    dst_fmt: str,
+    byteorder: str,
+    shard: _SHARD_TYPE,
+) -> None:
+    start, stop = shard
+    row_size = decoder.width * BUFFER_FORMATS[dst_fmt]
+    if dst_fmt == decoder.output:
+        for y in range(start, stop):
+            decoder.decode(y, dst[y * row_size : (y + 1) * row_size])
+        return
+
+    row = bytearray(decoder.width * BUFFER_FORMATS[decoder.output])
+    for y in range(start, stop):
+        decoder.decode(y, row)
+        dst[y * row_size : (y + 1) * row_size] = encode_buffer(
+            decode_buffer(row, decoder.output), dst_fmt, byteorder=byteorder
+        )
+
+
+def _convert_shard(
+    src_name: str,
+    dst_name: str,
+    src_fmt: str,
+    dst_fmt: str,
+    byteorder: str,
+    frame: Optional[tuple[int, int, YUVStandard]],
+    shard: _SHARD_TYPE,
+) -> None:
+    """Convert one shard between two shared memory blocks, in a worker"""
+    from multiprocessing.shared_memory import SharedMemory
+
+    src, dst = SharedMemory(src_name), SharedMemory(dst_name)
+    try:
+        _convert(src.buf, dst.buf, src_fmt, dst_fmt, byteorder, frame, shard)
+    finally:
+        src.close()
+        dst.close()
+
+
+def _convert(
+    src: memoryview,
+    dst: memoryview,
+    src_fmt: str,
+    dst_fmt: str,
+    byteorder: str,
+    frame: Optional[tuple[int, int, YUVStandard]],
+    shard: _SHARD_TYPE,
+) -> None:
+    if frame is None:
+        _convert_pixels(src, dst, src_fmt, dst_fmt, byteorder, shard)
+        return
+
+    width, height, standard = frame
+    # decode to 3 bytes per pixel unless an alpha channel is wanted anyway
+    output = "rgba8888" if dst_fmt == "rgba8888" else "rgb888"
+    decoder = _RowDecoder(src, width, height, src_fmt, output, standard)
+    _convert_rows(src, dst, decoder, dst_fmt, byteorder, shard)
+
+
+def convert_parallel(
+    buf: Any,
+    src_fmt: SOURCE_TYPE,
+    dst_fmt: FORMAT_TYPE,
+    *,
+    workers: Optional[int] = None,
+    byteorder: BYTEORDER_TYPE = "little",
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    standard: YUVStandard = YUV_BT601,
+    chunk_size: int = 1 << 20,
+) -> bytearray:
+    """
+    Convert a raw ``src_fmt`` buffer into a ``dst_fmt`` buffer on ``workers``
+    processes (defaults to the number of CPUs)
+
+    ``src_fmt`` is one of :data:`BUFFER_FORMATS`, or one of
+    :data:`FRAME_FORMATS` with the ``width`` and ``height`` of the frame.
+    ``byteorder`` applies to the 16-bit layouts on both sides. Buffers are
+    split into shards of about ``chunk_size`` pixels; a single shard or
+    worker converts in this process without starting a pool.
+    """
+    _check_byteorder(byteorder)
+    if dst_fmt not in BUFFER_FORMATS:
+        raise ValueError(f"Unknown buffer format: {dst_fmt!r}")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    if src_fmt in FRAME_FORMATS:
+        if width is None or height is None:
+            raise ValueError("width and height are required for frame formats")
+        view = memoryview(buf).cast("B")
+        # validate the frame before starting any worker
+        _RowDecoder(view, width, height, src_fmt, "rgb888", standard)
+        view = view[: frame_size(width, height, src_fmt)]
+        frame: Optional[tuple[int, int, YUVStandard]] = (width, height, standard)
+        count, units, step = width * height, height, max(1, chunk_size // width)
+    else:
+        view = _view(buf, src_fmt)
+        frame = None
+        count = units = len(view) // BUFFER_FORMATS[src_fmt]
+        step = chunk_size
+
+    shards = [(start, min(start + step, units)) for start in range(0, units, step)]
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+    result = bytearray(count * BUFFER_FORMATS[dst_fmt])
+
+    if workers <= 1:
+        with memoryview(result) as dst:
+            for shard in shards:
+                _convert(view, dst, src_fmt, dst_fmt, byteorder, frame, shard)
+        return result
+
+    # process pools take a while to import, only pay for it when used
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing.shared_memory import SharedMemory
+
+    src = SharedMemory(create=True, size=max(1, len(view)))
+    dst = SharedMemory(create=True, size=max(1, len(result)))
+    try:
+        src.buf[: len(view)] = view
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [
+                executor.submit(
+                    _convert_shard,
+                    src.name,
+                    dst.name,
+                    src_fmt,
+                    dst_fmt,
+                    byteorder,
+                    frame,
+                    shard,
+                )
+                for shard in shards
+            ]
+            # re-raise errors from the workers
+            for future in futures:
+                future.result()
+        result[:] = dst.buf[: len(result)]
+    finally:
+        for block in (src, dst):
+            block.close()
+            block.unlink()
+    return result
@@ -0,0 +1,178 @@
+"""
+CSS color string parsing.
+
+The first characters of the input select the single regex of
+:data:`color.vars.MATCH_MAP` that can match it, hex colors skip regexes
+entirely, and results are kept in a bounded LRU cache keyed by the raw string.
+:func:`parse_many` and :func:`parse_stream` parse whole batches into packed
+arrays, sharing one memo per batch instead of going through the cache.
+"""
+
+from array import array
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Literal, TextIO
+
+from . import vars as _vars
+from ._utils import UINT32_TYPECODE
+from .convert import _hsl_to_rgb
+from .names import lookup_name
+
+__all__ = (
+    "parse_color",
+    "parse_many",
+    "parse_stream",
+)
+
+ERRORS_TYPE = Literal["raise", "skip", "default"]
+
+# per batch memo size, cleared when full to keep memory bounded
+_MEMO_SIZE = 4096
+# marks the strings to drop, never a valid packed value
+_SKIP = -1
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+def _byte(value: str) -> int:
+    return max(0, min(0xFF, int(value)))
+
+
+def _percent(value: str) -> int:
+    return max(0, min(0xFF, round(float(value) * 0xFF / 100)))
+
+
+def _alpha(value: str) -> int:
+    return max(0, min(0xFF, round(float(value) * 0xFF)))
+
+
+def _unit(value: str) -> float:
+    return max(0.0, min(1.0, float(value) / 100))
+
+
+def _pack(r: int, g: int, b: int, a: int = 0xFF) -> int:
+    return (r << 24) | (g << 16) | (b << 8) | a
+
+
+def _parse_hex(s: str) -> int:
+    digits = s[1:]
+    if not _HEX_DIGITS.issuperset(digits):
+        raise ValueError(f"Invalid color string: {s!r}")
+
+    size = len(digits)
+    if size in (3, 4):
+        # #rgb(a) -> #rrggbb(aa)
+        digits = "".join(c + c for c in digits)
+    elif size not in (6, 8):
+        raise ValueError(f"Invalid color string: {s!r}")
+
+    value = int(digits, 16)
+    return value if len(digits) == 8 else (value << 8) | 0xFF
+
+
+def _parse_function(s: str) -> int:
+    name = s[: s.find("(")]
+    percent = "%" in s
+
+    if name == "rgb":
+        pattern = _vars.RGB_PERCENT_RE if percent else _vars.RGB_INTEGER_RE
+        if match := pattern.match(s):
+            parse = _percent if percent else _byte
+            return _pack(*map(parse, match.groups()))
+    elif name == "rgba":
+        pattern = _vars.RGBA_PERCENT_RE if percent else _vars.RGBA_INTEGER_RE
+        if match := pattern.match(s):
+            r, g, b, a = match.groups()
+            parse = _percent if percent else _byte
+            return _pack(parse(r), parse(g), parse(b), _alpha(a))
+    elif name in ("hsl", "hsla"):
+        pattern = _vars.HSL_PERCENT_RE if name == "hsl" else _vars.HSLA_PERCENT_RE
+        if match := pattern.match(s):
+            h, s_, l, *a = match.groups()
+            r, g, b = _hsl_to_rgb(float(h), _unit(s_), _unit(l))
+            return _pack(r, g, b, _alpha(a[0]) if a else 0xFF)
+
+    raise ValueError(f"Invalid color string: {s!r}")
+
+
+@lru_cache(maxsize=1024)
+def parse_color(s: str) -> int:
+    """
+    Parse a CSS color string (``#rgb``, ``#rgba``, ``#rrggbb``, ``#rrggbbaa``,
+    ``rgb()``, ``rgba()``, ``hsl()``, ``hsla()`` or a color name) into a packed
+    0xRR_GG_BB_AA value
+    """
+    s = s.strip().lower()
+
+    if s.startswith("#"):
+        return _parse_hex(s)
+    if s.endswith(")"):
+        return _parse_function(s)
+    if (value := lookup_name(s, None)) is not None:
+        return (value << 8) | 0xFF
+
+    raise ValueError(f"Invalid color string: {s!r}")
+
+
+def _batch_parser(errors: ERRORS_TYPE, default: int) -> Callable[[str], int]:
+    """Return a parser sharing one memo (and error policy) across a batch"""
+    if errors not in ("raise", "skip", "default"):
+        raise ValueError("errors must be one of 'raise', 'skip' or 'default'")
+    if not 0 <= default <= 0xFFFFFFFF:
+        raise ValueError(f"default must be a packed 0xRR_GG_BB_AA value: {default!r}")
+
+    parse = parse_color.__wrapped__
+    memo: dict[str, int] = {}
+
+    def parser(s: str) -> int:
+        value = memo.get(s)
+        if value is None:
+            try:
+                value = parse(s)
+            except ValueError:
+                if errors == "raise":
+                    raise
+                value = default if errors == "default" else _SKIP
+
+            if len(memo) >= _MEMO_SIZE:
+                memo.clear()
+            memo[s] = value
+        return value
+
+    return parser
+
+
+def parse_many(
+    strings: Iterable[str], *, errors: ERRORS_TYPE = "raise", default: int = 0
+) -> array:
+    """
+    Parse color strings into an ``array`` of packed 0xRR_GG_BB_AA values
+
+    Invalid strings raise ``ValueError`` (``errors="raise"``), are dropped
+    (``errors="skip"``) or are replaced by ``default`` (``errors="default"``).
+    """
+    values = map(_batch_parser(errors, default), strings)
+    if errors == "skip":
+        values = (value for value in values if value != _SKIP)
+    return array(UINT32_TYPECODE, values)
+
+
+def parse_stream(
+    fp: TextIO,
+    *,
+    errors: ERRORS_TYPE = "raise",
+    default: int = 0,
+    chunk_size: int = 65536,
+) -> Iterator[array]:
+    """
+    Parse a file object holding one color string per line, yielding arrays
+    of at most ``chunk_size`` packed values; blank lines are ignored
+    """
+    parser = _batch_parser(errors, default)
+    lines = (line for line in fp if line.strip())
+
+    while chunk := list(islice(lines, chunk_size)):
+        values = map(parser, chunk)
+        if errors == "skip":
+            values = (value for value in values if value != _SKIP)
+        yield array(UINT32_TYPECODE, values)
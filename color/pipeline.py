@@ -0,0 +1,297 @@
+"""
+Streaming conversion of raw pixel data in fixed-size chunks.
+
+A :class:`Pipeline` is built by chaining steps::
+
+    pipeline = (
+        Pipeline(chunk_size=4096)
+        .decode("rgb565")
+        .to_space("hsv")
+        .adjust(s=lambda s: min(1.0, s * 1.2))
+        .encode("rgba8888")
+    )
+    for chunk in pipeline.run(source):
+        ...
+
+Input pieces of any size are regrouped into chunks of ``chunk_size`` pixels,
+so at most one chunk and one input piece are held at a time whatever the size
+of the stream. :meth:`Pipeline.run_async` does the same over async streams,
+reading ahead at most ``max_pending`` pieces: a slow consumer stops the reads,
+which lets the transport apply its own backpressure.
+"""
+
+from array import array
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+)
+
+from ._utils import UINT32_TYPECODE
+from .buffer import (
+    BUFFER_FORMATS,
+    BYTEORDER_TYPE,
+    FORMAT_TYPE,
+    _check_byteorder,
+    decode_buffer,
+    encode_buffer,
+)
+from .gradient import GRADIENT_SPACES, SPACE_TYPE, _Space
+
+__all__ = ("Pipeline",)
+
+ROW_TYPE = tuple[float, float, float, int]
+
+# names of the coordinates of every space, alpha is always "alpha"
+_CHANNELS: dict[str, tuple[str, str, str]] = {
+    "rgb": ("r", "g", "b"),
+    "hsl": ("h", "s", "l"),
+    "hsv": ("h", "s", "v"),
+    "lab": ("l", "a", "b"),
+    "oklab": ("l", "a", "b"),
+    "oklch": ("l", "c", "h"),
+}
+
+
+def _to_rows(values: array, space: _Space) -> list[ROW_TYPE]:
+    from_rgb = space.from_rgb
+    return [
+        from_rgb(v >> 24, (v >> 16) & 0xFF, (v >> 8) & 0xFF) + (v & 0xFF,)
+        for v in values
+    ]
+
+
+def _to_values(rows: list[ROW_TYPE], space: _Space) -> array:
+    to_rgb, values = space.to_rgb, array(UINT32_TYPECODE)
+    for c0, c1, c2, a in rows:
+        # adjusted rgb rows may leave 0~255, unlike the other spaces
+        r, g, b = to_rgb(c0, c1, c2)
+        values.append(
+            (max(0, min(0xFF, r)) << 24)
+            | (max(0, min(0xFF, g)) << 16)
+            | (max(0, min(0xFF, b)) << 8)
+            | max(0, min(0xFF, round(a)))
+        )
+    return values
+
+
+class Pipeline:
+    """
+    Chain of conversions applied to a stream of raw pixel data
+
+    Steps run in the order they are added: :meth:`decode` must come first,
+    then any :meth:`to_space` / :meth:`adjust`, usually ending with
+    :meth:`encode`. Every ``chunk_size`` pixels chunk goes through the whole
+    chain before the next one is read.
+    """
+
+    __slots__ = ("chunk_size", "max_pending", "_steps", "_fmt", "_space")
+
+    def __init__(self, *, chunk_size: int = 4096, max_pending: int = 4) -> None:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if max_pending <= 0:
+            raise ValueError("max_pending must be positive")
+
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending
+        self._steps: list[Callable[[Any], Any]] = []
+        # input format, and the space of the rows between the steps (None for
+        # packed values, "" for the encoded output)
+        self._fmt: Optional[str] = None
+        self._space: Optional[str] = None
+
+    def __repr__(self) -> str:
+        name = self.__class__.__name__
+        return f"<{name} fmt={self._fmt!r} steps={len(self._steps)}>"
+
+    def _add(self, step: Callable[[Any], Any]) -> "Pipeline":
+        if self._fmt is None:
+            raise ValueError("A pipeline must start with decode()")
+        if self._space == "":
+            raise ValueError("No step can follow encode()")
+        self._steps.append(step)
+        return self
+
+    def decode(
+        self, fmt: FORMAT_TYPE = "rgba8888", *, byteorder: BYTEORDER_TYPE = "little"
+    ) -> "Pipeline":
+        """Decode ``fmt`` input into packed 0xRR_GG_BB_AA values"""
+        if self._fmt is not None:
+            raise ValueError("decode() can only be the first step")
+        if fmt not in BUFFER_FORMATS:
+            raise ValueError(f"Unknown buffer format: {fmt!r}")
+        _check_byteorder(byteorder)
+
+        self._fmt = fmt
+        self._steps.append(lambda data: decode_buffer(data, fmt, byteorder=byteorder))
+        return self
+
+    def to_space(self, space: SPACE_TYPE) -> "Pipeline":
+        """
+        Convert pixels to ``(c0, c1, c2, alpha)`` rows in ``space``, one of
+        :data:`color.gradient.GRADIENT_SPACES`
+        """
+        if space not in GRADIENT_SPACES:
+            raise ValueError(f"Unknown color space: {space!r}")
+
+        current, target = self._space, GRADIENT_SPACES[space]
+        if current is None:
+            step = lambda values: _to_rows(values, target)
+        else:
+            source = GRADIENT_SPACES.get(current)
+            step = lambda rows: _to_rows(_to_values(rows, source), target)
+        self._add(step)
+        self._space = space
+        return self
+
+    def adjust(
+        self,
+        func: Optional[Callable[[ROW_TYPE], ROW_TYPE]] = None,
+        **channels: Callable[[float], float],
+    ) -> "Pipeline":
+        """
+        Change the rows of the current space
+
+        ``func`` maps a whole ``(c0, c1, c2, alpha)`` row to a new one, and
+        every keyword maps the values of one channel, named after the space
+        (``h``, ``s`` and ``v`` for ``hsv``...) or ``alpha``.
+        """
+        if self._space is None or self._space == "":
+            raise ValueError("adjust() must follow to_space()")
+
+        names = _CHANNELS[self._space] + ("alpha",)
+        unknown = set(channels) - set(names)
+        if unknown:
+            raise ValueError(
+                f"Unknown {self._space!r} channels: {', '.join(sorted(unknown))}"
+            )
+        funcs = [channels.get(name) for name in names]
+
+        def step(rows: list[ROW_TYPE]) -> list[ROW_TYPE]:
+            if func is not None:
+                rows = [func(row) for row in rows]
+            for i, channel in enumerate(funcs):
+                if channel is not None:
+                    rows = [row[:i] + (channel(row[i]),) + row[i + 1 :] for row in rows]
+            return rows
+
+        return self._add(step)
+
+    def encode(
+        self, fmt: FORMAT_TYPE = "rgba8888", *, byteorder: BYTEORDER_TYPE = "little"
+    ) -> "Pipeline":
+        """Encode the pixels into ``fmt`` output, the last step"""
+        if fmt not in BUFFER_FORMATS:
+            raise ValueError(f"Unknown buffer format: {fmt!r}")
+        _check_byteorder(byteorder)
+
+        if self._space is None:
+            step = lambda values: encode_buffer(values, fmt, byteorder=byteorder)
+        else:
+            source = GRADIENT_SPACES.get(self._space)
+            step = lambda rows: encode_buffer(
+                _to_values(rows, source), fmt, byteorder=byteorder
+            )
+        self._add(step)
+        self._space = ""
+        return self
+
+    def process(self, data: Any) -> Any:
+        """Run every step over one chunk of whole pixels"""
+        if self._fmt is None:
+            raise ValueError("A pipeline must start with decode()")
+        for step in self._steps:
+            data = step(data)
+        return data
+
+    def _chunks(self, pending: bytearray, piece: Any, end: bool) -> Iterator[Any]:
+        """Add ``piece`` to ``pending`` and process every full chunk"""
+        pending += piece
+        size = self.chunk_size * BUFFER_FORMATS[self._fmt]
+        while len(pending) >= size:
+            chunk = bytes(pending[:size])
+            del pending[:size]
+            yield self.process(chunk)
+
+        if end and pending:
+            if len(pending) % BUFFER_FORMATS[self._fmt]:
+                raise ValueError("Stream ended in the middle of a pixel")
+            chunk = bytes(pending)
+            pending.clear()
+            yield self.process(chunk)
+
+    def run(self, source: Union[Iterable[Any], Any]) -> Iterator[Any]:
+        """
+        Yield the result of every chunk of ``source``, an iterable of
+        bytes-like pieces or a binary file object
+        """
+        if self._fmt is None:
+            raise ValueError("A pipeline must start with decode()")
+
+        if hasattr(source, "read"):
+            read, size = source.read, self.chunk_size * BUFFER_FORMATS[self._fmt]
+            source = iter(lambda: read(size), b"")
+
+        pending = bytearray()
+        for piece in source:
+            yield from self._chunks(pending, piece, False)
+        yield from self._chunks(pending, b"", True)
+
+    async def run_async(
+        self, source: Union[AsyncIterable[Any], Any]
+    ) -> AsyncIterator[Any]:
+        """
+        Yield the result of every chunk of ``source``, an async iterable of
+        bytes-like pieces or a stream with an async ``read()`` such as
+        :class:`asyncio.StreamReader`
+        """
+        import asyncio
+
+        if self._fmt is None:
+            raise ValueError("A pipeline must start with decode()")
+
+        if hasattr(source, "read"):
+            size = self.chunk_size * BUFFER_FORMATS[self._fmt]
+
+            async def pieces() -> AsyncIterator[Any]:
+                while piece := await source.read(size):
+                    yield piece
+
+        else:
+            pieces = source.__aiter__
+
+        # read ahead at most max_pending pieces, None marks the end
+        queue: asyncio.Queue = asyncio.Queue(self.max_pending)
+
+        async def read() -> None:
+            async for piece in pieces():
+                await queue.put(piece)
+            await queue.put(None)
+
+        reader = asyncio.ensure_future(read())
+        get: Optional[asyncio.Future] = None
+        try:
+            pending = bytearray()
+            while True:
+                get = asyncio.ensure_future(queue.get())
+                await asyncio.wait((get, reader), return_when=asyncio.FIRST_COMPLETED)
+                if not get.done() and reader.exception() is not None:
+                    # the reader failed before sending the end marker
+                    get.cancel()
+                    reader.result()
+                piece = await get
+                for chunk in self._chunks(pending, piece or b"", piece is None):
+                    yield chunk
+                if piece is None:
+                    break
+        finally:
+            # a cancelled consumer may leave the pending get behind
+            if get is not None:
+                get.cancel()
+            reader.cancel()
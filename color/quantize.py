@@ -0,0 +1,446 @@
+"""
+Palette quantization of pixel collections.
+
+Pixels are packed 0xRR_GG_BB_AA values: an ``array``, a :class:`ColorArray`,
+a raw pixel buffer (decoded as ``fmt``, see :mod:`color.buffer`) or an
+iterable of ints / :class:`RGB` / :class:`RGBA`. Every method returns the
+palette as packed values plus the palette index of every pixel.
+
+- ``octree``     : single pass, fed in chunks through :class:`OctreeQuantizer`
+                   so memory stays bounded by ``max_leaves``
+- ``median_cut`` : splits a 15-bit (5 bits per channel) histogram
+- ``kmeans``     : Lloyd iterations over a random sample of the pixels,
+                   seeded with the median cut palette of the sample
+
+Distances are measured on R, G and B; the alpha of a palette entry is the
+average alpha of its pixels.
+"""
+
+import heapq
+from array import array
+from collections import Counter
+from typing import Any, Iterable, Literal, Optional
+
+from ._utils import UINT32_TYPECODE, np
+from .array import ColorArray, _pack
+from .buffer import BYTEORDER_TYPE, FORMAT_TYPE, decode_buffer
+
+__all__ = (
+    "QUANTIZE_METHODS",
+    "OctreeQuantizer",
+    "quantize",
+)
+
+METHOD_TYPE = Literal["octree", "median_cut", "kmeans"]
+
+QUANTIZE_METHODS = ("octree", "median_cut", "kmeans")
+
+# pixels inserted (and counted) at once by the octree
+_CHUNK_SIZE = 65536
+
+# byte -> bits spread to every third bit, for 24-bit morton codes
+_SPREAD = tuple(
+    sum(((x >> i) & 1) << (3 * i) for i in range(8)) for x in range(0x100)
+)
+
+# [count, sum of r, sum of g, sum of b, sum of a]
+_Stats = list[int]
+
+
+def _pixels(pixels: Any, fmt: FORMAT_TYPE, byteorder: BYTEORDER_TYPE) -> array:
+    """Return the packed 0xRR_GG_BB_AA values of ``pixels``"""
+    if isinstance(pixels, ColorArray):
+        return pixels.data
+    if isinstance(pixels, array) and pixels.typecode == UINT32_TYPECODE:
+        return pixels
+    if isinstance(pixels, (bytes, bytearray, memoryview)):
+        return decode_buffer(pixels, fmt, byteorder=byteorder)
+    return array(UINT32_TYPECODE, map(_pack, pixels))
+
+
+def _check_colors(colors: int) -> None:
+    if not 1 <= colors <= 0x10000:
+        raise ValueError("colors must be between 1 and 65536")
+
+
+def _index_array(colors: int, indexes: Iterable[int]) -> array:
+    return array("B" if colors <= 0x100 else "H", indexes)
+
+
+def _accumulate(stats: _Stats, value: int, count: int) -> None:
+    stats[0] += count
+    stats[1] += (value >> 24) * count
+    stats[2] += ((value >> 16) & 0xFF) * count
+    stats[3] += ((value >> 8) & 0xFF) * count
+    stats[4] += (value & 0xFF) * count
+
+
+def _average(stats: _Stats) -> int:
+    count, half = stats[0], stats[0] // 2
+    result = 0
+    for total in stats[1:]:
+        result = (result << 8) | ((total + half) // count)
+    return result
+
+
+def _nearest(palette: array, value: int) -> int:
+    """Return the index of the closest palette entry, by linear search"""
+    r, g, b = value >> 24, (value >> 16) & 0xFF, (value >> 8) & 0xFF
+    return min(
+        range(len(palette)),
+        key=lambda i: (
+            ((palette[i] >> 24) - r) ** 2
+            + (((palette[i] >> 16) & 0xFF) - g) ** 2
+            + (((palette[i] >> 8) & 0xFF) - b) ** 2
+        ),
+    )
+
+
+class OctreeQuantizer:
+    """
+    Streaming octree quantizer
+
+    Pixels are added in any number of :meth:`add` calls; whenever the tree
+    holds more than ``max_leaves`` leaves, the least populated deepest nodes
+    are merged into their parent. :meth:`palette` then reduces the tree to
+    ``colors`` leaves, one palette entry each.
+    """
+
+    MAX_DEPTH = 8
+
+    def __init__(self, colors: int = 256, *, max_leaves: Optional[int] = None) -> None:
+        _check_colors(colors)
+        self.colors = colors
+        self.max_leaves = max(colors, 4096 if max_leaves is None else max_leaves)
+
+        # depth -> {morton code prefix: stats}
+        self._levels: list[dict[int, _Stats]] = [{} for _ in range(self.MAX_DEPTH + 1)]
+        self._leaves = 0
+        # id(leaf stats) -> palette index, built by palette()
+        self._palette: Optional[array] = None
+        self._index: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return self._leaves
+
+    def _leaves_of(self, values: Iterable[int]) -> dict[int, Optional[_Stats]]:
+        """Return the leaf holding every distinct value, ``None`` if missing"""
+        # (shift, leaves) of the non-empty levels, shallowest first
+        levels = [
+            (3 * (self.MAX_DEPTH - depth), level)
+            for depth, level in enumerate(self._levels)
+            if level
+        ]
+        result = {}
+        for value in values:
+            code = (
+                (_SPREAD[value >> 24] << 2)
+                | (_SPREAD[(value >> 16) & 0xFF] << 1)
+                | _SPREAD[(value >> 8) & 0xFF]
+            )
+            for shift, level in levels:
+                stats = level.get(code >> shift)
+                if stats is not None:
+                    break
+            else:
+                stats = None
+            result[value] = stats
+        return result
+
+    def add(
+        self,
+        pixels: Any,
+        *,
+        fmt: FORMAT_TYPE = "rgba8888",
+        byteorder: BYTEORDER_TYPE = "little",
+    ) -> None:
+        """Add pixels to the tree"""
+        values = _pixels(pixels, fmt, byteorder)
+        self._palette = None
+        deepest = self._levels[self.MAX_DEPTH]
+
+        for start in range(0, len(values), _CHUNK_SIZE):
+            counts = Counter(values[start : start + _CHUNK_SIZE])
+            for value, stats in self._leaves_of(counts).items():
+                if stats is None:
+                    code = (
+                        (_SPREAD[value >> 24] << 2)
+                        | (_SPREAD[(value >> 16) & 0xFF] << 1)
+                        | _SPREAD[(value >> 8) & 0xFF]
+                    )
+                    # values differing only by alpha share one leaf
+                    stats = deepest.get(code)
+                    if stats is None:
+                        stats = deepest[code] = [0, 0, 0, 0, 0]
+                        self._leaves += 1
+                _accumulate(stats, value, counts[value])
+
+            self._reduce(self.max_leaves)
+
+    def _reduce(self, limit: int) -> None:
+        levels = self._levels
+        depth = self.MAX_DEPTH
+        while self._leaves > limit and depth > 0:
+            level = levels[depth]
+            if not level:
+                depth -= 1
+                continue
+
+            groups: dict[int, list[int]] = {}
+            weights: dict[int, int] = {}
+            for key, stats in level.items():
+                groups.setdefault(key >> 3, []).append(key)
+                weights[key >> 3] = weights.get(key >> 3, 0) + stats[0]
+
+            parents = levels[depth - 1]
+            for parent in sorted(groups, key=weights.__getitem__):
+                keys = groups[parent]
+                parents[parent] = [sum(x) for x in zip(*map(level.pop, keys))]
+                self._leaves -= len(keys) - 1
+                if self._leaves <= limit:
+                    break
+
+    def palette(self) -> array:
+        """Reduce the tree to ``colors`` leaves and return their average colors"""
+        if self._palette is None:
+            self._reduce(self.colors)
+            self._palette = array(UINT32_TYPECODE)
+            self._index = {}
+            for level in self._levels:
+                for stats in level.values():
+                    self._index[id(stats)] = len(self._palette)
+                    self._palette.append(_average(stats))
+        return self._palette
+
+    def index(
+        self,
+        pixels: Any,
+        *,
+        fmt: FORMAT_TYPE = "rgba8888",
+        byteorder: BYTEORDER_TYPE = "little",
+    ) -> array:
+        """
+        Return the palette index of every pixel, the leaf it falls in or the
+        closest entry for pixels never added
+        """
+        values = _pixels(pixels, fmt, byteorder)
+        palette = self.palette()
+        if not palette:
+            raise ValueError("No pixels added")
+
+        lookup = {
+            value: _nearest(palette, value) if stats is None else self._index[id(stats)]
+            for value, stats in self._leaves_of(set(values)).items()
+        }
+        return _index_array(self.colors, map(lookup.__getitem__, values))
+
+
+def _histogram(values: Iterable[int]) -> dict[int, _Stats]:
+    """Return the stats of every 15-bit (5 bits per channel) bin"""
+    bins: dict[int, _Stats] = {}
+    for value, count in Counter(values).items():
+        key = (
+            ((value >> 17) & 0x7C00) | ((value >> 14) & 0x3E0) | ((value >> 11) & 0x1F)
+        )
+        stats = bins.get(key)
+        if stats is None:
+            stats = bins[key] = [0, 0, 0, 0, 0]
+        _accumulate(stats, value, count)
+    return bins
+
+
+def _median_cut(bins: dict[int, _Stats], colors: int) -> list[list[int]]:
+    """Split the histogram bins into at most ``colors`` boxes of bin keys"""
+    # per axis: shift of the 5-bit coordinate inside a bin key
+    shifts = (10, 5, 0)
+
+    def entry(keys: list[int]) -> tuple[int, int, int, list[int]]:
+        count = sum(bins[key][0] for key in keys)
+        ranges = [
+            max((key >> shift) & 0x1F for key in keys)
+            - min((key >> shift) & 0x1F for key in keys)
+            for shift in shifts
+        ]
+        axis = max(range(3), key=ranges.__getitem__)
+        # largest populated boxes first, ties broken by their extent
+        return (-count * ranges[axis], len(keys), axis, keys)
+
+    heap = [entry(list(bins))] if bins else []
+    done = []
+    while heap and len(heap) + len(done) < colors:
+        score, _, axis, keys = heapq.heappop(heap)
+        if score == 0:
+            done.append(keys)
+            continue
+
+        shift = shifts[axis]
+        keys.sort(key=lambda key: (key >> shift) & 0x1F)
+        half, total = sum(bins[key][0] for key in keys) / 2, 0
+        for split, key in enumerate(keys[:-1], 1):
+            total += bins[key][0]
+            if total >= half:
+                break
+        # never split inside one coordinate, keeping both halves non-empty
+        coordinate = (keys[split - 1] >> shift) & 0x1F
+        while split < len(keys) and (keys[split] >> shift) & 0x1F == coordinate:
+            split += 1
+        if split == len(keys):
+            while (keys[split - 1] >> shift) & 0x1F == coordinate:
+                split -= 1
+
+        heapq.heappush(heap, entry(keys[:split]))
+        heapq.heappush(heap, entry(keys[split:]))
+
+    return done + [item[3] for item in heap]
+
+
+def _box_palette(bins: dict[int, _Stats], boxes: list[list[int]]) -> array:
+    palette = array(UINT32_TYPECODE)
+    for keys in boxes:
+        palette.append(_average([sum(x) for x in zip(*map(bins.__getitem__, keys))]))
+    return palette
+
+
+def _quantize_median_cut(values: array, colors: int) -> tuple[array, array]:
+    bins = _histogram(values)
+    boxes = _median_cut(bins, colors)
+
+    lut = array("H", bytes(2 * 0x8000))
+    for index, keys in enumerate(boxes):
+        for key in keys:
+            lut[key] = index
+    indexes = (
+        lut[((value >> 17) & 0x7C00) | ((value >> 14) & 0x3E0) | ((value >> 11) & 0x1F)]
+        for value in values
+    )
+    return _box_palette(bins, boxes), _index_array(colors, indexes)
+
+
+def _np_channels(values: Any) -> Any:
+    """Return the (N, 3) float r, g, b columns of packed values"""
+    values = np.asarray(values, dtype=np.uint32)
+    return np.stack(
+        ((values >> 24), (values >> 16) & 0xFF, (values >> 8) & 0xFF), axis=1
+    ).astype(np.float64)
+
+
+def _assign(points: list[int], centers: list[tuple[float, ...]]) -> list[int]:
+    """Return the index of the closest center of every packed value"""
+    if np is not None:
+        data, targets = _np_channels(points), np.array(centers, dtype=np.float64)
+        result = np.empty(len(points), dtype=np.intp)
+        # bound the (chunk, centers, 3) float64 differences to ~8 MB
+        chunk = max(1, (8 << 20) // (3 * 8 * len(centers)))
+        for start in range(0, len(points), chunk):
+            part = data[start : start + chunk]
+            distances = ((part[:, None, :] - targets[None, :, :]) ** 2).sum(axis=2)
+            result[start : start + chunk] = distances.argmin(axis=1)
+        return result.tolist()
+
+    result = []
+    for value in points:
+        r, g, b = value >> 24, (value >> 16) & 0xFF, (value >> 8) & 0xFF
+        result.append(
+            min(
+                range(len(centers)),
+                key=lambda i: (centers[i][0] - r) ** 2
+                + (centers[i][1] - g) ** 2
+                + (centers[i][2] - b) ** 2,
+            )
+        )
+    return result
+
+
+def _quantize_kmeans(
+    values: array, colors: int, sample: int, iterations: int, seed: int
+) -> tuple[array, array]:
+    if len(values) > sample:
+        from random import Random
+
+        rng = Random(seed)
+        sampled = Counter(values[i] for i in rng.sample(range(len(values)), sample))
+    else:
+        sampled = Counter(values)
+    points, weights = list(sampled), list(sampled.values())
+
+    bins = _histogram(sampled.elements())
+    centers = [
+        ((x >> 24) & 0xFF, (x >> 16) & 0xFF, (x >> 8) & 0xFF)
+        for x in _box_palette(bins, _median_cut(bins, colors))
+    ]
+
+    labels: list[int] = []
+    for _ in range(iterations):
+        new_labels = _assign(points, centers)
+        if new_labels == labels:
+            break
+        labels = new_labels
+
+        sums = [[0, 0, 0, 0] for _ in centers]
+        for value, weight, label in zip(points, weights, labels):
+            total = sums[label]
+            total[0] += weight
+            total[1] += (value >> 24) * weight
+            total[2] += ((value >> 16) & 0xFF) * weight
+            total[3] += ((value >> 8) & 0xFF) * weight
+        # empty clusters keep their center
+        centers = [
+            (r / count, g / count, b / count) if count else center
+            for (count, r, g, b), center in zip(sums, centers)
+        ]
+
+    distinct = list(set(values))
+    lookup = dict(zip(distinct, _assign(distinct, centers)))
+
+    stats = [[0, 0, 0, 0, 0] for _ in centers]
+    for value, count in Counter(values).items():
+        _accumulate(stats[lookup[value]], value, count)
+    # entries with no pixels fall back to their center, opaque
+    palette = array(
+        UINT32_TYPECODE,
+        (
+            _average(total)
+            if total[0]
+            else (round(r) << 24) | (round(g) << 16) | (round(b) << 8) | 0xFF
+            for total, (r, g, b) in zip(stats, centers)
+        ),
+    )
+    return palette, _index_array(colors, map(lookup.__getitem__, values))
+
+
+def quantize(
+    pixels: Any,
+    colors: int = 256,
+    *,
+    method: METHOD_TYPE = "octree",
+    fmt: FORMAT_TYPE = "rgba8888",
+    byteorder: BYTEORDER_TYPE = "little",
+    sample: int = 10000,
+    iterations: int = 10,
+    seed: int = 0,
+) -> tuple[array, array]:
+    """
+    Reduce ``pixels`` to a palette of at most ``colors`` entries
+
+    Return the palette (packed 0xRR_GG_BB_AA ``array``) and the palette index
+    of every pixel (an ``array`` of typecode ``"B"``, or ``"H"`` for more than
+    256 colors). ``sample``, ``iterations`` and ``seed`` only apply to
+    ``kmeans``.
+    """
+    _check_colors(colors)
+    if method not in QUANTIZE_METHODS:
+        raise ValueError(f"Unknown quantize method: {method!r}")
+    if sample <= 0:
+        raise ValueError("sample must be positive")
+
+    values = _pixels(pixels, fmt, byteorder)
+    if not values:
+        return array(UINT32_TYPECODE), _index_array(colors, ())
+
+    if method == "octree":
+        quantizer = OctreeQuantizer(colors)
+        quantizer.add(values)
+        return quantizer.palette(), quantizer.index(values)
+    if method == "median_cut":
+        return _quantize_median_cut(values, colors)
+    return _quantize_kmeans(values, colors, sample, iterations, seed)
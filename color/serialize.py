@@ -0,0 +1,82 @@
+"""
+Bulk serialization of colors to hex and CSS strings.
+
+:func:`format_many` formats whole batches of packed 0xRR_GG_BB_AA values
+through the tables of :data:`CSS_FORMATS` and writes them straight into a
+``str``, a ``bytearray`` or a text stream. Hex output of uniformly opaque
+batches skips the per-color work entirely: the bytes of the batch are turned
+into hex digits in one call.
+"""
+
+from array import array
+from typing import Any, Iterable, Optional, TextIO, Union
+
+from ._format import CSS_FORMAT_TYPE, CSS_FORMATS, formatter
+from ._utils import UINT32_TYPECODE
+from .array import ColorArray, _pack
+from .buffer import encode_buffer
+
+__all__ = (
+    "CSS_FORMATS",
+    "format_many",
+)
+
+# values formatted and written at a time
+_CHUNK_SIZE = 0x10000
+
+# hex digits never contain it, see _hex_chunk()
+_PLACEHOLDER = ","
+
+
+def _hex_chunk(values: array, sep: str) -> Optional[str]:
+    """Return the hex strings of ``values`` if they share their alpha digits"""
+    alphas = encode_buffer(values)[3::4]
+    opaque = alphas.count(0xFF)
+    if opaque == len(values):
+        digits, size = encode_buffer(values, "rgb888"), 3
+    elif opaque == 0:
+        digits, size = encode_buffer(values), 4
+    else:
+        return None
+    text = digits.hex(_PLACEHOLDER, size)
+    return "#" + text.replace(_PLACEHOLDER, sep + "#")
+
+
+def format_many(
+    values: Iterable[Any],
+    fmt: CSS_FORMAT_TYPE = "hex",
+    *,
+    sep: str = "\n",
+    out: Union[bytearray, TextIO, None] = None,
+) -> Union[str, bytearray, TextIO]:
+    """
+    Format every color of ``values`` with ``fmt`` (see :data:`CSS_FORMATS`),
+    separated by ``sep``
+
+    ``values`` is an ``array`` of packed values, a :class:`ColorArray` or an
+    iterable of packed ints / :class:`RGB` / :class:`RGBA`. Return the
+    string, or append the ASCII text to the ``bytearray`` ``out`` / write it
+    to the text stream ``out`` and return ``out``.
+    """
+    format_value = formatter(fmt)
+    if isinstance(values, ColorArray):
+        values = values.data
+    if not isinstance(values, array) or values.typecode != UINT32_TYPECODE:
+        values = array(UINT32_TYPECODE, map(_pack, values))
+
+    parts = []
+    for start in range(0, len(values), _CHUNK_SIZE):
+        chunk = values[start : start + _CHUNK_SIZE]
+        text = _hex_chunk(chunk, sep) if fmt == "hex" else None
+        if text is None:
+            text = sep.join(map(format_value, chunk))
+
+        if start:
+            text = sep + text
+        if out is None:
+            parts.append(text)
+        elif isinstance(out, bytearray):
+            out += text.encode("ascii")
+        else:
+            out.write(text)
+    return "".join(parts) if out is None else out
@@ -0,0 +1,297 @@
+"""
+Binary files of palettes and lookup tables, memory-mapped when read.
+
+A table file holds named sections, each either a flat array (packed colors,
+gradient ramps, quantization lookup tables...) or a name index mapping names
+to values like :data:`color.vars.NAMES_COLORS`. Files are written once with
+:func:`write_tables` and opened with :class:`TableFile`, which maps the file
+instead of parsing it: sections are views into the mapping, paged in on
+first access and shared by every process opening the same file.
+
+Layout, all integers little-endian except the array items::
+
+    header     "CLRT", version (u16), byte order of the items (u8), pad (u8),
+               number of sections (u32)
+    directory  per section: name size (u16), kind (u8), typecode (1 byte),
+               offset (u64), number of items (u64), UTF-8 name
+    sections   8-byte aligned; arrays are raw items, name indexes are the
+               values (u32 * n), the end of every name (u32 * n) and the
+               UTF-8 names sorted by their bytes
+
+Items are stored in the byte order chosen by the writer, little-endian by
+default; machines of the other byte order read swapped copies instead of
+views.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Any, Iterator, Union
+
+from ._utils import UINT32_TYPECODE
+from .array import ColorArray, _pack
+from .buffer import BYTEORDER_TYPE, _check_byteorder
+
+__all__ = (
+    "write_tables",
+    "TableFile",
+    "NameTable",
+)
+
+TABLE_TYPE = Union[Mapping[str, Any], Any]
+PATH_TYPE = Union[str, "os.PathLike[str]"]
+
+_MAGIC = b"CLRT"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHBxI")
+_ENTRY = struct.Struct("<HBcQQ")
+_ALIGN = 8
+
+# section kinds
+_ARRAY, _NAMES = 0, 1
+
+# typecode stored in the file -> array typecode, by item size
+_TYPECODES = {b"B": "B", b"H": "H", b"I": UINT32_TYPECODE, b"d": "d"}
+_BYTEORDERS = {"little": 0, "big": 1}
+
+
+def _tobytes(items: array, swap: bool) -> bytes:
+    if swap:
+        items = array(items.typecode, items)
+        items.byteswap()
+    return items.tobytes()
+
+
+def _encode(table: TABLE_TYPE, swap: bool) -> tuple[int, bytes, int, list[bytes]]:
+    """Return the kind, typecode, number of items and data of a table"""
+    if isinstance(table, Mapping):
+        items = []
+        for name, value in table.items():
+            if not isinstance(value, int):
+                value = _pack(value)
+            elif not 0 <= value <= 0xFFFFFFFF:
+                raise ValueError(f"Value of {name!r} does not fit 32 bits: {value!r}")
+            items.append((str(name).encode(), value))
+        items.sort()
+        values = array(UINT32_TYPECODE, [value for _, value in items])
+        ends, end = array(UINT32_TYPECODE), 0
+        for name, _ in items:
+            end += len(name)
+            ends.append(end)
+        blob = b"".join(name for name, _ in items)
+        data = [_tobytes(values, swap), _tobytes(ends, swap), blob]
+        return _NAMES, b"I", len(items), data
+
+    if isinstance(table, ColorArray):
+        table = table.data
+    if not isinstance(table, array):
+        table = array(UINT32_TYPECODE, map(_pack, table))
+
+    if table.typecode in ("B", "H", "d"):
+        code = table.typecode.encode()
+    elif table.typecode in ("I", "L") and table.itemsize == 4:
+        code = b"I"
+    else:
+        raise ValueError(f"Unsupported array typecode: {table.typecode!r}")
+    return _ARRAY, code, len(table), [_tobytes(table, swap)]
+
+
+def write_tables(
+    path: PATH_TYPE,
+    tables: Mapping[str, TABLE_TYPE],
+    *,
+    byteorder: BYTEORDER_TYPE = "little",
+) -> None:
+    """
+    Write ``tables`` into a table file at ``path``, with items in
+    ``byteorder``
+
+    Every table is one of:
+
+    - a mapping of names to colors, stored as a name index: ints are kept as
+      they are (such as the 0xRR_GG_BB values of
+      :data:`color.vars.NAMES_COLORS`), :class:`RGB` / :class:`RGBA` values
+      are packed into 0xRR_GG_BB_AA
+    - an ``array`` of typecode ``B``, ``H``, ``d`` or unsigned 32-bit items,
+      or a :class:`ColorArray`, stored as is
+    - any other iterable of colors, stored as packed 0xRR_GG_BB_AA values
+    """
+    _check_byteorder(byteorder)
+    sections = []
+    for name, table in tables.items():
+        kind, code, count, parts = _encode(table, byteorder != sys.byteorder)
+        sections.append((name.encode(), kind, code, count, parts))
+
+    offset = _HEADER.size + sum(_ENTRY.size + len(x[0]) for x in sections)
+    directory = []
+    for name, kind, code, count, parts in sections:
+        offset += -offset % _ALIGN
+        directory.append(_ENTRY.pack(len(name), kind, code, offset, count) + name)
+        offset += sum(map(len, parts))
+
+    with open(path, "wb") as file:
+        file.write(
+            _HEADER.pack(_MAGIC, _VERSION, _BYTEORDERS[byteorder], len(sections))
+        )
+        file.writelines(directory)
+        for _, _, _, _, parts in sections:
+            file.write(bytes(-file.tell() % _ALIGN))
+            file.writelines(parts)
+
+
+def _items(view: memoryview, code: bytes, swap: bool) -> Union[memoryview, array]:
+    typecode = _TYPECODES[code]
+    if not swap or code == b"B":
+        return view.cast(typecode)
+    items = array(typecode, view.tobytes())
+    items.byteswap()
+    return items
+
+
+def _section_end(
+    data: mmap.mmap, kind: int, code: bytes, offset: int, count: int, byteorder: int
+) -> int:
+    if kind == _ARRAY:
+        return offset + count * array(_TYPECODES[code]).itemsize
+    end = offset + 8 * count
+    if not count or end > len(data):
+        return end
+    # the names follow the values and their ends, up to the last end
+    (size,) = struct.unpack_from(">I" if byteorder else "<I", data, end - 4)
+    return end + size
+
+
+class NameTable(Mapping):
+    """
+    Read-only mapping of names to values backed by a :class:`TableFile`
+
+    Lookups are binary searches over the sorted names, nothing is decoded
+    until it is asked for.
+    """
+
+    __slots__ = ("_values", "_ends", "_names")
+
+    def __init__(self, values: Any, ends: Any, names: memoryview) -> None:
+        self._values = values
+        self._ends = ends
+        self._names = names
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} names={len(self)}>"
+
+    def _name(self, index: int) -> bytes:
+        start = self._ends[index - 1] if index else 0
+        return self._names[start : self._ends[index]].tobytes()
+
+    def __getitem__(self, name: str) -> int:
+        key = name.encode() if isinstance(name, str) else None
+        low, high = 0, len(self._values)
+        while key is not None and low < high:
+            middle = (low + high) // 2
+            if self._name(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if key is None or low == len(self._values) or self._name(low) != key:
+            raise KeyError(name)
+        return self._values[low]
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._name(i).decode() for i in range(len(self._values)))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class TableFile(Mapping):
+    """
+    A memory-mapped table file written by :func:`write_tables`
+
+    Map section names to their tables: arrays are returned as typed
+    ``memoryview``s over the file, name indexes as :class:`NameTable`s.
+    Views outlive :meth:`close`, the mapping goes away with the last one.
+    """
+
+    __slots__ = ("path", "_file", "_mmap", "_sections", "_swap")
+
+    def __init__(self, path: PATH_TYPE) -> None:
+        self.path = os.fspath(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Not a table file: {self.path!r}") from None
+
+        try:
+            self._sections = self._read_directory()
+        except (ValueError, struct.error):
+            self.close()
+            raise ValueError(f"Not a table file: {self.path!r}") from None
+
+    def _read_directory(self) -> dict[str, tuple[int, bytes, int, int]]:
+        data = self._mmap
+        magic, version, byteorder, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError
+        self._swap = byteorder != _BYTEORDERS[sys.byteorder]
+
+        sections, position = {}, _HEADER.size
+        for _ in range(count):
+            size, kind, code, offset, items = _ENTRY.unpack_from(data, position)
+            position += _ENTRY.size
+            name = data[position : position + size].decode()
+            position += size
+            if code not in _TYPECODES or kind not in (_ARRAY, _NAMES):
+                raise ValueError
+            if _section_end(data, kind, code, offset, items, byteorder) > len(data):
+                # truncated or corrupt file
+                raise ValueError
+            sections[name] = (kind, code, offset, items)
+        return sections
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.path!r} tables={len(self)}>"
+
+    def __enter__(self) -> "TableFile":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap and close the file"""
+        try:
+            self._mmap.close()
+        except BufferError:
+            # views are still in use, unmapped when the last one is released
+            pass
+        self._file.close()
+
+    def __getitem__(self, name: str) -> Union[memoryview, array, NameTable]:
+        kind, code, offset, count = self._sections[name]
+        view = memoryview(self._mmap)
+        if kind == _ARRAY:
+            size = array(_TYPECODES[code]).itemsize
+            return _items(view[offset : offset + count * size], code, self._swap)
+
+        end = offset + 4 * count
+        ends = _items(view[end : end + 4 * count], code, self._swap)
+        names_end = end + 4 * count + (ends[-1] if count else 0)
+        return NameTable(
+            _items(view[offset:end], code, self._swap),
+            ends,
+            view[end + 4 * count : names_end],
+        )
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._sections
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+
+    def __len__(self) -> int:
+        return len(self._sections)
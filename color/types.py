@@ -1,9 +1,16 @@
+import sys
 from abc import ABCMeta, abstractmethod
-from typing import Any, Callable, ClassVar, Iterable, Union, overload
+from typing import Any, Callable, ClassVar, Iterable, Optional, Union, overload
+from weakref import WeakValueDictionary
 
-from typing_extensions import Self
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
 
-from ._utils import MISSING, get_bytes
+from ._format import CSS_FORMAT_TYPE, format_css, format_hex, format_hsl
+from ._utils import MISSING
+from .convert import _hsl_to_rgb
 
 __all__ = (
     "RED_TYPE",
@@ -20,9 +27,15 @@ __all__ = (
     "Lightness",
     "RGB",
     "RGBA",
+    "FrozenRGB",
+    "FrozenRGBA",
     "HSL",
     "HSV",
     "YUV",
+    "XYZ",
+    "Lab",
+    "OKLab",
+    "OKLCH",
 )
 
 RED_TYPE = Union[int, float, "Red"]
@@ -66,12 +79,21 @@ class _PercentValue(int):
     def __new__(cls, __x: int | float) -> Self:
         return super().__new__(
             cls,
-            int(min(cls.max, __x * cls.max if isinstance(__x, float) else __x)),
+            int(
+                max(0, min(cls.max, __x * cls.max if isinstance(__x, float) else __x))
+            ),
         )
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} {self:g}>"
 
+    @classmethod
+    def _to_int(cls, __x: int | float) -> int:
+        """Return the plain int value, skipping the conversion of in range ints"""
+        if __x.__class__ is int and 0 <= __x <= cls.max:
+            return __x
+        return int(cls(__x))
+
 
 class Red(_PercentValue):
     """
@@ -118,36 +140,70 @@ class _IntColorTupleMeta(ABCMeta):
     def __new__(cls, *args, **kwargs):
         new_class = super().__new__(cls, *args, **kwargs)
 
+        # walk the MRO so subclasses keep the properties of their bases
+        properties: dict[str, property] = {}
+        for klass in reversed(new_class.__mro__):
+            properties.update(
+                (name, value)
+                for name, value in klass.__dict__.items()
+                if isinstance(value, property)
+            )
+
         new_class.__getattr_func__ = {
             name: value.fget
-            for name, value in new_class.__dict__.items()
+            for name, value in properties.items()
             # has is property.getter
-            if isinstance(value, property) and value.fget
+            if value.fget
         }
         new_class.__setattr_func__ = {
             name: value.fset
-            for name, value in new_class.__dict__.items()
+            for name, value in properties.items()
             # has is property.setter
-            if isinstance(value, property) and value.fset
+            if value.fset
         }
 
         return new_class
 
 
 class _IntColorTuple(Iterable, metaclass=_IntColorTupleMeta):
+    """
+    Channels packed into a single int (first channel in the most significant
+    byte), 8 bits per channel
+    """
+
+    __slots__ = ("_value",)
     __getattr_func__: ClassVar[dict[str, Callable[[Self], None]]]
     __setattr_func__: ClassVar[dict[str, Callable[[Self, Any], None]]]
+    # channel types, used to normalize the values before packing
+    __channels__: ClassVar[tuple[type[_PercentValue], ...]] = ()
 
-    def __init__(self, value: Iterable[Any]) -> None:
-        self._data = []
+    _value: int
 
-        if isinstance(value, _IntColorTuple):
-            self._data = value._data
+    def __init__(self, value: Iterable[Any]) -> None:
+        if isinstance(value, self.__class__):
+            self._value = value._value
         elif isinstance(value, Iterable):
-            self._data = list(value)
+            self._value = self._pack(value)
         else:
             raise ValueError("Invalid value")
 
+    @classmethod
+    def _pack(cls, values: Iterable[Any]) -> int:
+        values = tuple(values)
+        if len(values) != len(cls.__channels__):
+            raise ValueError(f"Iterable must have {len(cls.__channels__)} items")
+
+        result = 0
+        for channel, value in zip(cls.__channels__, values):
+            result = (result << 8) | channel._to_int(value)
+        return result
+
+    def _shift(self, i: int) -> int:
+        size = len(self.__channels__)
+        if i < -size or i >= size:
+            raise IndexError("Channel index out of range")
+        return ((size - 1 - i) % size) * 8
+
     @abstractmethod
     def to_int(cls) -> int:
         raise NotImplementedError
@@ -155,7 +211,11 @@ class _IntColorTuple(Iterable, metaclass=_IntColorTupleMeta):
     def __parse_int(self, value: Any) -> int:
         if isinstance(value, (int, float)):
             return int(value)
-        elif isinstance(value, self.__class__):
+        # same channels, e.g. RGB and FrozenRGB
+        elif (
+            isinstance(value, _IntColorTuple)
+            and value.__channels__ == self.__channels__
+        ):
             return value.to_int()
 
         raise ValueError(f"Invalid value: {value}")
@@ -222,27 +282,44 @@ class _IntColorTuple(Iterable, metaclass=_IntColorTupleMeta):
         return +self ^ self.__parse_int(__value)
 
     def __contains__(self, item: Any):
-        return item in self._data
+        return item in tuple(self)
 
     def __len__(self):
-        return len(self._data)
+        return len(self.__channels__)
 
     def __getitem__(self, i: Any):
+        if isinstance(i, int):
+            return (self._value >> self._shift(i)) & 0xFF
+        if isinstance(i, slice):
+            return tuple(self)[i]
         if func := self.__getattr_func__.get(i):
             return func(self)
-        return self._data[i]
+        raise KeyError(i)
 
     def __setitem__(self, i: Any, value: Any):
-        if func := self.__setattr_func__.get(i):
-            func(self, value)
-            return
-        self._data[i] = value
+        if not isinstance(i, int):
+            if func := self.__setattr_func__.get(i):
+                func(self, value)
+                return
+            raise KeyError(i)
+
+        shift = self._shift(i)
+        channel = self.__channels__[len(self) - 1 - shift // 8]
+        self._value = (self._value & ~(0xFF << shift)) | (
+            channel._to_int(value) << shift
+        )
 
     def __iter__(self):
-        return iter(self._data)
+        value = self._value
+        return iter(
+            [(value >> shift) & 0xFF for shift in range(len(self) * 8 - 8, -8, -8)]
+        )
 
 
 class RGB(_IntColorTuple):
+    __slots__ = ()
+    __channels__ = (Red, Green, Blue)
+
     # fmt: off
     @overload
     def __init__(cls, r: RED_TYPE, g: GREEN_TYPE, b: BLUE_TYPE) -> Self: ... # noqa
@@ -257,61 +334,90 @@ class RGB(_IntColorTuple):
     # fmt: on
 
     def __init__(self, r=MISSING, g=MISSING, b=MISSING) -> Self:
-        # parse value from RGBA
-        if isinstance(r, RGBA):
-            r, g, b, _ = r
-        # parse iterable -> (r, g, b) or RGB
-        elif isinstance(r, Iterable):
-            if len(r) != 3:
-                raise ValueError("Iterable must have 3 items")
-            r, g, b = r
-        # parse value -> 0xff_ff_ff
-        elif isinstance(r, int) and g is MISSING and b is MISSING:
-            if r < 0 or r > 0xFFFFFF:
-                raise ValueError("Value must be between 0 and 0xFFFFFF")
-            r, g, b = get_bytes(r, 2), get_bytes(r, 1), get_bytes(r)
+        if g is MISSING and b is MISSING:
+            # parse value -> 0xff_ff_ff
+            if isinstance(r, int):
+                if r < 0 or r > 0xFFFFFF:
+                    raise ValueError("Value must be between 0 and 0xFFFFFF")
+                self._value = r
+                return
+            # copy value from RGB
+            elif isinstance(r, RGB):
+                self._value = r._value
+                return
+            # parse value from RGBA
+            elif isinstance(r, RGBA):
+                self._value = r._value >> 8
+                return
+            # parse iterable -> (r, g, b)
+            elif isinstance(r, Iterable):
+                if len(r) != 3:
+                    raise ValueError("Iterable must have 3 items")
+                r, g, b = r
+
         # raise error if missing value
-        elif r is MISSING or g is MISSING or b is MISSING:
+        if r is MISSING or g is MISSING or b is MISSING:
             raise ValueError("Missing value")
 
-        return super().__init__((r, g, b))
+        self._value = (
+            (Red._to_int(r) << 16) | (Green._to_int(g) << 8) | Blue._to_int(b)
+        )
 
     def __repr__(self) -> str:
-        return f"<{self.__class__.__name__} r={self.r:g} g={self.g:g} b={self.g:g}>"
+        value = self._value
+        return (
+            f"<{self.__class__.__name__} r={value >> 16} "
+            f"g={(value >> 8) & 0xFF} b={value & 0xFF}>"
+        )
 
     @property
-    def r(self) -> Red:
-        """Return the blue value using a :class:`Red` instance"""
-        return Red(self[0])
+    def r(self) -> int:
+        """Return the red value"""
+        return self._value >> 16
 
     @r.setter
-    def r(self, value: RED_TYPE) -> Red:
+    def r(self, value: RED_TYPE) -> None:
         self[0] = value
 
     @property
-    def g(self) -> Green:
-        """Return the blue value using a :class:`Green` instance"""
-        return Green(self[1])
+    def g(self) -> int:
+        """Return the green value"""
+        return (self._value >> 8) & 0xFF
 
     @g.setter
-    def g(self, value: GREEN_TYPE) -> Green:
+    def g(self, value: GREEN_TYPE) -> None:
         self[1] = value
 
     @property
-    def b(self) -> Blue:
-        """Return the blue value using a :class:`Blue` instance"""
-        return Blue(self[2])
+    def b(self) -> int:
+        """Return the blue value"""
+        return self._value & 0xFF
 
     @b.setter
-    def b(self, value: BLUE_TYPE) -> Blue:
+    def b(self, value: BLUE_TYPE) -> None:
         self[2] = value
 
     def to_int(self) -> int:
         """Return the integer value"""
-        return (self.r << 16) + (self.g << 8) + self.b
+        return self._value
+
+    def to_hex(self, *, short: bool = False) -> str:
+        """Return ``#rrggbb``, or ``#rgb`` with ``short`` when possible"""
+        return format_hex((self._value << 8) | 0xFF, False, short)
+
+    def to_css(self, fmt: CSS_FORMAT_TYPE = "hex") -> str:
+        """Return a CSS color string, see :data:`color.serialize.CSS_FORMATS`"""
+        return format_css((self._value << 8) | 0xFF, fmt)
+
+    def freeze(self) -> "FrozenRGB":
+        """Return an immutable, hashable copy"""
+        return FrozenRGB(self)
 
 
 class RGBA(_IntColorTuple):
+    __slots__ = ()
+    __channels__ = (Red, Green, Blue, Alpha)
+
     # fmt: off
     @overload
     def __init__(cls, r: RED_TYPE, g: GREEN_TYPE, b: BLUE_TYPE, a: ALPHA_TYPE) -> Self: ... # noqa
@@ -326,62 +432,78 @@ class RGBA(_IntColorTuple):
     # fmt: on
 
     def __init__(cls, r=MISSING, g=MISSING, b=MISSING, a=MISSING) -> Self:
-        # parse value from RGB
-        if isinstance(r, RGB):
-            r, g, b, a = *r, 0xFF
-        # parse iterable -> (r, g, b, a) or RGBA
-        elif isinstance(r, Iterable):
-            if len(r) != 4:
-                raise ValueError("Iterable must have 4 items")
-            r, g, b, a = r
-        # parse value -> 0xff_ff_ff_ff
-        elif isinstance(r, int) and g is MISSING and b is MISSING and a is MISSING:
-            if r < 0 or r > 0xFFFFFFFF:
-                raise ValueError("Value must be between 0 and 0xFFFFFFFF")
-            r, g, b, a = *RGB(r >> 8), get_bytes(r)
+        if g is MISSING and b is MISSING:
+            # parse value -> 0xff_ff_ff_ff
+            if isinstance(r, int) and a is MISSING:
+                if r < 0 or r > 0xFFFFFFFF:
+                    raise ValueError("Value must be between 0 and 0xFFFFFFFF")
+                cls._value = r
+                return
+            # copy value from RGBA
+            elif isinstance(r, RGBA):
+                cls._value = r._value
+                return
+            # parse value from RGB
+            elif isinstance(r, RGB):
+                cls._value = (r._value << 8) | (
+                    0xFF if a is MISSING else Alpha._to_int(a)
+                )
+                return
+            # parse iterable -> (r, g, b, a)
+            elif isinstance(r, Iterable):
+                if len(r) != 4:
+                    raise ValueError("Iterable must have 4 items")
+                r, g, b, a = r
+
         # raise error if missing value
-        elif r is MISSING or g is MISSING or b is MISSING or a is MISSING:
+        if r is MISSING or g is MISSING or b is MISSING or a is MISSING:
             raise ValueError("Missing value")
 
-        return super().__init__((r, g, b, a))
+        cls._value = (
+            (Red._to_int(r) << 24)
+            | (Green._to_int(g) << 16)
+            | (Blue._to_int(b) << 8)
+            | Alpha._to_int(a)
+        )
 
     def __repr__(self) -> str:
+        value = self._value
         return (
-            f"<{self.__class__.__name__} r={self.r:g} "
-            f"g={self.g:g} b={self.g:g} a={self.a:g}>"
+            f"<{self.__class__.__name__} r={value >> 24} g={(value >> 16) & 0xFF} "
+            f"b={(value >> 8) & 0xFF} a={value & 0xFF}>"
         )
 
     @property
-    def r(self) -> Red:
-        """Return the blue value using a :class:`Red` instance"""
-        return Red(self[0])
+    def r(self) -> int:
+        """Return the red value"""
+        return self._value >> 24
 
     @r.setter
     def r(self, value: RED_TYPE) -> None:
         self[0] = value
 
     @property
-    def g(self) -> Green:
-        """Return the blue value using a :class:`Green` instance"""
-        return Green(self[1])
+    def g(self) -> int:
+        """Return the green value"""
+        return (self._value >> 16) & 0xFF
 
     @g.setter
     def g(self, value: GREEN_TYPE) -> None:
         self[1] = value
 
     @property
-    def b(self) -> Blue:
-        """Return the blue value using a :class:`Blue` instance"""
-        return Blue(self[2])
+    def b(self) -> int:
+        """Return the blue value"""
+        return (self._value >> 8) & 0xFF
 
     @b.setter
     def b(self, value: BLUE_TYPE) -> None:
         self[2] = value
 
     @property
-    def a(self) -> Alpha:
-        """Return the alpha value using a :class:`Alpha` instance"""
-        return Alpha(self[3])
+    def a(self) -> int:
+        """Return the alpha value"""
+        return self._value & 0xFF
 
     @a.setter
     def a(self, value: ALPHA_TYPE) -> None:
@@ -389,7 +511,66 @@ class RGBA(_IntColorTuple):
 
     def to_int(self) -> int:
         """Return the integer value"""
-        return (self.r << 24) + (self.g << 16) + (self.b << 8) + self.a
+        return self._value
+
+    def to_hex(self, *, alpha: Optional[bool] = None, short: bool = False) -> str:
+        """
+        Return ``#rrggbbaa``, or ``#rrggbb`` when ``alpha`` is false (or
+        ``None`` and the color is opaque); ``short`` writes ``#rgb(a)`` when
+        possible
+        """
+        return format_hex(self._value, alpha, short)
+
+    def to_css(self, fmt: CSS_FORMAT_TYPE = "hex") -> str:
+        """Return a CSS color string, see :data:`color.serialize.CSS_FORMATS`"""
+        return format_css(self._value, fmt)
+
+    def freeze(self) -> "FrozenRGBA":
+        """Return an immutable, hashable copy"""
+        return FrozenRGBA(self)
+
+
+class _FrozenIntColorTuple:
+    """Immutable colors, hashed by their packed integer value"""
+
+    __slots__ = ()
+    # interned instances, keyed by packed value
+    _pool: ClassVar[WeakValueDictionary]
+
+    def __setitem__(self, i: Any, value: Any):
+        raise TypeError(f"{self.__class__.__name__} is immutable")
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # the value is set once by __init__, calling it again must not change
+        # an instance that may be shared through the pool
+        if name == "_value" and hasattr(self, "_value"):
+            raise TypeError(f"{self.__class__.__name__} is immutable")
+        super().__setattr__(name, value)
+
+    def __hash__(self) -> int:
+        return hash(self._value)
+
+    def freeze(self) -> Self:
+        return self
+
+    @classmethod
+    def intern(cls, *args: Any, **kwargs: Any) -> Self:
+        """
+        Return the shared instance equal to ``cls(*args, **kwargs)``, it lives
+        as long as it is referenced somewhere
+        """
+        color = cls(*args, **kwargs)
+        return cls._pool.setdefault(color._value, color)
+
+
+class FrozenRGB(_FrozenIntColorTuple, RGB):
+    __slots__ = ("__weakref__",)
+    _pool = WeakValueDictionary()
+
+
+class FrozenRGBA(_FrozenIntColorTuple, RGBA):
+    __slots__ = ("__weakref__",)
+    _pool = WeakValueDictionary()
 
 
 class HSL(tuple):
@@ -430,6 +611,20 @@ class HSL(tuple):
         """Return the lightness value using a :class:`Lightness` instance"""
         return Lightness(self[2])
 
+    def _packed(self) -> int:
+        r, g, b = _hsl_to_rgb(*self)
+        return (r << 24) | (g << 16) | (b << 8) | 0xFF
+
+    def to_hex(self, *, short: bool = False) -> str:
+        """Return ``#rrggbb``, or ``#rgb`` with ``short`` when possible"""
+        return format_hex(self._packed(), False, short)
+
+    def to_css(self, fmt: CSS_FORMAT_TYPE = "hsl") -> str:
+        """Return a CSS color string, see :data:`color.serialize.CSS_FORMATS`"""
+        if fmt == "hsl":
+            return format_hsl(*self)
+        return format_css(self._packed(), fmt)
+
 
 class HSV(tuple):
     @overload
@@ -452,7 +647,7 @@ class HSV(tuple):
         return super().__new__(cls, (Hue(h), Saturation(s), min(v, 1)))
 
     def __repr__(self) -> str:
-        return f"<{self.__class__.__name__} h={self.h:g} s={self.s:g} l={self.v:g}>"
+        return f"<{self.__class__.__name__} h={self.h:g} s={self.s:g} v={self.v:g}>"
 
     @property
     def h(self) -> Hue:
@@ -507,3 +702,130 @@ class YUV(tuple):
     def v(self) -> float:
         """Return the v value"""
         return self[2]
+
+
+class XYZ(tuple):
+    """CIE 1931 XYZ (D65), Y = 1 for the white point"""
+
+    @overload
+    def __new__(cls, x: float, y: float, z: float) -> Self:
+        ...
+
+    @overload
+    def __new__(cls, d: tuple[float, float, float]) -> Self:
+        ...
+
+    def __new__(cls, x=MISSING, y=MISSING, z=MISSING) -> Self:
+        if isinstance(x, Iterable):
+            if len(x) != 3:
+                raise ValueError("Iterable must have 3 items")
+            x, y, z = x
+
+        if x is MISSING or y is MISSING or z is MISSING:
+            raise ValueError("Missing value")
+
+        return super().__new__(cls, (x, y, z))
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} x={self.x:g} y={self.y:g} z={self.z:g}>"
+
+    @property
+    def x(self) -> float:
+        """Return the x value"""
+        return self[0]
+
+    @property
+    def y(self) -> float:
+        """Return the y value"""
+        return self[1]
+
+    @property
+    def z(self) -> float:
+        """Return the z value"""
+        return self[2]
+
+
+class Lab(tuple):
+    """CIE L*a*b* (D65), L in 0~100"""
+
+    @overload
+    def __new__(cls, l: float, a: float, b: float) -> Self:
+        ...
+
+    @overload
+    def __new__(cls, d: tuple[float, float, float]) -> Self:
+        ...
+
+    def __new__(cls, l=MISSING, a=MISSING, b=MISSING) -> Self:
+        if isinstance(l, Iterable):
+            if len(l) != 3:
+                raise ValueError("Iterable must have 3 items")
+            l, a, b = l
+
+        if l is MISSING or a is MISSING or b is MISSING:
+            raise ValueError("Missing value")
+
+        return super().__new__(cls, (l, a, b))
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} l={self.l:g} a={self.a:g} b={self.b:g}>"
+
+    @property
+    def l(self) -> float:
+        """Return the lightness value"""
+        return self[0]
+
+    @property
+    def a(self) -> float:
+        """Return the green-red value"""
+        return self[1]
+
+    @property
+    def b(self) -> float:
+        """Return the blue-yellow value"""
+        return self[2]
+
+
+class OKLab(Lab):
+    """Oklab, L in 0~1"""
+
+
+class OKLCH(tuple):
+    """Oklab in polar form, L in 0~1 and hue in degrees"""
+
+    @overload
+    def __new__(cls, l: float, c: float, h: float) -> Self:
+        ...
+
+    @overload
+    def __new__(cls, d: tuple[float, float, float]) -> Self:
+        ...
+
+    def __new__(cls, l=MISSING, c=MISSING, h=MISSING) -> Self:
+        if isinstance(l, Iterable):
+            if len(l) != 3:
+                raise ValueError("Iterable must have 3 items")
+            l, c, h = l
+
+        if l is MISSING or c is MISSING or h is MISSING:
+            raise ValueError("Missing value")
+
+        return super().__new__(cls, (l, c, h))
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} l={self.l:g} c={self.c:g} h={self.h:g}>"
+
+    @property
+    def l(self) -> float:
+        """Return the lightness value"""
+        return self[0]
+
+    @property
+    def c(self) -> float:
+        """Return the chroma value"""
+        return self[1]
+
+    @property
+    def h(self) -> float:
+        """Return the hue value, in degrees"""
+        return self[2]
@@ -0,0 +1,33 @@
+from color.array import ColorArray
+from color.types import RGB, RGBA
+
+
+def test_ColorArray() -> None:
+    colors = ColorArray([0xFF_F0_0F_AA, RGBA(0x01_02_03_04), RGB(0x10_20_30)])
+
+    assert len(colors) == 3
+    assert colors[0] == 0xFF_F0_0F_AA
+    assert colors[2] == 0x10_20_30_FF
+    assert list(colors[1:].to_int()) == [0x01_02_03_04, 0x10_20_30_FF]
+    assert RGBA(0x01_02_03_04) in colors
+
+    assert list(colors.r) == [0xFF, 0x01, 0x10]
+    assert list(colors.g) == [0xF0, 0x02, 0x20]
+    assert list(colors.b) == [0x0F, 0x03, 0x30]
+    assert list(colors.a) == [0xAA, 0x04, 0xFF]
+
+    colors.a = 0x80
+    assert list(colors.a) == [0x80, 0x80, 0x80]
+    colors.r = [1, 2, 3]
+    assert list(colors.r) == [1, 2, 3]
+    assert colors[0] == 0x01_F0_0F_80
+
+    colors = ColorArray([0xFF_F0_0F_AA, 0x00_00_00_01])
+    assert (colors == 0xFF_F0_0F_AA) == [True, False]
+    assert (colors > 0x00_00_00_01) == [True, False]
+    assert (colors == [0xFF_F0_0F_AA, RGBA(0x00_00_00_01)]) == [True, True]
+    assert list((colors & 0xFF).to_int()) == [0xAA, 0x01]
+    assert list((colors | 0xFF).to_int()) == [0xFF_F0_0F_FF, 0xFF]
+    assert list((colors << 8).to_int()) == [0xF0_0F_AA_00, 0x00_00_01_00]
+    assert list((colors >> 24).to_int()) == [0xFF, 0x00]
+    assert list((~colors).to_int()) == [0x00_0F_F0_55, 0xFF_FF_FF_FE]
@@ -0,0 +1,73 @@
+import struct
+
+from color.array import ColorArray
+from color.buffer import decode_buffer, encode_buffer, iter_buffer
+from color.color import Color
+
+
+def test_buffer() -> None:
+    data = bytes((0x12, 0x34, 0x56, 0x78, 0x9A, 0xBC))
+
+    assert list(iter_buffer(data, "rgb888")) == [0x12_34_56_FF, 0x78_9A_BC_FF]
+    assert list(iter_buffer(data, "bgr888")) == [0x56_34_12_FF, 0xBC_9A_78_FF]
+    assert list(iter_buffer(data[:4], "rgba8888")) == [0x12_34_56_78]
+    for fmt in ("rgb888", "bgr888", "rgb565", "rgb555"):
+        assert list(decode_buffer(data, fmt)) == list(iter_buffer(data, fmt))
+    assert list(decode_buffer(memoryview(data)[:4])) == [0x12_34_56_78]
+
+    words = bytes((0x1F, 0xF8, 0xE0, 0x07))
+    assert list(decode_buffer(words, "rgb565")) == [0xFF_00_FF_FF, 0x00_FF_00_FF]
+    assert list(decode_buffer(words[::-1], "rgb565", byteorder="big")) == [
+        0x00_FF_00_FF,
+        0xFF_00_FF_FF,
+    ]
+    assert list(decode_buffer(bytes((0xFF, 0x7F)), "rgb555")) == [0xFF_FF_FF_FF]
+
+    assert list(Color.iter_from_buffer(bytearray(data), "rgb888")) == [
+        0x12_34_56_FF,
+        0x78_9A_BC_FF,
+    ]
+    assert list(ColorArray.from_buffer(data, "rgb888").r) == [0x12, 0x78]
+
+
+def test_rgb565() -> None:
+    assert Color.from_rgb565(0xFFFF) == 0xFF_FF_FF_FF
+    assert Color.from_rgb565(0xF800) == 0xFF_00_00_FF
+    assert Color.from_rgb555(0x7C00) == 0xFF_00_00_FF
+    assert Color.from_rgb555(0x03E0) == 0x00_FF_00_FF
+
+    for value in range(0, 0x10000, 7):
+        assert Color.from_rgb565(value).to_rgb565() == value
+    for value in range(0, 0x8000, 7):
+        assert Color.from_rgb555(value).to_rgb555() == value
+
+    assert Color.from_rgb(0x80_80_80).to_rgb565() == 0x8410
+    # ordered dithering keeps the average close to the original value
+    gray = Color.from_rgb(0x84_84_84)
+    average = sum(
+        Color.from_rgb565(gray.to_rgb565(dither=True, x=x, y=y)).r
+        for x in range(4)
+        for y in range(4)
+    )
+    assert abs(average / 16 - 0x84) < 1
+
+    colors = ColorArray([0xFF_00_00_FF, 0x00_FF_00_FF, 0x00_00_FF_FF, gray] * 2)
+    for fmt in ("rgb888", "bgr888", "rgba8888"):
+        assert colors.to_buffer(fmt) == bytes(
+            encode_buffer(decode_buffer(colors.to_buffer(fmt), fmt), fmt)
+        )
+        assert list(decode_buffer(colors.to_buffer(fmt), fmt)) == list(colors.data)
+    for byteorder in ("little", "big"):
+        data = colors.to_buffer("rgb565", byteorder=byteorder)
+        assert list(decode_buffer(data, "rgb565", byteorder=byteorder)) == [
+            0xFF_00_00_FF,
+            0x00_FF_00_FF,
+            0x00_00_FF_FF,
+            Color.from_rgb565(gray.to_rgb565()),
+        ] * 2
+
+    data = colors.to_buffer("rgb565", dither=True, width=4)
+    assert [x for x, in struct.iter_unpack("<H", data)] == [
+        color.to_rgb565(dither=True, x=i % 4, y=i // 4)
+        for i, color in enumerate(map(Color, colors.data))
+    ]
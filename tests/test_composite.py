@@ -0,0 +1,86 @@
+import random
+from array import array
+
+import pytest
+
+from color._utils import UINT32_TYPECODE
+from color.array import ColorArray
+from color.color import Color
+from color.composite import (
+    BLEND_MODES,
+    blend,
+    composite_buffer,
+    over,
+    premultiply,
+    premultiply_buffer,
+    unpremultiply,
+    unpremultiply_buffer,
+)
+from color.types import RGBA
+
+
+def test_composite() -> None:
+    assert premultiply(0xFF_80_40_80) == 0x80_40_20_80
+    assert premultiply(0xFF_FF_FF_00) == 0
+    assert unpremultiply(0x80_40_20_80) == 0xFF_80_40_80
+    assert unpremultiply(0) == 0
+    for value in range(0, 0x100_00_00_00, 0x01_03_05_07):
+        a = value & 0xFF
+        if a:
+            # a round trip loses at most 255 / a / 2 per channel
+            restored = unpremultiply(premultiply(value))
+            for shift in (24, 16, 8):
+                diff = ((restored >> shift) & 0xFF) - ((value >> shift) & 0xFF)
+                assert abs(diff) <= 0xFF / a / 2 + 1
+
+    red, blue = 0xFF_00_00_FF, 0x00_00_FF_FF
+    assert over(red, blue) == red
+    assert over(0xFF_00_00_00, blue) == blue
+    assert over(0xFF_00_00_80, blue) == 0x80_00_7F_FF
+    assert over(0xFF_00_00_80, 0x00_00_FF_80) == 0xAA_00_55_C0
+    assert over(RGBA(0, 0, 0, 0), RGBA(0, 0, 0, 0)) == 0
+
+    assert blend(0x80_80_80_FF, 0xFF_40_00_FF, "multiply") == 0x80_20_00_FF
+    assert blend(0x80_80_80_FF, 0xFF_40_00_FF, "screen") == 0xFF_A0_80_FF
+    assert blend(0x80_80_80_FF, 0xFF_40_00_FF, "overlay") == 0xFF_40_00_FF
+    # blending over a transparent backdrop keeps the source
+    assert blend(0x12_34_56_FF, 0xFF_FF_FF_00, "multiply") == 0x12_34_56_FF
+
+    color = Color(0xFF, 0x80, 0x40, 0x80)
+    assert isinstance(color.premultiply(), Color)
+    assert color.premultiply() == 0x80_40_20_80
+    assert color.premultiply().unpremultiply() == color
+    assert color.over(blue) == over(color, blue)
+    assert color.blend(blue, "screen") == blend(color, blue, "screen")
+
+    with pytest.raises(ValueError):
+        blend(red, blue, "darken")  # type: ignore
+
+
+def test_composite_buffer() -> None:
+    rng = random.Random(17)
+    source = array(UINT32_TYPECODE, (rng.getrandbits(32) for _ in range(3000)))
+    backdrop = array(UINT32_TYPECODE, (rng.getrandbits(32) for _ in range(3000)))
+    opaque = array(UINT32_TYPECODE, (x | 0xFF for x in backdrop))
+
+    for mode in BLEND_MODES:
+        for dst in (backdrop, opaque):
+            result = composite_buffer(source, dst, mode)
+            assert isinstance(result, array)
+            assert list(result) == [blend(s, d, mode) for s, d in zip(source, dst)]
+    assert list(composite_buffer(opaque, backdrop)) == list(opaque)
+
+    assert list(premultiply_buffer(ColorArray(source))) == list(
+        map(premultiply, source)
+    )
+    assert list(unpremultiply_buffer(source)) == list(map(unpremultiply, source))
+
+    # raw rgba8888 buffers in, bytes out
+    raw = bytes((0xFF, 0x80, 0x40, 0x80))
+    assert premultiply_buffer(bytearray(raw)) == bytes((0x80, 0x40, 0x20, 0x80))
+    assert composite_buffer(raw, bytes((0, 0, 0xFF, 0xFF))) == over(
+        0xFF_80_40_80, 0x00_00_FF_FF
+    ).to_bytes(4, "big")
+
+    with pytest.raises(ValueError):
+        composite_buffer(source, backdrop[:10])
@@ -0,0 +1,147 @@
+from color.color import Color
+from color.convert import (
+    YUV_BT470,
+    YUV_BT601,
+    YUV_BT709,
+    YUV_BT2020,
+    YUVStandard,
+    hsl_to_rgb,
+    lab_to_rgb,
+    oklab_to_rgb,
+    oklch_to_rgb,
+    hsv_to_rgb,
+    rgb_to_hsl,
+    rgb_to_hsv,
+    rgb_to_lab,
+    rgb_to_oklab,
+    rgb_to_oklch,
+    rgb_to_xyz,
+    rgb_to_ycbcr,
+    rgb_to_yuv,
+    ycbcr_to_rgb,
+    xyz_to_rgb,
+    yuv_to_rgb,
+)
+
+PIXELS = [
+    (0, 0, 0),
+    (255, 255, 255),
+    (255, 0, 0),
+    (0, 255, 0),
+    (0, 0, 255),
+    (255, 240, 15),
+    (18, 52, 86),
+    (200, 100, 50),
+]
+
+
+def test_HSL() -> None:
+    assert rgb_to_hsl([(255, 0, 0), (0, 0, 0, 7)]) == [(0, 1, 0.5), (0, 0, 0, 7)]
+    assert rgb_to_hsl([(0, 0, 255)]) == [(240, 1, 0.5)]
+    assert hsl_to_rgb(rgb_to_hsl(PIXELS)) == PIXELS
+
+
+def test_HSV() -> None:
+    assert rgb_to_hsv([(0, 255, 0, 1)]) == [(120, 1, 1, 1)]
+    assert hsv_to_rgb(rgb_to_hsv(PIXELS)) == PIXELS
+
+
+def test_YUV() -> None:
+    ((y, u, v),) = rgb_to_yuv([(255, 255, 255)])
+    assert round(y, 9) == 1 and round(u, 9) == 0 and round(v, 9) == 0
+    assert yuv_to_rgb(rgb_to_yuv(PIXELS)) == PIXELS
+
+    assert Color.from_yuv(*rgb_to_yuv([(18, 52, 86)])[0]) == 0x12_34_56_FF
+    for standard in (YUV_BT470, YUV_BT601, YUV_BT709, YUV_BT2020):
+        assert yuv_to_rgb(rgb_to_yuv(PIXELS, standard), standard) == PIXELS
+        color = Color.from_rgb(0x12_34_56)
+        assert Color.from_yuv(*color.to_yuv(standard=standard), standard=standard) == (
+            color
+        )
+
+
+def test_YCbCr() -> None:
+    assert rgb_to_ycbcr([(255, 255, 255), (0, 0, 0), (255, 0, 0)]) == [
+        (235, 128, 128),
+        (16, 128, 128),
+        (81, 90, 240),
+    ]
+    full = YUVStandard(0.299, 0.114, full_range=True)
+    assert rgb_to_ycbcr([(255, 255, 255), (255, 0, 0)], full) == [
+        (255, 128, 128),
+        (76, 85, 255),
+    ]
+    for standard in (YUV_BT601, YUV_BT709, YUV_BT2020, full):
+        for pixel, result in zip(
+            PIXELS, ycbcr_to_rgb(rgb_to_ycbcr(PIXELS, standard), standard)
+        ):
+            assert max(abs(a - b) for a, b in zip(pixel, result)) <= 2
+
+
+def test_perceptual() -> None:
+    def rounded(rows, digits=4):
+        return [tuple(round(x, digits) for x in row) for row in rows]
+
+    assert rounded(rgb_to_xyz([(255, 255, 255)])) == [(0.9505, 1.0, 1.0888)]
+    assert rounded(rgb_to_lab([(255, 255, 255), (255, 0, 0)]), 2) == [
+        (100.0, -0.0, 0.0),
+        (53.24, 80.09, 67.2),
+    ]
+    assert rounded(rgb_to_oklab([(255, 255, 255), (255, 0, 0)])) == [
+        (1.0, 0.0, 0.0),
+        (0.628, 0.2249, 0.1258),
+    ]
+    assert rounded(rgb_to_oklch([(255, 0, 0, 7)]), 2) == [(0.63, 0.26, 29.23, 7)]
+
+    for forward, backward in (
+        (rgb_to_xyz, xyz_to_rgb),
+        (rgb_to_lab, lab_to_rgb),
+        (rgb_to_oklab, oklab_to_rgb),
+        (rgb_to_oklch, oklch_to_rgb),
+    ):
+        assert backward(forward(PIXELS)) == PIXELS
+
+    color = Color.from_rgb(0xFF_00_00)
+    assert color.to_lab() == rgb_to_lab([(255, 0, 0)])[0]
+    assert color.to_oklab().l == color.to_oklch().l
+    assert color.to_xyz().y == rgb_to_xyz([(255, 0, 0)])[0][1]
+
+
+def test_numpy() -> None:
+    try:
+        import numpy as np
+    except ImportError:
+        return
+
+    array = np.array(PIXELS)
+    for forward, backward in (
+        (rgb_to_hsl, hsl_to_rgb),
+        (rgb_to_hsv, hsv_to_rgb),
+        (rgb_to_yuv, yuv_to_rgb),
+    ):
+        assert forward(array).tolist() == [list(x) for x in forward(PIXELS)]
+        assert backward(forward(array)).tolist() == [list(x) for x in PIXELS]
+        assert backward(forward(array)).dtype == np.uint8
+
+    # the alpha column follows the dtype of the converted channels
+    rgba = np.array([x + (0x80,) for x in PIXELS])
+    assert rgb_to_hsl(rgba).dtype == np.float64
+    assert hsl_to_rgb(rgb_to_hsl(rgba)).dtype == np.uint8
+    assert hsl_to_rgb(rgb_to_hsl(rgba)).tolist() == [list(x) for x in rgba]
+
+    # 8-bit Y'CbCr is lossy, compare with the scalar path instead
+    ycbcr = rgb_to_ycbcr(array)
+    assert ycbcr.tolist() == [list(x) for x in rgb_to_ycbcr(PIXELS)]
+    assert ycbcr_to_rgb(ycbcr).tolist() == [
+        list(x) for x in ycbcr_to_rgb(rgb_to_ycbcr(PIXELS))
+    ]
+
+    # pow / trigonometric functions may round differently
+    for forward, backward in (
+        (rgb_to_xyz, xyz_to_rgb),
+        (rgb_to_lab, lab_to_rgb),
+        (rgb_to_oklab, oklab_to_rgb),
+        (rgb_to_oklch, oklch_to_rgb),
+    ):
+        assert np.allclose(forward(array), forward(PIXELS), rtol=0, atol=1e-9)
+        assert backward(forward(array)).tolist() == [list(x) for x in PIXELS]
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from color.color import Color
+from color.convert import np
+from color.difference import DELTA_E_METHODS, delta_e, delta_e_lab, delta_e_matrix
+from color.types import RGB, RGBA
+
+
+def test_delta_e() -> None:
+    # Sharma, Wu & Dalal (2005) CIEDE2000 test data
+    for lab1, lab2, expected in (
+        ((50, 2.6772, -79.7751), (50, 0, -82.7485), 2.0425),
+        ((50, 0, 0), (50, -1, 2), 2.3669),
+        ((50, 2.5, 0), (73, 25, -18), 27.1492),
+        ((50, 2.5, 0), (50, 0, -2.5), 4.3065),
+        ((60.2574, -34.0099, 36.2677), (60.4626, -34.1751, 39.4387), 1.2644),
+        ((22.7233, 20.0904, -46.694), (23.0331, 14.973, -42.5619), 2.0373),
+    ):
+        assert delta_e_lab(lab1, lab2) == pytest.approx(expected, abs=1e-4)
+        assert delta_e_lab(lab2, lab1) == pytest.approx(expected, abs=1e-4)
+
+    assert delta_e_lab((50, 0, 0), (53, 4, 0), method="cie76") == 5
+    assert delta_e_lab((50, 0, 0), (50, 0, 0), method="cie94") == 0
+    # only chroma changes, weighted by 1 + 0.045 * C1
+    assert delta_e_lab((50, 10, 0), (50, 20, 0), method="cie94") == pytest.approx(
+        10 / 1.45
+    )
+
+    red = Color.from_rgb(0xFF_00_00)
+    assert red.delta_e(red) == 0
+    assert red.delta_e(0xFF_00_00_FF) == 0
+    assert red.delta_e(RGB(0, 0, 0xFF)) == delta_e(
+        0xFF_00_00_FF, (0, 0, 0xFF), method="ciede2000"
+    )
+    for method in DELTA_E_METHODS:
+        assert red.delta_e(RGBA(0xFE, 0, 0, 0xFF), method=method) < 1
+
+    with pytest.raises(ValueError):
+        delta_e(red, red, method="cmc")  # type: ignore
+
+
+def test_delta_e_matrix() -> None:
+    rng = random.Random(14)
+    a = [rng.getrandbits(32) for _ in range(50)]
+    b = [RGB(*(rng.randrange(256) for _ in range(3))) for _ in range(30)]
+
+    for method in DELTA_E_METHODS:
+        matrix = delta_e_matrix(a, b, method=method, chunk_size=16)
+        assert len(matrix) == len(a)
+        for i, x in enumerate(a):
+            for j, y in enumerate(b):
+                expected = delta_e(x, y, method=method)
+                assert matrix[i][j] == pytest.approx(expected, abs=1e-9)
+
+    if np is not None:
+        assert delta_e_matrix([], b).shape == (0, len(b))
+        assert delta_e_matrix(a, []).shape == (len(a), 0)
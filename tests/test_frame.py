@@ -0,0 +1,80 @@
+import pytest
+
+from color.convert import YUV_BT601, YUV_BT709
+from color.frame import decode_frame, frame_size, iter_frame_rows
+
+WIDTH, HEIGHT = 5, 3
+CHROMA_WIDTH, CHROMA_HEIGHT = 3, 2
+
+
+def make_frames(standard):
+    pixels = [
+        [((x * 50) % 256, (y * 90) % 256, (x * y * 30) % 256) for x in range(WIDTH)]
+        for y in range(HEIGHT)
+    ]
+    ycc = [[standard.encode(*pixel) for pixel in row] for row in pixels]
+
+    def chroma(x: int, y: int):
+        return ycc[y // 2 * 2][x // 2 * 2]
+
+    y_plane = bytes(ycc[y][x][0] for y in range(HEIGHT) for x in range(WIDTH))
+    u_plane = bytes(
+        chroma(2 * x, 2 * y)[1]
+        for y in range(CHROMA_HEIGHT)
+        for x in range(CHROMA_WIDTH)
+    )
+    v_plane = bytes(
+        chroma(2 * x, 2 * y)[2]
+        for y in range(CHROMA_HEIGHT)
+        for x in range(CHROMA_WIDTH)
+    )
+    uv_plane = bytes(b for pair in zip(u_plane, v_plane) for b in pair)
+    yuyv = bytes(
+        b
+        for y in range(HEIGHT)
+        for x in range(0, WIDTH, 2)
+        for b in (
+            ycc[y][x][0],
+            chroma(x, y)[1],
+            ycc[y][x + 1][0] if x + 1 < WIDTH else 0,
+            chroma(x, y)[2],
+        )
+    )
+    expected = bytes(
+        b
+        for y in range(HEIGHT)
+        for x in range(WIDTH)
+        for b in standard.decode(ycc[y][x][0], *chroma(x, y)[1:])
+    )
+    return {
+        "i420": y_plane + u_plane + v_plane,
+        "nv12": y_plane + uv_plane,
+        "yuyv": yuyv,
+    }, expected
+
+
+def test_decode_frame() -> None:
+    for standard in (YUV_BT601, YUV_BT709):
+        frames, expected = make_frames(standard)
+        for fmt, frame in frames.items():
+            assert len(frame) == frame_size(WIDTH, HEIGHT, fmt)
+            assert decode_frame(frame, WIDTH, HEIGHT, fmt, standard=standard) == (
+                expected
+            )
+            assert (
+                decode_frame(frame, WIDTH, HEIGHT, fmt, standard=standard, workers=2)
+                == expected
+            )
+
+            rows = list(
+                iter_frame_rows(
+                    frame, WIDTH, HEIGHT, fmt, output="rgba8888", standard=standard
+                )
+            )
+            assert len(rows) == HEIGHT
+            rgba = b"".join(rows)
+            assert rgba[3::4] == b"\xff" * WIDTH * HEIGHT
+            assert bytes(b for i, b in enumerate(rgba) if i % 4 != 3) == expected
+
+    with pytest.raises(ValueError):
+        decode_frame(b"\x00" * 10, WIDTH, HEIGHT, "i420")
@@ -0,0 +1,100 @@
+import pytest
+
+from color.color import Color
+from color.convert import np
+from color.gradient import GRADIENT_SPACES, _ramp, gradient, map_gradient, mix
+from color.types import RGB
+
+
+def test_mix() -> None:
+    red, blue = 0xFF_00_00_FF, 0x00_00_FF_FF
+
+    assert mix(red, blue) == 0x80_00_80_FF
+    assert mix(red, blue, 0) == red and mix(red, blue, 1) == blue
+    assert mix(0xFF_FF_FF_00, 0xFF_FF_FF_FF, 0.5) == 0xFF_FF_FF_80
+    assert mix("red", RGB(0, 0, 0xFF), 0.25) == 0xBF_00_40_FF
+    # hues take the shortest way: red -> blue through magenta
+    assert mix(red, blue, space="hsl") == 0xFF_00_FF_FF
+    # grays take the hue of the other color
+    assert mix("white", "red", space="hsl") >> 8 & 0xFFFF == 0x9F_9F
+    for space in GRADIENT_SPACES:
+        assert mix(red, blue, 0, space=space) == red
+        assert mix(red, blue, 1, space=space) == blue
+        assert mix(0x33_66_99_FF, 0x33_66_99_FF, 0.3, space=space) == 0x33_66_99_FF
+
+    color = Color.from_name("red")
+    assert isinstance(color.mix(blue), Color)
+    assert color.mix(blue, 0.25, space="oklab") == mix(red, blue, 0.25, space="oklab")
+
+    with pytest.raises(ValueError):
+        mix(red, blue, 2)
+    with pytest.raises(ValueError):
+        mix(red, blue, space="cmyk")  # type: ignore
+
+
+def test_gradient() -> None:
+    ramp = gradient(["black", "white"], 5)
+    assert list(ramp) == [
+        0x00_00_00_FF,
+        0x40_40_40_FF,
+        0x80_80_80_FF,
+        0xBF_BF_BF_FF,
+        0xFF_FF_FF_FF,
+    ]
+    assert len(gradient(["red", "blue"])) == 256
+    assert list(gradient(["red"], 3)) == [0xFF_00_00_FF] * 3
+    assert list(gradient([(0.5, "red"), (1, "blue")], 3)) == [
+        0xFF_00_00_FF,
+        0xFF_00_00_FF,
+        0x00_00_FF_FF,
+    ]
+    # a hard stop
+    assert list(gradient([(0, 0), (0.5, 0), (0.5, 0xFF), (1, 0xFF)], 4)) == [
+        0,
+        0,
+        0xFF,
+        0xFF,
+    ]
+    stops = [(0, "red"), (0.5, "lime"), (1, "blue")]
+    for space in GRADIENT_SPACES:
+        ramp = gradient(stops, 9, space=space)
+        assert ramp[0] == 0xFF_00_00_FF and ramp[4] == 0x00_FF_00_FF
+        assert ramp[8] == 0x00_00_FF_FF
+
+    # ramps are cached, and callers get copies
+    hits = _ramp.cache_info().hits
+    ramp = gradient(["black", "white"], 5)
+    ramp[0] = 0
+    assert _ramp.cache_info().hits == hits + 1
+    assert gradient(["black", "white"], 5)[0] == 0xFF
+
+    with pytest.raises(ValueError):
+        gradient([])
+    with pytest.raises(ValueError):
+        gradient([(1, "red"), (0, "blue")])
+    with pytest.raises(ValueError):
+        gradient(["red"], 0)
+
+
+def test_map_gradient() -> None:
+    stops = ["black", "white"]
+    values = [-1, 0, 0.3, 0.5, 0.999, 1, 2]
+    expected = [0xFF, 0xFF, 0x55_55_55_FF, 0xAA_AA_AA_FF] + [0xFF_FF_FF_FF] * 3
+
+    assert list(map_gradient(values, stops, n=4)) == expected
+    assert list(map_gradient([x * 10 for x in values], stops, n=4, high=10)) == expected
+    if np is not None:
+        assert map_gradient(np.array(values), stops, n=4).tolist() == expected
+
+    # infinities clamp, NaN is rejected, the same way on both paths
+    extremes, ends = [float("-inf"), float("inf"), 1e300], [0xFF] + expected[-2:]
+    assert list(map_gradient(extremes, stops, n=4)) == ends
+    with pytest.raises(ValueError):
+        map_gradient([0.5, float("nan")], stops)
+    if np is not None:
+        assert map_gradient(np.array(extremes), stops, n=4).tolist() == ends
+        with pytest.raises(ValueError):
+            map_gradient(np.array([0.5, np.nan]), stops)
+
+    with pytest.raises(ValueError):
+        map_gradient(values, stops, low=1, high=1)
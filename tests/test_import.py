@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+import pytest
+
+import color
+
+# best of a few cold imports, in seconds
+IMPORT_BUDGET = 0.1
+
+_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import color
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(",".join(sorted(sys.modules)))
+print(",".join(sorted(vars(color.vars))))
+"""
+
+
+def _import() -> tuple[float, set[str], set[str]]:
+    output = subprocess.run(
+        [sys.executable, "-c", _SCRIPT], capture_output=True, check=True, text=True
+    ).stdout
+    elapsed, modules, names = output.splitlines()
+    return float(elapsed), set(modules.split(",")), set(names.split(","))
+
+
+def test_import_time() -> None:
+    elapsed, modules, names = min(_import() for _ in range(3))
+
+    # optional or slow dependencies are imported on first use
+    for module in ("numpy", "concurrent.futures", "random"):
+        assert module not in modules
+    if sys.version_info >= (3, 11):
+        assert "typing_extensions" not in modules
+    assert not names & {"NAMES_COLORS", "MATCH_MAP", "HEX_RE"}
+
+    assert elapsed < IMPORT_BUDGET, f"import color took {elapsed * 1000:.1f} ms"
+
+
+def test_lazy_names() -> None:
+    assert color.NAMES_COLORS is color.vars.NAMES_COLORS
+    assert color.NAMES_COLORS["red"] == 0xFF0000
+    assert color.MATCH_MAP["HEX"] is color.HEX_RE
+    assert color.HEX_RE.match("#fff")
+    assert color.names.VALUE_TO_NAME is color.VALUE_TO_NAME
+    assert color.VALUE_TO_NAMES[0x808080] == ("gray", "grey")
+    assert {"NAMES_COLORS", "HEX_RE", "NAME_TO_VALUE"} <= set(dir(color))
+    assert "NAMES_COLORS" in color.__all__
+
+    with pytest.raises(AttributeError):
+        color.NOT_A_NAME
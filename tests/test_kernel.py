@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from color.buffer import BUFFER_FORMATS, decode_buffer, encode_buffer
+from color.convert import (
+    _hsl_to_rgb,
+    _hsv_to_rgb,
+    _lab_to_rgb,
+    _oklab_to_rgb,
+    _oklch_to_rgb,
+    _rgb_to_hsl,
+    _rgb_to_hsv,
+    _rgb_to_lab,
+    _rgb_to_oklab,
+    _rgb_to_oklch,
+    _rgb_to_xyz,
+    _xyz_to_rgb,
+)
+from color.kernel import KERNEL_SPACES, compile_kernel
+
+rng = random.Random(23)
+RAW = bytes(rng.getrandbits(8) for _ in range(12 * 500))
+
+SPACES = {
+    "rgb": lambda r, g, b: (r, g, b),
+    "hsl": _rgb_to_hsl,
+    "hsv": _rgb_to_hsv,
+    "xyz": _rgb_to_xyz,
+    "lab": _rgb_to_lab,
+    "oklab": _rgb_to_oklab,
+    "oklch": _rgb_to_oklch,
+}
+TO_RGB = {
+    "hsl": _hsl_to_rgb,
+    "hsv": _hsv_to_rgb,
+    "xyz": _xyz_to_rgb,
+    "lab": _lab_to_rgb,
+    "oklab": _oklab_to_rgb,
+    "oklch": _oklch_to_rgb,
+}
+
+
+def test_compile_kernel() -> None:
+    for fmt in BUFFER_FORMATS:
+        values = decode_buffer(RAW, fmt)
+        for space, from_rgb in SPACES.items():
+            expected = []
+            for v in values:
+                expected += from_rgb(v >> 24, (v >> 16) & 0xFF, (v >> 8) & 0xFF)
+                expected.append(v & 0xFF)
+            assert list(compile_kernel(fmt, space)(RAW)) == expected
+
+        for dst_fmt in BUFFER_FORMATS:
+            for byteorder in ("little", "big"):
+                assert compile_kernel(fmt, dst_fmt=dst_fmt, byteorder=byteorder)(
+                    RAW
+                ) == encode_buffer(
+                    decode_buffer(RAW, fmt, byteorder=byteorder),
+                    dst_fmt,
+                    byteorder=byteorder,
+                )
+
+    assert compile_kernel("rgb565", "hsv") is compile_kernel("rgb565", "hsv")
+
+
+def test_compile_kernel_adjust() -> None:
+    kernel = compile_kernel(
+        "rgba8888",
+        "hsv",
+        dst_fmt="rgba8888",
+        adjust={"h": (1, 180), "v": (0.5, 0), "alpha": (2, 0)},
+    )
+    expected = []
+    for v in decode_buffer(RAW):
+        h, s, value = _rgb_to_hsv(v >> 24, (v >> 16) & 0xFF, (v >> 8) & 0xFF)
+        r, g, b = _hsv_to_rgb((h + 180) % 360, s, value * 0.5)
+        expected.append((r << 24) | (g << 16) | (b << 8) | min(0xFF, 2 * (v & 0xFF)))
+    assert kernel(RAW) == encode_buffer(expected)
+
+    # the conversion back to rgb is inlined too, and matches the scalar path
+    for space, to_rgb in TO_RGB.items():
+        channel = KERNEL_SPACES[space][1]
+        kernel = compile_kernel(
+            "rgb888", space, dst_fmt="rgb888", adjust={channel: (0.9, 0.01)}
+        )
+        assert "to_rgb" not in kernel.source and "(c0, c1, c2)" not in kernel.source
+        expected = []
+        for v in decode_buffer(RAW, "rgb888"):
+            c0, c1, c2 = SPACES[space](v >> 24, (v >> 16) & 0xFF, (v >> 8) & 0xFF)
+            r, g, b = to_rgb(c0, c1 * 0.9 + 0.01, c2)
+            expected.append((r << 24) | (g << 16) | (b << 8) | 0xFF)
+        assert kernel(RAW) == encode_buffer(expected, "rgb888")
+
+    with pytest.raises(ValueError):
+        compile_kernel("rgb565", "hsv", adjust={"l": (1, 0)})
+    with pytest.raises(ValueError):
+        compile_kernel("rgb565", "cmyk")
+    with pytest.raises(ValueError):
+        compile_kernel("rgb565", "hsv", adjust={"s": (float("inf"), 0)})
+    with pytest.raises(ValueError):
+        compile_kernel("rgb565", "hsv", adjust={"v": (1, float("nan"))})
+    with pytest.raises(ValueError):
+        compile_kernel("rgb565", dst_fmt="i420")
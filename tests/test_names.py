@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from color._utils import get_channels
+from color.color import Color
+from color.names import (
+    _SPACES,
+    VALUE_TO_NAMES,
+    lookup_name,
+    name_of,
+    nearest_name,
+    nearest_names,
+)
+from color.types import RGB
+from color.vars import NAMES_COLORS
+
+
+def test_names() -> None:
+    assert lookup_name("slategrey") == 0x70_80_90
+    assert lookup_name(" Slate Grey\t") == 0x70_80_90
+    assert lookup_name("nope", None) is None
+    with pytest.raises(ValueError):
+        lookup_name("nope")
+
+    assert name_of(0x70_80_90_FF) == "slategray"
+    assert name_of(0x70_80_90_00) is None
+    assert name_of(RGB(0x80_80_80)) == "gray"
+    assert name_of((0x00, 0xFF, 0xFF)) == "aqua"
+    assert VALUE_TO_NAMES[0x80_80_80] == ("gray", "grey")
+    for name, value in NAMES_COLORS.items():
+        assert name in VALUE_TO_NAMES[value]
+
+    assert Color.from_name("DarkGrey").name == "darkgray"
+    assert Color.from_name("nope", None) is None
+    with pytest.raises(ValueError):
+        Color.from_name("nope")
+
+
+def test_nearest_name() -> None:
+    assert nearest_name(0xFF_00_00_FF) == "red"
+    assert nearest_name(RGB(0xFE_01_01)) == "red"
+    assert nearest_name((0x80, 0x80, 0x81)) == "gray"
+    assert Color.from_rgb(0x70_80_91).nearest_name() == "slategray"
+
+    random.seed(0)
+    values = [random.getrandbits(32) for _ in range(500)]
+    for space, convert in _SPACES.items():
+        names = nearest_names(values, space=space)
+        for value, name in zip(values, names):
+            point = convert(*get_channels(value))
+
+            def distance(x: int) -> float:
+                return sum(
+                    (a - b) ** 2 for a, b in zip(convert(*get_channels(x << 8)), point)
+                )
+
+            # ties may resolve to either color
+            assert distance(NAMES_COLORS[name]) == min(
+                map(distance, NAMES_COLORS.values())
+            )
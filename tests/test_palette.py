@@ -0,0 +1,71 @@
+import random
+from array import array
+
+import pytest
+
+from color._utils import UINT32_TYPECODE
+from color.array import ColorArray
+from color.palette import PaletteMapper
+from color.types import RGB, RGBA
+from color.vars import NAMES_COLORS
+
+
+def _distance(a: int, b: int) -> int:
+    return sum((((a >> s) & 0xFF) - ((b >> s) & 0xFF)) ** 2 for s in (24, 16, 8))
+
+
+def test_palette_mapper() -> None:
+    mapper = PaletteMapper(NAMES_COLORS)
+    assert len(mapper) == len(NAMES_COLORS)
+    assert mapper.nearest(0xFF_00_00_FF) == 0xFF_00_00_FF
+    assert mapper.nearest(RGB(0xFE, 1, 1)) == 0xFF_00_00_FF
+    assert mapper.nearest(RGBA(0xFE, 1, 1, 0)) == 0xFF_00_00_FF
+
+    rng = random.Random(16)
+    values = array(UINT32_TYPECODE, (rng.getrandbits(32) for _ in range(1000)))
+    indexes = mapper.map(values)
+    assert indexes.typecode == "B"
+    for value, index in zip(values, indexes):
+        best = min(_distance(value, entry) for entry in mapper.palette)
+        assert _distance(value, mapper.palette[index]) == best
+
+    for bits in (1, 3, 8):
+        other = PaletteMapper(NAMES_COLORS, bits=bits)
+        assert [
+            _distance(a, other.palette[i]) for a, i in zip(values, other.map(values))
+        ] == [_distance(a, mapper.palette[i]) for a, i in zip(values, indexes)]
+
+    # precomputed and lazily filled cells agree
+    lazy = PaletteMapper(NAMES_COLORS, bits=3)
+    eager = PaletteMapper(NAMES_COLORS, bits=3)
+    eager.precompute()
+    assert [lazy._candidates(cell) for cell in range(8**3)] == eager._cells
+
+    mapper = PaletteMapper([0x00_00_00_FF, 0xFF_FF_FF_FF, 0x00_00_00_FF])
+    assert list(mapper.map(bytes((0, 0, 0, 250, 250, 250)), fmt="rgb888")) == [0, 1]
+    assert list(mapper.remap(ColorArray([0x10_10_10_00]))) == [0x00_00_00_FF]
+
+    with pytest.raises(ValueError):
+        PaletteMapper([])
+    with pytest.raises(ValueError):
+        PaletteMapper(NAMES_COLORS, bits=9)
+
+
+def test_dither() -> None:
+    mapper = PaletteMapper([0x00_00_00_FF, 0xFF_FF_FF_FF])
+    gray = [0x80_80_80_FF] * 64
+
+    assert set(mapper.map(gray)) == {1}
+    indexes = mapper.map(gray, dither=True, width=8)
+    # error diffusion alternates black and white around 50% gray
+    assert sum(indexes) == 32
+    assert set(mapper.remap(gray, dither=True, width=8)) == {
+        0x00_00_00_FF,
+        0xFF_FF_FF_FF,
+    }
+
+    # exact palette colors never diffuse any error
+    assert list(mapper.map([0xFF_FF_FF_FF, 0] * 4, dither=True, width=4)) == [1, 0] * 4
+
+    with pytest.raises(ValueError):
+        mapper.map(gray, dither=True, width=7)
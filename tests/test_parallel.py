@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from color.buffer import decode_buffer, encode_buffer
+from color.frame import decode_frame, frame_size
+from color.parallel import convert_parallel
+
+rng = random.Random(21)
+RAW = bytes(rng.getrandbits(8) for _ in range(4 * 3000))
+
+
+def test_convert_parallel() -> None:
+    for src_fmt, dst_fmt, byteorder in (
+        ("rgba8888", "rgb565", "little"),
+        ("rgb888", "rgb555", "big"),
+        ("rgb565", "bgr888", "big"),
+        ("bgr888", "rgba8888", "little"),
+    ):
+        src = RAW[: len(RAW) // 12 * 12]
+        expected = encode_buffer(
+            decode_buffer(src, src_fmt, byteorder=byteorder),
+            dst_fmt,
+            byteorder=byteorder,
+        )
+        for workers in (1, 3):
+            assert expected == convert_parallel(
+                src,
+                src_fmt,
+                dst_fmt,
+                workers=workers,
+                byteorder=byteorder,
+                chunk_size=700,
+            )
+
+    with pytest.raises(ValueError):
+        convert_parallel(RAW[:5], "rgba8888", "rgb565")
+    with pytest.raises(ValueError):
+        convert_parallel(RAW, "rgba8888", "yuyv")
+    with pytest.raises(ValueError):
+        convert_parallel(RAW, "i420", "rgb888")
+
+
+def test_convert_parallel_frame() -> None:
+    width, height = 37, 21
+    for fmt in ("i420", "nv12", "yuyv"):
+        frame = RAW[: frame_size(width, height, fmt)]
+        rgb = decode_frame(frame, width, height, fmt)
+        for dst_fmt in ("rgb888", "rgba8888", "rgb565"):
+            expected = encode_buffer(decode_buffer(rgb, "rgb888"), dst_fmt)
+            assert expected == convert_parallel(
+                frame,
+                fmt,
+                dst_fmt,
+                workers=2,
+                width=width,
+                height=height,
+                chunk_size=width * 4,
+            )
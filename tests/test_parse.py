@@ -0,0 +1,57 @@
+import io
+
+import pytest
+
+from color.color import Color
+from color.parse import parse_color, parse_many, parse_stream
+
+
+def test_parse_color() -> None:
+    assert parse_color("#fff") == 0xFF_FF_FF_FF
+    assert parse_color("#f0f8") == 0xFF_00_FF_88
+    assert parse_color(" #FFF00F ") == 0xFF_F0_0F_FF
+    assert parse_color("#fff00faa") == 0xFF_F0_0F_AA
+    assert parse_color("rgb(255, 240, 15)") == 0xFF_F0_0F_FF
+    assert parse_color("rgb(100%, 0%, 50%)") == 0xFF_00_80_FF
+    assert parse_color("rgba(255,240,15,0.5)") == 0xFF_F0_0F_80
+    assert parse_color("rgba(100%, 0%, 0%, 1)") == 0xFF_00_00_FF
+    assert parse_color("hsl(120, 100%, 50%)") == 0x00_FF_00_FF
+    assert parse_color("hsla(240, 100%, 50%, 0)") == 0x00_00_FF_00
+    assert parse_color("AliceBlue") == 0xF0_F8_FF_FF
+    # same spellings as lookup_name / Color.from_name
+    assert parse_color(" Alice Blue ") == 0xF0_F8_FF_FF
+    assert parse_color(" Alice Blue ") == Color.from_name(" Alice Blue ")
+
+    for s in ("#ff", "#fffff", "#ggg", "#+ff", "rgb(1, 2)", "hsl(1, 2, 3)", "nope"):
+        with pytest.raises(ValueError):
+            parse_color(s)
+
+    assert Color.from_str("#fff00f") == 0xFF_F0_0F_FF
+
+
+def test_parse_many() -> None:
+    strings = ["#fff", "red", "nope", "#fff"]
+
+    with pytest.raises(ValueError):
+        parse_many(strings)
+    assert list(parse_many(strings, errors="skip")) == [
+        0xFF_FF_FF_FF,
+        0xFF_00_00_FF,
+        0xFF_FF_FF_FF,
+    ]
+    assert list(parse_many(strings, errors="default", default=0x01)) == [
+        0xFF_FF_FF_FF,
+        0xFF_00_00_FF,
+        0x01,
+        0xFF_FF_FF_FF,
+    ]
+    for default in (-1, 0x1_00_00_00_00):
+        with pytest.raises(ValueError):
+            parse_many(strings, errors="default", default=default)
+
+    fp = io.StringIO("#fff\n\nred\nnope\n#000\n")
+    chunks = list(parse_stream(fp, errors="skip", chunk_size=2))
+    assert [list(chunk) for chunk in chunks] == [
+        [0xFF_FF_FF_FF, 0xFF_00_00_FF],
+        [0x00_00_00_FF],
+    ]
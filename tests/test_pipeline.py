@@ -0,0 +1,118 @@
+import asyncio
+import io
+import random
+
+import pytest
+
+from color.buffer import decode_buffer, encode_buffer
+from color.convert import _hsv_to_rgb, _rgb_to_hsv
+from color.pipeline import Pipeline
+
+rng = random.Random(22)
+RAW = bytes(rng.getrandbits(8) for _ in range(2 * 1001))
+
+
+def pieces(data: bytes) -> list[bytes]:
+    result, start = [], 0
+    while start < len(data):
+        size = rng.randint(1, 300)
+        result.append(data[start : start + size])
+        start += size
+    return result
+
+
+def expected_saturated() -> bytes:
+    values = []
+    for value in decode_buffer(RAW, "rgb565"):
+        h, s, v = _rgb_to_hsv(value >> 24, (value >> 16) & 0xFF, (value >> 8) & 0xFF)
+        r, g, b = _hsv_to_rgb(h, min(1.0, s * 1.5), v)
+        values.append((r << 24) | (g << 16) | (b << 8) | 0x80)
+    return encode_buffer(values, "rgba8888")
+
+
+def saturate() -> Pipeline:
+    return (
+        Pipeline(chunk_size=64, max_pending=2)
+        .decode("rgb565")
+        .to_space("hsv")
+        .adjust(s=lambda s: min(1.0, s * 1.5), alpha=lambda a: 0x80)
+        .encode("rgba8888")
+    )
+
+
+def test_pipeline() -> None:
+    expected = expected_saturated()
+    chunks = list(saturate().run(pieces(RAW)))
+    assert len(chunks) == -(-1001 // 64)
+    assert all(len(chunk) == 64 * 4 for chunk in chunks[:-1])
+    assert b"".join(chunks) == expected
+    assert b"".join(saturate().run(io.BytesIO(RAW))) == expected
+
+    # round trips through several spaces
+    pipeline = Pipeline().decode("rgb888").to_space("oklab").to_space("rgb").encode()
+    assert b"".join(pipeline.run([RAW[:999]])) == encode_buffer(
+        decode_buffer(RAW[:999], "rgb888")
+    )
+
+    # adjusted rgb channels are clamped
+    pipeline = (
+        Pipeline()
+        .decode("rgb888")
+        .to_space("rgb")
+        .adjust(r=lambda r: r * 2, g=lambda g: g - 300)
+        .encode("rgb888")
+    )
+    result = b"".join(pipeline.run([RAW[:999]]))
+    assert result[0::3] == bytes(min(0xFF, 2 * x) for x in RAW[:999:3])
+    assert result[1::3] == bytes(333)
+    assert result[2::3] == RAW[2:999:3]
+
+    with pytest.raises(ValueError):
+        list(saturate().run([RAW[:3]]))
+    with pytest.raises(ValueError):
+        Pipeline().to_space("hsv")
+    with pytest.raises(ValueError):
+        Pipeline().decode().adjust(h=abs)
+    with pytest.raises(ValueError):
+        Pipeline().decode().to_space("hsv").adjust(l=abs)
+    with pytest.raises(ValueError):
+        Pipeline().decode().encode().encode()
+
+
+def test_pipeline_async() -> None:
+    async def source():
+        for piece in pieces(RAW):
+            await asyncio.sleep(0)
+            yield piece
+
+    async def failing():
+        yield RAW[:10]
+        raise ConnectionError
+
+    async def collect(source) -> bytes:
+        return b"".join([chunk async for chunk in saturate().run_async(source)])
+
+    async def stream() -> bytes:
+        reader = asyncio.StreamReader()
+        reader.feed_data(RAW)
+        reader.feed_eof()
+        return await collect(reader)
+
+    expected = expected_saturated()
+    assert asyncio.run(collect(source())) == expected
+    assert asyncio.run(stream()) == expected
+    with pytest.raises(ConnectionError):
+        asyncio.run(collect(failing()))
+
+    async def cancelled() -> set:
+        # a stream that never sends anything, the consumer gives up waiting
+        consumer = asyncio.ensure_future(collect(asyncio.StreamReader()))
+        await asyncio.sleep(0.01)
+        consumer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await consumer
+        await asyncio.sleep(0)
+        return asyncio.all_tasks() - {asyncio.current_task()}
+
+    # no task is left pending behind a cancelled consumer
+    assert asyncio.run(cancelled()) == set()
@@ -0,0 +1,87 @@
+import random
+from array import array
+
+import pytest
+
+from color._utils import UINT32_TYPECODE
+from color.array import ColorArray
+from color.quantize import QUANTIZE_METHODS, OctreeQuantizer, quantize
+from color.types import RGB
+
+
+def _error(values: array, palette: array, indexes: array) -> float:
+    total = 0
+    for value, index in zip(values, indexes):
+        entry = palette[index]
+        for shift in (24, 16, 8):
+            total += (((value >> shift) & 0xFF) - ((entry >> shift) & 0xFF)) ** 2
+    return (total / len(values)) ** 0.5
+
+
+def test_quantize() -> None:
+    colors = [0xFF_00_00_FF, 0x00_80_00_FF, 0x00_00_FF_80, 0x10_20_30_FF]
+    values = array(UINT32_TYPECODE, colors * 50)
+    random.Random(15).shuffle(values)
+
+    for method in QUANTIZE_METHODS:
+        palette, indexes = quantize(values, 8, method=method)
+        assert sorted(palette) == sorted(colors)
+        assert indexes.typecode == "B"
+        assert [palette[i] for i in indexes] == list(values)
+
+        palette, indexes = quantize(ColorArray(values), 2, method=method)
+        assert len(palette) <= 2 and len(indexes) == len(values)
+
+        assert quantize(b"", method=method) == (array(UINT32_TYPECODE), array("B"))
+
+    palette, indexes = quantize(
+        bytes((1, 2, 3, 1, 2, 3)), method="median_cut", fmt="rgb888"
+    )
+    assert list(palette) == [0x01_02_03_FF] and list(indexes) == [0, 0]
+    palette, indexes = quantize([RGB(1, 2, 3), 0x01_02_03_FF], 300, method="kmeans")
+    assert list(palette) == [0x01_02_03_FF] and indexes.typecode == "H"
+
+    rng = random.Random(15)
+    values = array(
+        UINT32_TYPECODE, (rng.getrandbits(24) << 8 | 0xFF for _ in range(5000))
+    )
+    for method in QUANTIZE_METHODS:
+        coarse = _error(values, *quantize(values, 4, method=method, sample=1000))
+        fine = _error(values, *quantize(values, 64, method=method, sample=1000))
+        assert fine < coarse
+        assert fine < 64
+
+    with pytest.raises(ValueError):
+        quantize(values, 0)
+    with pytest.raises(ValueError):
+        quantize(values, method="popularity")  # type: ignore
+
+
+def test_octree() -> None:
+    rng = random.Random(15)
+    values = array(UINT32_TYPECODE, (rng.getrandbits(32) for _ in range(20000)))
+
+    quantizer = OctreeQuantizer(16, max_leaves=256)
+    for start in range(0, len(values), 1000):
+        quantizer.add(values[start : start + 1000])
+        assert len(quantizer) <= 256
+
+    palette = quantizer.palette()
+    assert 0 < len(palette) <= 16
+    assert _error(values, palette, quantizer.index(values)) < 80
+
+    # pixels never added map to the closest entry
+    indexes = quantizer.index([0x00_00_00_FF, 0xFF_FF_FF_FF])
+    assert len(indexes) == 2 and max(indexes) < len(palette)
+
+    # streamed in chunks, a tree under max_leaves matches a single pass
+    values = array(
+        UINT32_TYPECODE, (rng.getrandbits(12) << 20 | 0xFF for _ in range(5000))
+    )
+    quantizer = OctreeQuantizer(32)
+    for start in range(0, len(values), 700):
+        quantizer.add(values[start : start + 700])
+    assert quantizer.palette() == quantize(values, 32)[0]
+
+    with pytest.raises(ValueError):
+        OctreeQuantizer().index([0])
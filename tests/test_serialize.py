@@ -0,0 +1,41 @@
+import io
+import random
+from array import array
+
+from color._utils import UINT32_TYPECODE
+from color.array import ColorArray
+from color.parse import parse_color
+from color.serialize import CSS_FORMATS, format_many
+from color.types import RGB
+
+rng = random.Random(25)
+OPAQUE = [(rng.getrandbits(24) << 8) | 0xFF for _ in range(300)]
+MIXED = [rng.getrandbits(32) for _ in range(300)] + OPAQUE
+
+
+def test_format_many() -> None:
+    for fmt in CSS_FORMATS:
+        for values in (OPAQUE, MIXED, [v & ~0xFF for v in OPAQUE]):
+            strings = format_many(values, fmt).split("\n")
+            assert [parse_color(s) for s in strings] == values
+
+    assert format_many([RGB(0xFF0099), 0x11223344], sep=" ") == "#ff0099 #11223344"
+    assert format_many(ColorArray(OPAQUE[:2]), "short", sep=";") == ";".join(
+        RGB(v >> 8).to_hex(short=True) for v in OPAQUE[:2]
+    )
+    assert format_many([]) == ""
+
+    expected = format_many(MIXED, "rgb", sep=", ")
+    out = bytearray(b">")
+    assert format_many(array(UINT32_TYPECODE, MIXED), "rgb", sep=", ", out=out) is out
+    assert out == b">" + expected.encode()
+    stream = io.StringIO()
+    format_many(MIXED, "rgb", sep=", ", out=stream)
+    assert stream.getvalue() == expected
+
+
+def test_format_alpha_round_trip() -> None:
+    for a in range(0x100):
+        value = 0x10203000 | a
+        for fmt in ("rgb", "rgba", "hsl", "hex"):
+            assert parse_color(format_many([value], fmt)) == value
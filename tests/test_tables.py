@@ -0,0 +1,76 @@
+from array import array
+
+import pytest
+
+from color.array import ColorArray
+from color.gradient import gradient
+from color.palette import PaletteMapper
+from color.tables import NameTable, TableFile, write_tables
+from color.types import RGB, RGBA
+from color.vars import NAMES_COLORS
+
+
+def test_tables(tmp_path) -> None:
+    path = tmp_path / "tables.clrt"
+    brand = {"ink": RGB(0x10, 0x20, 0x30), "paper": RGBA(0xF0, 0xE0, 0xD0, 0x80)}
+    ramp = gradient(["red", "blue"], 16)
+    tables = {
+        "names": NAMES_COLORS,
+        "brand": brand,
+        "empty": {},
+        "ramp": ramp,
+        "palette": [RGB(1, 2, 3), 0x04050607, RGBA(8, 9, 10, 11)],
+        "colors": ColorArray([0x01020304]),
+        "lut": array("H", range(1000)),
+        "coords": array("d", [0.5, -1.0]),
+    }
+    write_tables(path, tables)
+
+    with TableFile(path) as file:
+        assert list(file) == list(tables)
+        assert "lut" in file and "nothing" not in file
+        names = file["names"]
+        assert isinstance(names, NameTable)
+        assert dict(names) == NAMES_COLORS
+        assert names["rebeccapurple"] == 0x663399
+        assert "nothing" not in names and 1 not in names
+        assert dict(file["brand"]) == {"ink": 0x102030FF, "paper": 0xF0E0D080}
+        assert len(file["empty"]) == 0 and dict(file["empty"]) == {}
+
+        assert list(file["ramp"]) == list(ramp)
+        assert list(file["palette"]) == [0x010203FF, 0x04050607, 0x08090A0B]
+        assert list(file["colors"]) == [0x01020304]
+        assert list(file["lut"]) == list(range(1000))
+        assert list(file["coords"]) == [0.5, -1.0]
+
+        mapper = PaletteMapper(file["names"])
+        assert mapper.nearest(0x663398FF) == 0x663399FF
+
+    with pytest.raises(ValueError):
+        write_tables(path, {"x": array("b", [1])})
+    for value in (-1, 1 << 32):
+        with pytest.raises(ValueError, match="'ink'"):
+            write_tables(path, {"brand": {"ink": value}})
+
+    # truncated arrays and name indexes fail to open
+    for table in (ramp, brand):
+        write_tables(path, {"table": table})
+        path.write_bytes(path.read_bytes()[:-1])
+        with pytest.raises(ValueError):
+            TableFile(path)
+
+    path.write_bytes(b"not a table file")
+    with pytest.raises(ValueError):
+        TableFile(path)
+
+
+def test_tables_byteorder(tmp_path) -> None:
+    path = tmp_path / "tables.clrt"
+    tables = {"names": {"a": 1, "bb": 0x01020304}, "lut": [5, 6]}
+    for byteorder in ("little", "big"):
+        write_tables(path, tables, byteorder=byteorder)
+        with TableFile(path) as file:
+            assert dict(file["names"]) == tables["names"]
+            lut = file["lut"]
+        # views stay usable after closing the file
+        assert list(lut) == tables["lut"]
@@ -1,4 +1,7 @@
-from color.types import RGB, RGBA
+import pytest
+
+from color.color import Color
+from color.types import HSL, RGB, RGBA, FrozenRGB, FrozenRGBA
 
 
 def test_RGB() -> None:
@@ -51,6 +54,46 @@ def test_RGBA() -> None:
     assert RGBA(0xFF_F0_0F_AA) == 0xFF_F0_0F_AA
     assert RGBA(0xFF_F0_0F_AA).to_int() == 0xFF_F0_0F_AA
     assert RGBA(RGB(0xFF_F0_0F)) == 0xFF_F0_0F_FF
+    assert RGBA(RGB(0xFF_F0_0F), a=0xAA) == 0xFF_F0_0F_AA
+
+
+def test_packed() -> None:
+    rgba = RGBA(0xFF, 0xF0, 0x0F, 0.5)
+
+    assert not hasattr(rgba, "__dict__")
+    assert not hasattr(Color(rgba), "__dict__")
+    assert type(rgba.r) is int and type(rgba["a"]) is int
+    assert list(rgba) == [0xFF, 0xF0, 0x0F, 0x7F]
+    assert rgba[-1] == rgba[3] == 0x7F
+    assert rgba[1:3] == (0xF0, 0x0F)
+    assert 0x0F in rgba
+
+    rgba[3] = 1.0
+    rgba["b"] = -1
+    assert rgba == 0xFF_F0_00_FF
+    assert Color(rgba)["g"] == 0xF0
+
+
+def test_frozen() -> None:
+    rgb = FrozenRGB(0xFF_F0_0F)
+
+    assert rgb == RGB(0xFF_F0_0F) and RGB(0xFF_F0_0F) == rgb
+    assert hash(rgb) == hash(0xFF_F0_0F)
+    assert len({rgb, RGB(0xFF_F0_0F).freeze(), FrozenRGB(0xFF, 0xF0, 0x0F)}) == 1
+    assert {Color(0xFF_F0_0F_AA).freeze(): 1}[FrozenRGBA(0xFF_F0_0F_AA)] == 1
+    with pytest.raises(TypeError):
+        rgb.r = 0
+    with pytest.raises(TypeError):
+        rgb[1] = 0
+
+    shared = FrozenRGBA.intern(0xFF_F0_0F_AA)
+    assert shared is FrozenRGBA.intern(RGBA(0xFF_F0_0F_AA))
+    # re-running __init__ must not change a shared instance
+    with pytest.raises(TypeError):
+        FrozenRGB.__init__(rgb, 9, 9, 9)
+    with pytest.raises(TypeError):
+        shared.__init__(0)
+    assert rgb == 0xFF_F0_0F and shared == 0xFF_F0_0F_AA
 
 
 # def test_HSL() -> None:
@@ -72,3 +115,27 @@ def test_RGBA() -> None:
 #     assert YUV(0, 1, 0) == (0, 1, 0)
 #     assert YUV(0, 1, 0) != [0, 1, 0]
 #     assert YUV(0, 1, 0) != {0, 1, 0}
+
+
+def test_serialize() -> None:
+    assert repr(RGB(1, 2, 3)) == "<RGB r=1 g=2 b=3>"
+    assert repr(RGBA(1, 2, 3, 4)) == "<RGBA r=1 g=2 b=3 a=4>"
+    assert repr(Color(0x01020304)) == "<Color r=1 g=2 b=3 a=4>"
+
+    assert RGB(0xFF, 0x00, 0x99).to_hex() == "#ff0099"
+    assert RGB(0xFF, 0x00, 0x99).to_hex(short=True) == "#f09"
+    assert RGB(0xFF, 0x00, 0x98).to_hex(short=True) == "#ff0098"
+    assert RGBA(0x11223344).to_hex() == "#11223344"
+    assert RGBA(0x112233FF).to_hex() == "#112233"
+    assert RGBA(0x112233FF).to_hex(alpha=True, short=True) == "#123f"
+    assert RGBA(0x11223344).to_hex(alpha=False) == "#112233"
+
+    assert RGB(0xFF, 0x00, 0x99).to_css("rgb") == "rgb(255, 0, 153)"
+    assert RGBA(0xFF000080).to_css("rgb") == "rgba(255, 0, 0, 0.5)"
+    assert RGBA(0xFF0000FF).to_css("rgba") == "rgba(255, 0, 0, 1)"
+    assert RGBA(0xFF000000).to_css("rgba") == "rgba(255, 0, 0, 0)"
+    assert RGB(0x66, 0x33, 0x99).to_css("hsl") == "hsl(270, 50%, 40%)"
+    assert HSL(270, 0.5, 0.4).to_css() == "hsl(270, 50%, 40%)"
+    assert HSL(270, 0.5, 0.4).to_hex() == "#663399"
+    with pytest.raises(ValueError):
+        RGB(0).to_css("cmyk")